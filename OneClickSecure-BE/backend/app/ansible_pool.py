@@ -0,0 +1,296 @@
+# app/ansible_pool.py
+"""미리 준비된 ansible 실행 프로세스 풀 (단일 호스트 대화형 점검용)
+
+ansible/ansible-playbook 실행마다 1~3초가 Python/플러그인 import에 쓰입니다. 풀의 워커
+(app/ansible_worker.py)는 ansible을 미리 import해 두고 요청마다 fork로 실행하므로 이 비용이 없습니다.
+
+- ansible 설정은 import 시점의 ANSIBLE_* 환경 변수로 고정되므로 워커는 ANSIBLE_* 값 조합(프로필)별로 둡니다.
+- 처음 보는 프로필이거나 워커가 모두 사용 중이면 기존 방식(새 프로세스)으로 실행하고,
+  그 사이 백그라운드에서 워커를 준비합니다. 요청이 대기열에서 기다리지 않습니다.
+- 워커는 EXECUTOR_POOL_MAX_JOBS건 처리 후 교체하고, 유휴 워커는 주기적으로 ping으로 확인합니다.
+- 워커 Python에서 ansible을 import할 수 없으면 풀을 끄고 기존 방식만 사용합니다.
+"""
+
+import json
+import os
+import select
+import subprocess
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+from app import metrics, process_usage
+
+POOL_SIZE = int(os.environ.get("EXECUTOR_POOL_SIZE", "2"))                         # 프로필당 워커 수 (0이면 사용 안 함)
+POOL_MAX_JOBS = int(os.environ.get("EXECUTOR_POOL_MAX_JOBS", "200"))               # 이 건수 처리 후 워커 교체
+POOL_HEALTH_INTERVAL = float(os.environ.get("EXECUTOR_POOL_HEALTH_INTERVAL", "30"))  # 유휴 워커 확인 주기 (초)
+POOL_PYTHON = os.environ.get("EXECUTOR_POOL_PYTHON") or sys.executable             # ansible이 설치된 Python
+WARMUP_TIMEOUT = 60      # 워커 준비(ansible import) 제한 시간
+PING_TIMEOUT = 5
+REPLY_GRACE_SECONDS = 30  # 워커 자체 타임아웃 처리 후 응답까지 여유
+DEFAULT_JOB_TIMEOUT = 3600
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ansible_worker.py")
+SUPPORTED_COMMANDS = ("ansible", "ansible-playbook")
+
+Profile = Tuple[Tuple[str, str], ...]
+
+class WorkerError(Exception):
+    """워커 통신 실패 (sent=False면 요청이 워커에 전달되지 않음)"""
+    def __init__(self, message: str, sent: bool = True):
+        super().__init__(message)
+        self.sent = sent
+
+class WorkerUnavailable(Exception):
+    """워커 Python에서 ansible을 사용할 수 없음"""
+
+def profile_of(env: Dict[str, str]) -> Profile:
+    """ansible 설정에 영향을 주는 환경 변수 조합"""
+    return tuple(sorted((key, value) for key, value in env.items() if key.startswith("ANSIBLE_")))
+
+class _Worker:
+    def __init__(self, profile: Profile, env: Dict[str, str]):
+        self.profile = profile
+        self.env = env  # 교체 워커도 같은 환경으로 시작
+        self.jobs = 0
+        self.process = subprocess.Popen(
+            [POOL_PYTHON, WORKER_SCRIPT],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding="utf-8",
+            env={**env, "PYTHONUNBUFFERED": "1"}
+        )
+
+    def start(self):
+        ready = self._read(WARMUP_TIMEOUT)
+        if not ready.get("ready"):
+            self.close()
+            raise WorkerUnavailable(ready.get("error", "알 수 없는 오류"))
+        self.ansible_version = ready.get("ansible_version")
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def call(self, message: Dict, timeout: float) -> Dict:
+        try:
+            self.process.stdin.write(json.dumps(message, ensure_ascii=False) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerError(f"워커에 요청을 보내지 못했습니다: {e}", sent=False)
+        return self._read(timeout)
+
+    def _read(self, timeout: float) -> Dict:
+        readable, _, _ = select.select([self.process.stdout], [], [], timeout)
+        if not readable:
+            self.close()
+            raise WorkerError(f"워커 응답 없음 ({timeout}초)")
+        line = self.process.stdout.readline()
+        if not line:
+            self.close()
+            raise WorkerError(f"워커가 종료되었습니다 (종료 코드 {self.process.poll()})")
+        return json.loads(line)
+
+    def close(self):
+        if self.alive():
+            self.process.kill()
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+class AnsiblePool:
+    """프로필별 워커 풀 (요청은 유휴 워커를 하나 가져가 단독으로 사용)"""
+
+    def __init__(self, size: int = POOL_SIZE, max_jobs: int = POOL_MAX_JOBS,
+                 health_interval: float = POOL_HEALTH_INTERVAL):
+        self.size = size
+        self.max_jobs = max_jobs
+        self.health_interval = health_interval
+        self.unavailable: Optional[str] = None
+        self._idle: Dict[Profile, List[_Worker]] = {}
+        self._counts: Dict[Profile, int] = {}   # 준비 중 + 유휴 + 사용 중
+        self._busy = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        self._health_thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0 and self.unavailable is None and not self._closed
+
+    # === 워커 관리 ===
+
+    def prewarm(self, env: Dict[str, str]):
+        """프로필 워커를 size개까지 백그라운드에서 준비"""
+        if not self.enabled:
+            return
+        profile = profile_of(env)
+        with self._lock:
+            missing = self.size - self._counts.get(profile, 0)
+            self._counts[profile] = self._counts.get(profile, 0) + max(missing, 0)
+        for _ in range(missing):
+            self._spawn_async(profile, env)
+
+    def _spawn_async(self, profile: Profile, env: Dict[str, str]):
+        threading.Thread(target=self._spawn, args=(profile, env), name="ansible-pool-spawn", daemon=True).start()
+
+    def _spawn(self, profile: Profile, env: Dict[str, str]):
+        """워커 1개 준비 (_counts는 호출 전에 예약되어 있음)"""
+        try:
+            worker = _Worker(profile, env)
+            worker.start()
+        except (WorkerUnavailable, OSError) as e:
+            # ansible 미설치 또는 EXECUTOR_POOL_PYTHON 경로 오류
+            with self._lock:
+                first = self.unavailable is None
+                self.unavailable = str(e)
+                self._counts[profile] -= 1
+            if first:
+                print(f"⚠️ ansible 실행 풀 사용 불가, 새 프로세스로 실행합니다 ({POOL_PYTHON}): {e}")
+            return
+        except Exception as e:
+            self._forget(profile)
+            print(f"⚠️ ansible 실행 풀 워커 준비 실패: {e}")
+            return
+        with self._lock:
+            if not self._closed:
+                self._idle.setdefault(profile, []).append(worker)
+                return
+        worker.close()
+
+    def _forget(self, profile: Profile):
+        with self._lock:
+            self._counts[profile] -= 1
+
+    def _acquire(self, profile: Profile, env: Dict[str, str]) -> Optional[_Worker]:
+        spawn = False
+        with self._lock:
+            idle = self._idle.get(profile, [])
+            while idle:
+                worker = idle.pop()
+                if worker.alive():
+                    self._busy += 1
+                    return worker
+                self._counts[profile] -= 1
+            if self._counts.get(profile, 0) < self.size:
+                self._counts[profile] = self._counts.get(profile, 0) + 1
+                spawn = True
+        if spawn:
+            self._spawn_async(profile, env)
+        return None
+
+    def _release(self, worker: _Worker, broken: bool = False):
+        with self._lock:
+            self._busy -= 1
+            keep = not broken and worker.alive() and worker.jobs < self.max_jobs and not self._closed
+            if keep:
+                self._idle.setdefault(worker.profile, []).append(worker)
+                return
+            self._counts[worker.profile] -= 1
+            # 교체 워커 예약 (처리 건수 초과/비정상 종료)
+            respawn = not self._closed and self.unavailable is None
+            if respawn:
+                self._counts[worker.profile] += 1
+        worker.close()
+        if respawn:
+            self._spawn_async(worker.profile, worker.env)
+
+    # === 실행 ===
+
+    def run(self, args: List[str], phase: str, timeout: Optional[float], env: Dict[str, str]
+            ) -> Optional[subprocess.CompletedProcess]:
+        """워커로 실행 (워커를 쓸 수 없으면 None, 호출자가 새 프로세스로 실행)"""
+        if not self.enabled or os.path.basename(args[0]) not in SUPPORTED_COMMANDS:
+            return None
+        worker = self._acquire(profile_of(env), env)
+        if worker is None:
+            metrics.EXECUTOR_POOL_REQUESTS.labels("cold").inc()
+            return None
+
+        worker.jobs += 1
+        try:
+            reply = worker.call({"op": "run", "args": list(args), "env": env, "timeout": timeout},
+                                (timeout or DEFAULT_JOB_TIMEOUT) + REPLY_GRACE_SECONDS)
+        except WorkerError as e:
+            self._release(worker, broken=True)
+            if not e.sent:
+                # 요청이 전달되지 않았으므로 새 프로세스로 실행해도 중복 실행이 아님
+                metrics.EXECUTOR_POOL_REQUESTS.labels("cold").inc()
+                return None
+            # 실행 도중 워커가 죽으면 재실행하지 않고 실패로 반환 (점검 스크립트 중복 실행 방지)
+            metrics.EXECUTOR_POOL_REQUESTS.labels("error").inc()
+            return subprocess.CompletedProcess(args, 1, "", f"ansible 실행 풀 오류: {e}")
+        self._release(worker)
+
+        if "error" in reply:
+            metrics.EXECUTOR_POOL_REQUESTS.labels("error").inc()
+            return subprocess.CompletedProcess(args, 1, "", f"ansible 실행 풀 오류: {reply['error']}")
+        metrics.EXECUTOR_POOL_REQUESTS.labels("warm").inc()
+        usage = process_usage.usage_from_rusage(SimpleNamespace(**reply["rusage"]), reply["wall_seconds"],
+                                                reply["returncode"])
+        process_usage.observe(phase, usage)
+        if reply["timed_out"]:
+            error = subprocess.TimeoutExpired(args, timeout, reply["stdout"], reply["stderr"])
+            error.usage = usage
+            raise error
+        result = subprocess.CompletedProcess(args, reply["returncode"], reply["stdout"], reply["stderr"])
+        result.usage = usage
+        return result
+
+    # === 상태 확인 ===
+
+    def start_health_checks(self):
+        if self.size <= 0 or self._health_thread is not None:
+            return
+        self._health_thread = threading.Thread(target=self._health_loop, name="ansible-pool-health", daemon=True)
+        self._health_thread.start()
+
+    def _health_loop(self):
+        while not self._closed:
+            time.sleep(self.health_interval)
+            self.check_idle_workers()
+
+    def check_idle_workers(self) -> int:
+        """유휴 워커 ping, 응답 없는 워커는 교체 (교체 수 반환)"""
+        with self._lock:
+            workers = [worker for idle in self._idle.values() for worker in idle]
+            self._idle = {}
+            self._busy += len(workers)
+        replaced = 0
+        for worker in workers:
+            try:
+                worker.call({"op": "ping"}, PING_TIMEOUT)
+                broken = False
+            except WorkerError:
+                broken = True
+                replaced += 1
+            self._release(worker, broken=broken)
+        if replaced:
+            print(f"⚠️ 응답 없는 ansible 실행 풀 워커 {replaced}개 교체")
+        return replaced
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            idle = sum(len(workers) for workers in self._idle.values())
+            total = sum(self._counts.values())
+            return {"idle": idle, "busy": self._busy, "starting": total - idle - self._busy}
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            workers = [worker for idle in self._idle.values() for worker in idle]
+            self._idle = {}
+        for worker in workers:
+            worker.close()
+
+pool = AnsiblePool()
+
+def run(args: List[str], phase: str, timeout: Optional[float] = None,
+        env: Optional[Dict[str, str]] = None) -> subprocess.CompletedProcess:
+    """process_usage.run과 같은 인터페이스, 가능하면 미리 준비된 워커로 실행"""
+    env = dict(env) if env is not None else dict(os.environ)
+    result = pool.run(args, phase, timeout, env)
+    if result is None:
+        result = process_usage.run(args, phase=phase, timeout=timeout, env=env)
+    return result
@@ -1,52 +1,139 @@
 import subprocess
 import tempfile
+import shutil
 import json
+import math
 import os
+from datetime import timedelta
+from app import metrics, process_usage, tracing
+
+# 점검 플레이북/스크립트 기본 디렉토리
+CHECK_PLAYBOOK_DIR = os.environ.get("CHECK_PLAYBOOK_DIR", "/home/user/ansible-manager/backend/playbooks")
+
+# ansible 실행 시 사용하는 Ansible jsonfile 팩트 캐시 (기본: 플레이북 디렉토리 아래)
+ANSIBLE_FACT_CACHE_DIR = os.environ.get("ANSIBLE_FACT_CACHE_DIR", os.path.join(CHECK_PLAYBOOK_DIR, "fact_cache"))
+ANSIBLE_FACT_CACHE_TTL = timedelta(hours=24)
+
+# 일괄 OS 감지 설정
+BULK_DETECT_FORKS = 50
+BULK_DETECT_CONNECT_TIMEOUT = 10
+BULK_DETECT_WAVE_TIMEOUT = 30
+
+def ansible_fact_cache_env():
+    """ansible-playbook이 facts를 다시 수집하지 않도록 하는 환경 변수"""
+    return {
+        "ANSIBLE_GATHERING": "smart",
+        "ANSIBLE_CACHE_PLUGIN": "jsonfile",
+        "ANSIBLE_CACHE_PLUGIN_CONNECTION": ANSIBLE_FACT_CACHE_DIR,
+        "ANSIBLE_CACHE_PLUGIN_TIMEOUT": str(int(ANSIBLE_FACT_CACHE_TTL.total_seconds())),
+    }
+
+def inventory_line(ip, username, password):
+    """단일 호스트 인벤토리 라인"""
+    return (
+        f"{ip} ansible_user={username} ansible_password={password} ansible_become=yes "
+        f"ansible_become_method=sudo ansible_become_password={password} "
+        f"ansible_ssh_common_args='-o StrictHostKeyChecking=no'"
+    )
+
+def _os_info_from_facts(facts):
+    """setup 결과에서 'Ubuntu 22.04' 형식 OS 정보 추출"""
+    ansible_facts = facts.get("ansible_facts", {})
+    distro = ansible_facts.get("ansible_distribution", "")
+    version = ansible_facts.get("ansible_distribution_version", "")
+    return f"{distro} {version}".strip()
 
 def get_os_info_with_ansible(ip, username, password):
-    inventory_content = f"""[target]
-{ip} ansible_user={username} ansible_password={password} ansible_become=yes ansible_become_method=sudo ansible_become_password={password} ansible_ssh_common_args='-o StrictHostKeyChecking=no'
-"""
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False) as inv_file:
-        inv_file.write(inventory_content)
-        inv_path = inv_file.name
-
-    facts_path = f"/tmp/ansible_facts/{ip}"
-    try:
-        result = subprocess.run(
-            [
-                "ansible",
-                "all",
-                "-i", inv_path,
-                "-m", "setup",
-                "-a", "filter=ansible_distribution*",
-                "-o",
-                "--tree", "/tmp/ansible_facts"
-            ],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+    """단일 호스트 OS 정보 감지 (실패 시 'Unknown')"""
+    with tracing.span("os_detect", ip=ip):
+        entry = get_os_info_bulk([{"ip": ip, "username": username, "password": password}])[ip]
+    if entry["error"]:
+        print(f"Error getting OS info ({ip}):", entry["error"])
+    return entry["os"] or "Unknown"
+
+def _read_fact_tree(results, tree_dir, timed_out):
+    """--tree 디렉토리의 호스트별 facts 파일을 결과에 반영"""
+    for ip, entry in results.items():
+        facts_path = os.path.join(tree_dir, ip)
         if not os.path.exists(facts_path):
-            print("Ansible facts file not found:", facts_path)
-            print("STDOUT:", result.stdout)
-            print("STDERR:", result.stderr)
-            return "Unknown"
-        with open(facts_path, "r") as f:
-            facts = json.load(f)
-        distro = facts["ansible_facts"].get("ansible_distribution", "")
-        version = facts["ansible_facts"].get("ansible_distribution_version", "")
-        return f"{distro} {version}".strip()
-    except Exception as e:
-        print("Error getting OS info:", e)
-        return "Unknown"
-    finally:
+            entry["error"] = "OS 감지 시간 초과" if timed_out else "Ansible facts 파일이 생성되지 않았습니다"
+            continue
         try:
-            os.remove(inv_path)
-        except:
-            pass
+            with open(facts_path, "r") as f:
+                facts = json.load(f)
+        except Exception as e:
+            entry["error"] = f"facts 파일 읽기 실패: {e}"
+            continue
+        if facts.get("unreachable") or facts.get("failed") or "ansible_facts" not in facts:
+            entry["error"] = facts.get("msg") or "OS 정보 수집 실패"
+            continue
+        # 전체 facts는 Ansible 팩트 캐시에 있으므로 DB에는 배포판 정보만 저장
+        entry["facts"] = {key: value for key, value in facts["ansible_facts"].items()
+                          if key.startswith("ansible_distribution")}
+        entry["os"] = _os_info_from_facts(facts) or None
+        if entry["os"] is None:
+            entry["error"] = "배포판 정보가 없습니다"
+
+def get_os_info_bulk(hosts):
+    """여러 호스트 OS 정보를 setup 1회 실행으로 병렬 감지
+
+    hosts: [{"ip", "username", "password"}, ...]
+    반환: {ip: {"os": str | None, "facts": dict | None, "error": str | None}}
+    """
+    results = {host["ip"]: {"os": None, "facts": None, "error": None} for host in hosts}
+    if not hosts:
+        return results
+
+    with tracing.span("prepare"):
+        inventory_content = "[target]\n" + "\n".join(
+            inventory_line(host["ip"], host["username"], host["password"]) for host in hosts
+        ) + "\n"
+        with tempfile.NamedTemporaryFile(mode='w+', delete=False) as inv_file:
+            inv_file.write(inventory_content)
+            inv_path = inv_file.name
+
+        # 호출마다 별도 디렉토리를 사용해 동시 실행 간 충돌 방지
+        tree_dir = tempfile.mkdtemp(prefix="ansible_facts_")
+    waves = math.ceil(len(hosts) / BULK_DETECT_FORKS)
+    try:
+        timed_out = False
         try:
-            if os.path.exists(facts_path):
-                os.remove(facts_path)
-        except:
-            pass
+            with metrics.ansible_phase("setup"), tracing.span("ansible_setup", hosts=len(hosts)):
+                result = process_usage.run(
+                    [
+                        "ansible",
+                        "all",
+                        "-i", inv_path,
+                        # 전체 facts를 팩트 캐시에 저장해 이후 플레이북이 다시 수집하지 않도록 filter 없이 실행
+                        "-m", "setup",
+                        "-f", str(BULK_DETECT_FORKS),
+                        "-T", str(BULK_DETECT_CONNECT_TIMEOUT),
+                        "-o",
+                        "--tree", tree_dir
+                    ],
+                    phase="setup",
+                    timeout=BULK_DETECT_WAVE_TIMEOUT * waves,
+                    env={**os.environ, **ansible_fact_cache_env()}
+                )
+            if result.returncode not in (0, 2, 4):
+                print("Bulk OS detection STDERR:", result.stderr)
+        except subprocess.TimeoutExpired:
+            # 시간 초과 전에 수집된 호스트 결과는 그대로 사용
+            timed_out = True
+
+        with tracing.span("parse_facts"):
+            _read_fact_tree(results, tree_dir, timed_out)
+    except Exception as e:
+        print("Error getting bulk OS info:", e)
+        for entry in results.values():
+            if entry["os"] is None and entry["error"] is None:
+                entry["error"] = str(e)
+    finally:
+        with tracing.span("cleanup"):
+            try:
+                os.remove(inv_path)
+            except:
+                pass
+            shutil.rmtree(tree_dir, ignore_errors=True)
+
+    return results
@@ -0,0 +1,165 @@
+# app/ansible_worker.py
+"""미리 import된 ansible 실행 프로세스 (app.ansible_pool이 실행)
+
+ansible 모듈을 한 번 import해 둔 뒤, 요청마다 fork한 자식 프로세스에서 ansible/ansible-playbook CLI를
+실행합니다. 자식은 import 비용 없이 바로 시작하고, ansible의 전역 상태(CLI 인자, display, 플러그인 로더)는
+자식 안에서만 바뀌므로 다음 요청에 남지 않습니다.
+
+ansible이 설치된 Python이면 실행할 수 있도록 표준 라이브러리만 사용합니다 (app 패키지 import 안 함).
+프로토콜: stdin/stdout에 JSON 한 줄씩
+    → {"op": "run", "args": [...], "env": {...}, "timeout": 300}
+    ← {"returncode", "stdout", "stderr", "timed_out", "wall_seconds", "rusage": {...}}
+    → {"op": "ping"}  ← {"ok": true, "pid": ..., "jobs": ...}
+"""
+
+import json
+import os
+import signal
+import sys
+import tempfile
+import time
+import traceback
+
+# 미리 import할 모듈 (실행마다 필요한 CLI, 실행기, 자주 쓰는 플러그인)
+PRELOAD_MODULES = (
+    "ansible.executor.task_queue_manager",
+    "ansible.executor.playbook_executor",
+    "ansible.inventory.manager",
+    "ansible.vars.manager",
+    "ansible.plugins.connection.ssh",
+    "ansible.plugins.callback.json",
+    "ansible.plugins.callback.oneline",
+    "ansible.plugins.action.script",
+    "ansible.plugins.action.normal",
+)
+WAIT_POLL_SECONDS = 0.005
+
+def _load_entrypoints():
+    """CLI 이름 → main 함수 (ansible 미설치 시 ImportError)"""
+    import importlib
+    from ansible.cli import adhoc, playbook
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+    return {"ansible": adhoc.main, "ansible-playbook": playbook.main}
+
+def _exit_code(error: SystemExit) -> int:
+    if error.code is None:
+        return 0
+    if isinstance(error.code, int):
+        return error.code
+    print(error.code, file=sys.stderr)
+    return 1
+
+def _run_child(entrypoint, args, env, stdout_fd, stderr_fd, protocol_fds):
+    """fork된 자식: 출력 연결 후 CLI 실행 (반환하지 않음)"""
+    code = 250
+    try:
+        os.setsid()  # 시간 초과 시 ansible이 띄운 ssh까지 프로세스 그룹으로 종료
+        for fd in protocol_fds:
+            os.close(fd)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        os.environ.clear()
+        os.environ.update(env)
+        sys.argv = list(args)
+        try:
+            entrypoint(list(args))
+            code = 0
+        except SystemExit as e:
+            code = _exit_code(e)
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+def _wait(pid: int, timeout):
+    """자식 종료 대기 (시간 초과 시 프로세스 그룹 강제 종료)"""
+    deadline = time.monotonic() + timeout if timeout else None
+    while True:
+        waited, status, rusage = os.wait4(pid, os.WNOHANG)
+        if waited:
+            return status, rusage, False
+        if deadline and time.monotonic() >= deadline:
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            _, status, rusage = os.wait4(pid, 0)
+            return status, rusage, True
+        time.sleep(WAIT_POLL_SECONDS)
+
+def _read(file) -> str:
+    file.seek(0)
+    return file.read().decode("utf-8", errors="replace")
+
+def run_job(entrypoints, request, protocol_fds):
+    name = os.path.basename(request["args"][0])
+    entrypoint = entrypoints.get(name)
+    if entrypoint is None:
+        return {"error": f"지원하지 않는 명령입니다: {name}"}
+
+    with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        started = time.monotonic()
+        pid = os.fork()
+        if pid == 0:
+            _run_child(entrypoint, request["args"], request["env"], stdout.fileno(), stderr.fileno(),
+                       protocol_fds)
+        status, rusage, timed_out = _wait(pid, request.get("timeout"))
+        return {
+            "returncode": os.waitstatus_to_exitcode(status),
+            "stdout": _read(stdout),
+            "stderr": _read(stderr),
+            "timed_out": timed_out,
+            "wall_seconds": time.monotonic() - started,
+            "rusage": {"ru_utime": rusage.ru_utime, "ru_stime": rusage.ru_stime, "ru_maxrss": rusage.ru_maxrss}
+        }
+
+def serve():
+    # 프로토콜은 복제한 fd로 주고받고, 0/1번은 다른 출력이 섞이지 않도록 막음
+    protocol_in = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    protocol_out = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(2, 1)
+    protocol_fds = (protocol_in.fileno(), protocol_out.fileno())
+
+    def reply(message):
+        protocol_out.write(json.dumps(message, ensure_ascii=False) + "\n")
+        protocol_out.flush()
+
+    try:
+        entrypoints = _load_entrypoints()
+        from ansible import __version__ as ansible_version
+    except Exception as e:
+        reply({"ready": False, "error": f"{type(e).__name__}: {e}"})
+        return 1
+    reply({"ready": True, "pid": os.getpid(), "ansible_version": ansible_version})
+
+    jobs = 0
+    for line in protocol_in:
+        request = json.loads(line)
+        if request.get("op") == "ping":
+            reply({"ok": True, "pid": os.getpid(), "jobs": jobs})
+        elif request.get("op") == "run":
+            jobs += 1
+            try:
+                reply(run_job(entrypoints, request, protocol_fds))
+            except Exception as e:
+                reply({"error": f"{type(e).__name__}: {e}"})
+        else:
+            reply({"error": f"알 수 없는 요청입니다: {request.get('op')}"})
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(serve())
@@ -0,0 +1,148 @@
+# app/check_bitset.py
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+# 정규 점검 코드 테이블 (KISA U-01 ~ U-72). 순서가 곧 비트 위치이므로 뒤에만 추가할 것
+CHECK_CODES: Tuple[str, ...] = tuple(f"U-{n:02d}" for n in range(1, 73))
+CODE_INDEX: Dict[str, int] = {code: i for i, code in enumerate(CHECK_CODES)}
+
+BITSET_VERSION = 1
+PLANE_BYTES = (len(CHECK_CODES) + 7) // 8
+BITSET_BYTES = 1 + PLANE_BYTES * 2  # 버전 1바이트 + pass/fail 평면
+
+STATUS_PASS = "pass"
+STATUS_FAIL = "fail"
+STATUS_NA = "na"
+
+_RESULT_WORDS = {
+    "양호": STATUS_PASS,
+    "취약": STATUS_FAIL,
+    "N/A": STATUS_NA,
+}
+
+# "※ U-01 결과 : 취약(Vulnerable)", "U-01 최종 결과: 양호" 형식
+_RESULT_LINE_PATTERN = re.compile(r"U-(\d{2})\s*(?:최종\s*)?결과\s*:\s*(양호|취약|N/A)")
+# 결과 CSV의 "U-01,양호" 형식
+_RESULT_CSV_PATTERN = re.compile(r'^\s*"?U-(\d{2})"?\s*,\s*"?(양호|취약|N/A)', re.MULTILINE)
+
+def parse_check_outcomes(output: Optional[str]) -> Dict[str, str]:
+    """점검 출력에서 항목코드별 결과(pass/fail/na) 추출"""
+    outcomes: Dict[str, str] = {}
+    if not output:
+        return outcomes
+
+    # ansible -o 출력은 개행이 이스케이프된 한 줄이므로 먼저 복원
+    text = output.replace("\\n", "\n")
+
+    for pattern in (_RESULT_CSV_PATTERN, _RESULT_LINE_PATTERN):
+        for match in pattern.finditer(text):
+            code = f"U-{match.group(1)}"
+            if code in CODE_INDEX:
+                outcomes[code] = _RESULT_WORDS[match.group(2)]
+
+    return outcomes
+
+def encode_outcomes(outcomes: Dict[str, str]) -> bytes:
+    """항목코드별 결과를 고정 폭 비트셋으로 인코딩
+
+    레이아웃: [버전 1B][pass 평면][fail 평면] (각 평면은 little-endian 비트맵)
+    pass만 설정 = 양호, fail만 설정 = 취약, 둘 다 설정 = N/A, 둘 다 없음 = 미점검
+    """
+    pass_bits = 0
+    fail_bits = 0
+    for code, status in outcomes.items():
+        index = CODE_INDEX.get(code)
+        if index is None:
+            continue
+        bit = 1 << index
+        if status in (STATUS_PASS, STATUS_NA):
+            pass_bits |= bit
+        if status in (STATUS_FAIL, STATUS_NA):
+            fail_bits |= bit
+
+    return (
+        bytes([BITSET_VERSION])
+        + pass_bits.to_bytes(PLANE_BYTES, "little")
+        + fail_bits.to_bytes(PLANE_BYTES, "little")
+    )
+
+def decode_planes(blob: Optional[bytes]) -> Tuple[int, int]:
+    """비트셋에서 (pass 평면, fail 평면) 정수 추출"""
+    if not blob or len(blob) != BITSET_BYTES or blob[0] != BITSET_VERSION:
+        return 0, 0
+    pass_bits = int.from_bytes(blob[1:1 + PLANE_BYTES], "little")
+    fail_bits = int.from_bytes(blob[1 + PLANE_BYTES:], "little")
+    return pass_bits, fail_bits
+
+def status_masks(blob: Optional[bytes]) -> Dict[str, int]:
+    """상태별 비트 마스크 (passed/failed/na/evaluated)"""
+    pass_bits, fail_bits = decode_planes(blob)
+    return {
+        "passed": pass_bits & ~fail_bits,
+        "failed": fail_bits & ~pass_bits,
+        "na": pass_bits & fail_bits,
+        "evaluated": pass_bits | fail_bits,
+    }
+
+def codes_from_mask(mask: int) -> List[str]:
+    """비트 마스크를 항목코드 목록으로 변환"""
+    codes = []
+    while mask:
+        low_bit = mask & -mask
+        codes.append(CHECK_CODES[low_bit.bit_length() - 1])
+        mask ^= low_bit
+    return codes
+
+def merge_bitsets(previous: Optional[bytes], current: Optional[bytes]) -> bytes:
+    """이전 결과에 현재 결과를 덮어쓴 비트셋 (현재 실행에서 점검한 항목만 교체)"""
+    prev_pass, prev_fail = decode_planes(previous)
+    cur_pass, cur_fail = decode_planes(current)
+    keep = ~(cur_pass | cur_fail)
+    pass_bits = (prev_pass & keep) | cur_pass
+    fail_bits = (prev_fail & keep) | cur_fail
+    return (
+        bytes([BITSET_VERSION])
+        + pass_bits.to_bytes(PLANE_BYTES, "little")
+        + fail_bits.to_bytes(PLANE_BYTES, "little")
+    )
+
+def decode_outcomes(blob: Optional[bytes]) -> Dict[str, str]:
+    """비트셋을 항목코드별 결과로 디코딩"""
+    masks = status_masks(blob)
+    outcomes = {}
+    for status, key in ((STATUS_PASS, "passed"), (STATUS_FAIL, "failed"), (STATUS_NA, "na")):
+        for code in codes_from_mask(masks[key]):
+            outcomes[code] = status
+    return outcomes
+
+def count_outcomes(blob: Optional[bytes]) -> Dict[str, int]:
+    """상태별 항목 수 (popcount)"""
+    masks = status_masks(blob)
+    return {
+        "total": masks["evaluated"].bit_count(),
+        "passed": masks["passed"].bit_count(),
+        "failed": masks["failed"].bit_count(),
+        "na": masks["na"].bit_count(),
+    }
+
+def diff_bitsets(previous: Optional[bytes], current: Optional[bytes]) -> Dict[str, List[str]]:
+    """두 실행 결과 비트셋 비교 (XOR)"""
+    prev_pass, prev_fail = decode_planes(previous)
+    cur_pass, cur_fail = decode_planes(current)
+
+    changed = (prev_pass ^ cur_pass) | (prev_fail ^ cur_fail)
+    prev_failed = prev_fail & ~prev_pass
+    cur_failed = cur_fail & ~cur_pass
+
+    return {
+        "changed": codes_from_mask(changed),
+        "newly_failed": codes_from_mask(cur_failed & ~prev_failed),
+        "newly_passed": codes_from_mask(prev_failed & (cur_pass & ~cur_fail)),
+    }
+
+def changed_count(previous: Optional[bytes], current: Optional[bytes]) -> int:
+    """변경된 항목 수 (XOR + popcount)"""
+    prev_pass, prev_fail = decode_planes(previous)
+    cur_pass, cur_fail = decode_planes(current)
+    return ((prev_pass ^ cur_pass) | (prev_fail ^ cur_fail)).bit_count()
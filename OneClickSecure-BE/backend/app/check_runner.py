@@ -1,8 +1,40 @@
+import contextvars
 import tempfile
 import subprocess
 import os
 import re
 import codecs
+import json
+import math
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List
+from app.ansible_utils import CHECK_PLAYBOOK_DIR, ansible_fact_cache_env, inventory_line
+from app.inventory_provider import os_group_names
+from app import ansible_pool, metrics, process_usage, tracing, tuning
+from app.timeouts import TIMEOUT_EXIT_CODE
+
+# OS 그룹 단위 점검 설정 (튜닝 프로필 미지정 시, 프로필은 forks 값 사용)
+GROUP_CHECK_FORKS = 50
+
+# 대규모 점검은 그룹을 샤드로 나눠 샤드마다 ansible-playbook 프로세스 1개 실행
+# (ansible 컨트롤러의 결과 처리는 프로세스당 코어 1개만 사용하므로 코어 수만큼 분할)
+CHECK_SHARD_COUNT = int(os.environ.get("CHECK_SHARDS") or os.cpu_count() or 1)
+CHECK_SHARD_MIN_HOSTS = 100   # 샤드당 최소 호스트 수 (이보다 작으면 프로세스 기동 비용이 더 큼)
+
+# 그룹 점검 인벤토리가 비밀번호를 조회하는 환경 변수 (인벤토리 파일에는 비밀번호를 쓰지 않음)
+GROUP_PASSWORD_ENV = "OCS_CHECK_PASSWORD"
+
+# 타임아웃 미지정 시 기본값 (호스트별 값은 app.timeouts에서 이력 기반으로 계산)
+DEFAULT_CHECK_TIMEOUT = 300
+
+# 원격 스크립트 실행 구간 표시 (stderr로 출력, 결과에서는 제거)
+# 종료 표시는 trap 대신 래퍼가 점검 스크립트 실행 직후 출력 (스크립트가 trap을 바꿔도 누락되지 않도록)
+REMOTE_TRACE_START = 'echo "OCS_TRACE remote_start $(date +%s%N)" >&2\n'
+REMOTE_TRACE_END = 'echo "OCS_TRACE remote_end $(date +%s%N)" >&2\n'
+_REMOTE_TRACE_RE = re.compile(r"OCS_TRACE remote_(start|end) (\d+)(?:\\n|\n)?")
 
 def extract_check_result(ansible_stdout):
     match = re.search(r'"check_result.stdout":\s*"((?:[^"\\]|\\.)*)"', ansible_stdout)
@@ -10,21 +42,46 @@ def extract_check_result(ansible_stdout):
         return codecs.decode(match.group(1), 'unicode_escape')
     return ansible_stdout
 
-def run_os_check_script(ip, username, password, os_info, host_id=None, hostname=None):
-    BASE_PATH = "/home/user/ansible-manager/backend/playbooks"
+def _record_remote_span(output):
+    """원격 스크립트 실행 시간을 ansible span 하위로 기록 (원격 시계 기준이므로 종료 시각에 맞춰 배치)
+
+    ansible 전체 시간에서 이 구간을 뺀 나머지가 프로세스 기동/SSH 연결/sudo 시간
+    """
+    marks = dict(_REMOTE_TRACE_RE.findall(output or ""))
+    if "start" in marks and "end" in marks:
+        ansible_end_ns = time.time_ns()
+        duration_ns = max(0, int(marks["end"]) - int(marks["start"]))
+        tracing.record_span("remote_script", ansible_end_ns - duration_ns, ansible_end_ns)
+
+def select_check_script(os_info):
+    """OS 정보에 맞는 KISA 점검 스크립트 경로"""
+    os_info = os_info or ""
     if "Ubuntu" in os_info:
-        script_path = f"{BASE_PATH}/ubuntu_check.py"
-    elif "CentOS" in os_info:
-        script_path = f"{BASE_PATH}/centos_check.py"
-    else:
-        script_path = f"{BASE_PATH}/generic_check.py"
+        return f"{CHECK_PLAYBOOK_DIR}/ubuntu_check.py"
+    if "CentOS" in os_info:
+        return f"{CHECK_PLAYBOOK_DIR}/centos_check.py"
+    return f"{CHECK_PLAYBOOK_DIR}/generic_check.py"
+
+def prewarm_executor_pool(profile=None):
+    """단일 호스트 점검(run_os_check_script, run_custom_script)이 쓰는 환경의 ansible 워커 준비
 
-    inventory_content = f"""[target]
+    profile: 실행 튜닝 프로필 (ansible 환경 변수가 다르면 워커도 따로 준비)
+    """
+    profile_env = tuning.ansible_env(profile)
+    ansible_pool.pool.prewarm({**os.environ, **profile_env})
+    ansible_pool.pool.prewarm({**os.environ, **ansible_fact_cache_env(), **profile_env})
+
+def run_os_check_script(ip, username, password, os_info, host_id=None, hostname=None,
+                        timeout=DEFAULT_CHECK_TIMEOUT, profile=None):
+    script_path = select_check_script(os_info)
+
+    with tracing.span("prepare"):
+        inventory_content = f"""[target]
 {ip} ansible_user={username} ansible_password={password} ansible_become=yes ansible_become_method=sudo ansible_become_password={password} ansible_ssh_common_args='-o StrictHostKeyChecking=no'
 """
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False) as inv_file:
-        inv_file.write(inventory_content)
-        inv_path = inv_file.name
+        with tempfile.NamedTemporaryFile(mode='w+', delete=False) as inv_file:
+            inv_file.write(inventory_content)
+            inv_path = inv_file.name
 
     # 플레이북에 전달할 extra_vars 준비
     extra_vars = [
@@ -37,39 +94,44 @@ def run_os_check_script(ip, username, password, os_info, host_id=None, hostname=
         extra_vars.extend(["-e", f"hostname={hostname}"])
 
     try:
-        result = subprocess.run(
-            [
-                "ansible-playbook",
-                "-i", inv_path,
-                f"{BASE_PATH}/run_script.yml",
-            ] + extra_vars,
-            capture_output=True,
-            text=True,
-            timeout=300
-        )
+        with metrics.ansible_phase("playbook"), tracing.span("ansible_playbook", script=script_path) as attrs:
+            result = ansible_pool.run(
+                [
+                    "ansible-playbook",
+                    "-i", inv_path,
+                    f"{CHECK_PLAYBOOK_DIR}/run_script.yml",
+                ] + extra_vars,
+                phase="playbook",
+                timeout=timeout,
+                env={**os.environ, **ansible_fact_cache_env(), **tuning.ansible_env(profile)}
+            )
+            attrs["returncode"] = result.returncode
         clean_stdout = extract_check_result(result.stdout)
         return {
             "stdout": clean_stdout,
             "stderr": result.stderr,
-            "returncode": result.returncode
+            "returncode": result.returncode,
+            "usage": result.usage
+        }
+    except subprocess.TimeoutExpired as e:
+        return {
+            "stdout": "",
+            "stderr": f"점검 실행 시간 초과 ({timeout}초)",
+            "returncode": TIMEOUT_EXIT_CODE,
+            "usage": process_usage.timeout_usage(e)
         }
     finally:
-        os.remove(inv_path)
-def run_os_check_script_with_password(ip, username, password, os_info, host_id=None, hostname=None):
+        with tracing.span("cleanup"):
+            os.remove(inv_path)
+def run_os_check_script_with_password(ip, username, password, os_info, host_id=None, hostname=None,
+                                      timeout=DEFAULT_CHECK_TIMEOUT):
     """비밀번호를 사용한 기본 OS 점검 스크립트 실행"""
-    
-    BASE_PATH = "/home/user/ansible-manager/backend/playbooks"
-    if "Ubuntu" in os_info:
-        script_path = f"{BASE_PATH}/ubuntu_check.py"
-    elif "CentOS" in os_info:
-        script_path = f"{BASE_PATH}/centos_check.py"
-    else:
-        script_path = f"{BASE_PATH}/generic_check.py"
-    
+    script_path = select_check_script(os_info)
+
     try:
         with open(script_path, 'r', encoding='utf-8') as f:
             script_content = f.read()
-        return run_custom_script(ip, username, password, script_content, host_id, hostname)
+        return run_custom_script(ip, username, password, script_content, host_id, hostname, timeout)
     except Exception as e:
         return {
             "stdout": "",
@@ -77,37 +139,449 @@ def run_os_check_script_with_password(ip, username, password, os_info, host_id=N
             "returncode": 1
         }
 
+def partition_hosts_by_os(hosts: List[Dict]) -> Dict[str, Dict]:
+    """호스트를 OS/버전 그룹별로 분할 (그룹명은 동적 인벤토리와 동일)
+
+    hosts: [{"ip", "username", "os_info", "host_id", "hostname", "timeout"}, ...]
+    반환: {group: {"script_path": str, "hosts": [...]}}
+    """
+    partitions: Dict[str, Dict] = {}
+    for host in hosts:
+        # 가장 구체적인 그룹(os_ubuntu_22_04) 단위로 실행
+        group = os_group_names(host.get("os_info"))[-1]
+        partition = partitions.setdefault(group, {
+            "script_path": select_check_script(host.get("os_info")),
+            "hosts": []
+        })
+        partition["hosts"].append(host)
+    return partitions
+
+def _group_inventory(group, script_path, hosts):
+    """그룹 변수로 점검 스크립트를 지정한 실행별 인벤토리
+
+    호스트별 check_timeout이 필요해 공유(동적) 인벤토리 대신 실행마다 작성하며, 비밀번호는 파일에 쓰지 않고
+    그룹 변수에서 ansible-playbook 프로세스 환경 변수(GROUP_PASSWORD_ENV)를 조회한다.
+    """
+    lines = [f"[{group}]"]
+    for host in hosts:
+        lines.append(
+            f"{host['ip']} ansible_user={host['username']} "
+            f"host_id={host.get('host_id') or host['ip']} username={host['username']} "
+            f"check_timeout={host.get('timeout') or DEFAULT_CHECK_TIMEOUT}"
+        )
+    password_lookup = f"\"{{{{ lookup('env', '{GROUP_PASSWORD_ENV}') }}}}\""
+    lines.append("")
+    lines.append(f"[{group}:vars]")
+    lines.append(f"script_path={script_path}")
+    lines.append(f"ansible_password={password_lookup}")
+    lines.append("ansible_become=yes")
+    lines.append("ansible_become_method=sudo")
+    lines.append(f"ansible_become_password={password_lookup}")
+    lines.append("ansible_ssh_common_args='-o StrictHostKeyChecking=no'")
+    return "\n".join(lines) + "\n"
+
+def _callback_time(value):
+    """json 콜백 시각 (UTC ISO 8601) → 로컬 naive datetime"""
+    try:
+        return datetime.fromisoformat(value).astimezone().replace(tzinfo=None)
+    except (TypeError, ValueError):
+        return None
+
+def _module_elapsed(task_result):
+    """command/shell 결과의 start/end로 계산한 호스트 실행 시간 (같은 원격 시계 기준, 없으면 None)"""
+    try:
+        start = datetime.strptime(task_result["start"], "%Y-%m-%d %H:%M:%S.%f")
+        end = datetime.strptime(task_result["end"], "%Y-%m-%d %H:%M:%S.%f")
+    except (KeyError, TypeError, ValueError):
+        return None
+    return end - start if end >= start else None
+
+# 그룹 점검 플레이북(run_script.yml) 태스크 모듈 → ansible 단계 메트릭 이름
+PLAYBOOK_TASK_PHASES = {"copy": "copy", "command": "script", "shell": "find", "fetch": "fetch"}
+
+def _observe_task_phases(report):
+    """json 콜백 태스크 duration을 단계별 소요 시간 메트릭으로 기록 (플레이북 내부 단계)"""
+    for play in report.get("plays", []):
+        for task in play.get("tasks", []):
+            duration = task.get("task", {}).get("duration", {})
+            start, end = _callback_time(duration.get("start")), _callback_time(duration.get("end"))
+            # action은 작성한 이름(copy) 또는 FQCN(ansible.builtin.copy)
+            actions = {(result.get("action") or "").rsplit(".", 1)[-1] for result in task.get("hosts", {}).values()}
+            phase = next((PLAYBOOK_TASK_PHASES[action] for action in actions if action in PLAYBOOK_TASK_PHASES), None)
+            if phase and start and end and end >= start:
+                metrics.observe_phase(phase, (end - start).total_seconds())
+
+def _host_timings(report):
+    """json 콜백 태스크 duration으로 호스트별 (시작, 종료) 계산
+
+    태스크 duration은 모든 호스트 공용이므로, 시작은 호스트가 처음 실행한 태스크의 시작 시각,
+    종료는 태스크 시작 + 호스트 실행 시간(command/shell start/end, 없으면 태스크 종료 시각) 중 가장 늦은 값
+    """
+    timings = {}
+    for play in report.get("plays", []):
+        for task in play.get("tasks", []):
+            duration = task.get("task", {}).get("duration", {})
+            task_start = _callback_time(duration.get("start"))
+            task_end = _callback_time(duration.get("end"))
+            if task_start is None:
+                continue
+            for ip, task_result in task.get("hosts", {}).items():
+                elapsed = _module_elapsed(task_result)
+                host_end = task_start + elapsed if elapsed is not None else (task_end or task_start)
+                started, completed = timings.get(ip, (task_start, host_end))
+                timings[ip] = (min(started, task_start), max(completed, host_end))
+    return timings
+
+# 태스크 timeout 초과 시 ansible 결과 메시지 (timedout 키가 없는 버전 대비)
+TASK_TIMEOUT_MESSAGE = "failed to execute in the expected time frame"
+
+def _task_timed_out(task_result) -> bool:
+    return bool(task_result.get("timedout")) or TASK_TIMEOUT_MESSAGE in (task_result.get("msg") or "")
+
+def _split_playbook_results(stdout, hosts, returncode):
+    """json 콜백 출력을 호스트별 결과로 분리 (태스크 timeout 초과 호스트는 TIMEOUT_EXIT_CODE)"""
+    try:
+        report = json.loads(stdout[stdout.index("{"):])
+    except ValueError:
+        # 파싱 실패 시 전체 출력을 각 호스트에 전달
+        return {host["ip"]: {"stdout": stdout, "stderr": "", "returncode": returncode or 1}
+                for host in hosts}
+
+    _observe_task_phases(report)
+    results = {host["ip"]: {"stdout": [], "stderr": [], "returncode": 0} for host in hosts}
+    for ip, (started_at, completed_at) in _host_timings(report).items():
+        if ip in results:
+            results[ip]["started_at"] = started_at
+            results[ip]["completed_at"] = completed_at
+    for play in report.get("plays", []):
+        for task in play.get("tasks", []):
+            for ip, task_result in task.get("hosts", {}).items():
+                entry = results.get(ip)
+                if entry is None:
+                    continue
+                if task_result.get("stdout"):
+                    entry["stdout"].append(task_result["stdout"])
+                if task_result.get("stderr"):
+                    entry["stderr"].append(task_result["stderr"])
+                if task_result.get("failed") or task_result.get("unreachable"):
+                    entry["stderr"].append(task_result.get("msg", ""))
+                if task_result.get("failed") and _task_timed_out(task_result):
+                    entry["timed_out"] = True
+
+    stats = report.get("stats", {})
+    for ip, entry in results.items():
+        host_stats = stats.get(ip)
+        timed_out = entry.pop("timed_out", False)
+        if host_stats is None:
+            entry["returncode"] = returncode or 1
+            entry["stderr"].append("호스트 실행 결과가 없습니다")
+        elif host_stats.get("unreachable"):
+            entry["returncode"] = 4
+        elif timed_out:
+            entry["returncode"] = TIMEOUT_EXIT_CODE
+        elif host_stats.get("failures"):
+            entry["returncode"] = 2
+        entry["stdout"] = "\n".join(entry["stdout"])
+        entry["stderr"] = "\n".join(message for message in entry["stderr"] if message)
+    return results
+
+def run_os_check_group(group, script_path, hosts, password, profile=None):
+    """OS 그룹 전체를 ansible-playbook 1회로 점검 (profile: 실행 튜닝 프로필)
+
+    반환: {ip: {"stdout", "stderr", "returncode", "started_at", "completed_at"}}
+    started_at/completed_at은 json 콜백의 호스트별 값 (없으면 그룹 실행 시작/종료 시각)
+    프로세스 전체가 시간 초과되면 호스트별 실행 시간을 알 수 없으므로 "duration_unknown": True
+    """
+    with tempfile.NamedTemporaryFile(mode='w+', delete=False) as inv_file:
+        inv_file.write(_group_inventory(group, script_path, hosts))
+        inv_path = inv_file.name
+
+    # 호스트별 타임아웃은 태스크 timeout(check_timeout)으로 적용하고,
+    # 프로세스 전체는 가장 긴 호스트 타임아웃 x 웨이브 수로 제한
+    forks = profile.forks if profile else GROUP_CHECK_FORKS
+    waves = math.ceil(len(hosts) / forks)
+    group_timeout = max(host.get("timeout") or DEFAULT_CHECK_TIMEOUT for host in hosts) * waves
+    started_at = datetime.now()
+    usage = None
+    try:
+        with metrics.ansible_phase("playbook"), tracing.span("ansible_playbook", group=group, hosts=len(hosts)):
+            result = process_usage.run(
+                [
+                    "ansible-playbook",
+                    "-i", inv_path,
+                    "-f", str(forks),
+                    f"{CHECK_PLAYBOOK_DIR}/run_script.yml",
+                ],
+                phase="playbook",
+                timeout=group_timeout,
+                env={**os.environ, **ansible_fact_cache_env(), **tuning.ansible_env(profile),
+                     "ANSIBLE_STDOUT_CALLBACK": "json", GROUP_PASSWORD_ENV: password}
+            )
+        usage = result.usage
+        results = _split_playbook_results(result.stdout, hosts, result.returncode)
+        if result.returncode not in (0, 2, 4):
+            for entry in results.values():
+                entry["stderr"] = "\n".join(filter(None, [entry["stderr"], result.stderr]))
+    except subprocess.TimeoutExpired as e:
+        usage = process_usage.timeout_usage(e)
+        # 그룹 전체 시간은 호스트별 실행 시간이 아니므로 타임아웃 이력에 남기지 않음 (duration_unknown)
+        results = {host["ip"]: {"stdout": "", "stderr": f"그룹 점검 시간 초과 ({group_timeout}초)",
+                                "returncode": TIMEOUT_EXIT_CODE, "duration_unknown": True}
+                   for host in hosts}
+    except Exception as e:
+        results = {host["ip"]: {"stdout": "", "stderr": f"그룹 점검 실행 오류: {str(e)}", "returncode": 1}
+                   for host in hosts}
+    finally:
+        os.remove(inv_path)
+
+    completed_at = datetime.now()
+    # 프로세스 1개를 그룹 호스트가 나눠 쓰므로 CPU는 호스트 수로 나눠 기록
+    host_usage = process_usage.share(usage, len(hosts))
+    for entry in results.values():
+        # 원격/콜백 시각 오차로 그룹 실행 구간을 벗어나지 않도록 보정
+        entry["started_at"] = min(max(entry.get("started_at") or started_at, started_at), completed_at)
+        entry["completed_at"] = min(max(entry.get("completed_at") or completed_at, entry["started_at"]), completed_at)
+        entry["usage"] = host_usage
+    return results
+
+def plan_shards(group_sizes: Dict[str, int], max_shards: int = None, min_hosts: int = None) -> Dict[str, int]:
+    """그룹별 샤드 수 (전체 샤드 수는 max_shards 이하, 그룹마다 최소 1개, 호스트 수에 비례)"""
+    max_shards = max_shards or CHECK_SHARD_COUNT
+    min_hosts = min_hosts or CHECK_SHARD_MIN_HOSTS
+    shards = {group: 1 for group in group_sizes}
+    spare = max_shards - len(shards)
+    while spare > 0:
+        # 샤드당 호스트 수가 가장 많은 그룹부터 추가 분할
+        group = max(group_sizes, key=lambda g: group_sizes[g] / shards[g])
+        if group_sizes[group] < (shards[group] + 1) * min_hosts:
+            break
+        shards[group] += 1
+        spare -= 1
+    return shards
+
+def shard_hosts(hosts: List[Dict], count: int) -> List[List[Dict]]:
+    """호스트를 count개 샤드로 분할 (번갈아 배치해 느린 호스트가 한 샤드에 몰리지 않도록)"""
+    return [hosts[index::count] for index in range(count) if hosts[index::count]]
+
+def run_os_check_groups(hosts: List[Dict], password, profile=None) -> Dict[str, Dict]:
+    """OS 그룹별로 분할해 병렬 점검 (큰 그룹은 샤드로 나눠 샤드마다 프로세스 1개)
+
+    반환: {group: {"script_path", "hosts", "results", "duration_seconds", "shards"}}
+    """
+    partitions = partition_hosts_by_os(hosts)
+    if not partitions:
+        return {}
+
+    shard_counts = plan_shards({group: len(partition["hosts"]) for group, partition in partitions.items()})
+    tasks = []
+    for group, partition in partitions.items():
+        shards = shard_hosts(partition["hosts"], shard_counts[group])
+        partition["results"] = {}
+        partition["shards"] = len(shards)
+        partition["duration_seconds"] = 0
+        tasks.extend((group, shard) for shard in shards)
+
+    def run(task):
+        group, shard = task
+        partition = partitions[group]
+        start = time.monotonic()
+        print(f"🚀 그룹 점검 시작: {group} ({len(shard)}대, 샤드 {partition['shards']}개 중 1)")
+        with tracing.span("os_group", group=group, hosts=len(shard)):
+            results = run_os_check_group(group, partition["script_path"], shard, password, profile)
+        return group, results, round(time.monotonic() - start, 2)
+
+    with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+        # 샤드마다 트레이스 컨텍스트를 복사해 실행
+        futures = [pool.submit(contextvars.copy_context().run, run, task) for task in tasks]
+        # 샤드 결과를 그룹 결과 하나로 병합 (소요 시간은 가장 늦은 샤드 기준)
+        for future in futures:
+            group, results, duration = future.result()
+            partition = partitions[group]
+            partition["results"].update(results)
+            partition["duration_seconds"] = max(partition["duration_seconds"], duration)
+
+    for group, partition in partitions.items():
+        print(f"✅ 그룹 점검 완료: {group} ({partition['duration_seconds']}초)")
+    return partitions
+
+
+# ==================== 셸 점검 스크립트 실행 백엔드 ====================
+# CHECK_EXECUTOR로 선택 (기본 ansible-cli). 모든 백엔드는 run_custom_script와 같은 결과 dict를 반환
+SCRIPT_EXECUTORS = ("ansible-cli", "ansible-runner", "ssh")
+DEFAULT_SCRIPT_EXECUTOR = os.environ.get("CHECK_EXECUTOR", "ansible-cli")
+
+def build_check_script(script_content):
+    """원격에서 실행할 래퍼 스크립트 (실행 구간 표시 + 결과 파일 출력)
+
+    KISA 점검 스크립트는 항목 결과를 stdout이 아니라 "$resultfile"에만 기록하므로, 스크립트 자신의
+    resultfile 정의를 지우고 원격 임시 디렉토리의 파일을 지정한 뒤 그 디렉토리에서 자식 bash로 실행하고, 끝나면 결과 파일을
+    stdout으로 출력합니다 (항목별 결과 파싱은 stdout 기준). 점검 스크립트는 grep 등의 실패 종료 코드를
+    조건으로 쓰므로 set -e 없이 실행합니다. 실행 구간 표시는 자식 bash 실행 전후에 래퍼가 직접 출력합니다.
+    """
+    delimiter = f"OCS_CHECK_SCRIPT_{uuid.uuid4().hex}"
+    return (
+        "#!/bin/bash\n"
+        'ocs_dir=$(mktemp -d)\n'
+        'export resultfile="$ocs_dir/result.csv"\n'
+        f"cat > \"$ocs_dir/check.sh\" <<'{delimiter}'\n"
+        + clean_script_content(script_content).rstrip("\n") + "\n"
+        + f"{delimiter}\n"
+        + REMOTE_TRACE_START
+        + '(cd "$ocs_dir" && bash check.sh </dev/null)\n'
+        "ocs_rc=$?\n"
+        + REMOTE_TRACE_END
+        + '[ -f "$resultfile" ] && cat "$resultfile"\n'
+        'rm -rf "$ocs_dir"\n'
+        "exit $ocs_rc\n"
+    )
+
+def take_remote_span(stderr):
+    """stderr의 원격 실행 구간 표시를 span으로 기록하고 제거 (ansible을 거치지 않는 백엔드용)"""
+    _record_remote_span(stderr)
+    return _REMOTE_TRACE_RE.sub("", stderr or "")
 
+class ScriptExecutor:
+    """셸 점검 스크립트 실행 백엔드
 
-def run_custom_script(ip, username, password, script_content, host_id=None, hostname=None):
-    """커스텀 스크립트 실행 - 3단계 처리"""
+    run_script 반환: {"stdout", "stderr", "returncode", "usage"}
+    """
+    name = ""
+
+    def unavailable_reason(self):
+        """사용할 수 없으면 사유 (필요한 패키지 미설치 등)"""
+        return None
+
+    def run_script(self, ip, username, password, script_content, host_id=None, hostname=None,
+                   timeout=DEFAULT_CHECK_TIMEOUT, profile=None) -> Dict:
+        """profile: 실행 튜닝 프로필 (백엔드에 해당하는 값만 적용)"""
+        raise NotImplementedError
+
+    def close(self):
+        """재사용 중인 연결 등 정리"""
+
+class AnsibleCliExecutor(ScriptExecutor):
+    """ansible -m script (기본값, 미리 준비된 워커 풀 사용)"""
+    name = "ansible-cli"
+
+    def run_script(self, ip, username, password, script_content, host_id=None, hostname=None,
+                   timeout=DEFAULT_CHECK_TIMEOUT, profile=None):
+        return _run_script_with_ansible(ip, username, password, script_content, host_id, hostname, timeout,
+                                        profile)
+
+class AnsibleRunnerExecutor(ScriptExecutor):
+    """ansible-runner로 script 모듈 실행 (이벤트에서 스크립트 출력만 추출)
+
+    ansible-runner가 프로세스를 직접 관리하므로 프로세스 자원 사용량은 기록하지 않음
+    """
+    name = "ansible-runner"
+
+    def unavailable_reason(self):
+        try:
+            import ansible_runner  # noqa: F401
+        except ImportError:
+            return "ansible-runner 패키지가 설치되어 있지 않습니다"
+        return None
+
+    def run_script(self, ip, username, password, script_content, host_id=None, hostname=None,
+                   timeout=DEFAULT_CHECK_TIMEOUT, profile=None):
+        import ansible_runner
+
+        with tempfile.TemporaryDirectory(prefix="ansible_runner_") as private_dir:
+            script_path = os.path.join(private_dir, "check.sh")
+            with open(script_path, "w", encoding="utf-8") as f:
+                f.write(build_check_script(script_content))
+            os.chmod(script_path, 0o755)
+
+            with metrics.ansible_phase("script"), tracing.span("ansible_runner") as attrs:
+                runner = ansible_runner.run(
+                    private_data_dir=private_dir,
+                    inventory=f"[target]\n{inventory_line(ip, username, password)}\n",
+                    host_pattern="all",
+                    module="script",
+                    module_args=script_path,
+                    envvars=tuning.ansible_env(profile),
+                    timeout=timeout,
+                    quiet=True
+                )
+                attrs["returncode"] = runner.rc
+
+            stdout, stderr = [], []
+            for event in runner.events:
+                if event.get("event") not in ("runner_on_ok", "runner_on_failed", "runner_on_unreachable"):
+                    continue
+                res = event.get("event_data", {}).get("res", {})
+                stdout.append(res.get("stdout", ""))
+                stderr.append(res.get("stderr", "") or res.get("msg", ""))
+
+        if runner.status == "timeout":
+            return {"stdout": "", "stderr": f"스크립트 실행 시간 초과 ({timeout}초)", "returncode": TIMEOUT_EXIT_CODE}
+        return {
+            "stdout": "".join(stdout),
+            "stderr": take_remote_span("\n".join(filter(None, stderr))),
+            "returncode": runner.rc
+        }
+
+_script_executors: Dict[str, ScriptExecutor] = {}
+
+def get_script_executor(name=None) -> ScriptExecutor:
+    """이름으로 실행 백엔드 조회 (None이면 CHECK_EXECUTOR)"""
+    name = name or DEFAULT_SCRIPT_EXECUTOR
+    executor = _script_executors.get(name)
+    if executor is not None:
+        return executor
+    if name == "ansible-cli":
+        executor = AnsibleCliExecutor()
+    elif name == "ansible-runner":
+        executor = AnsibleRunnerExecutor()
+    elif name == "ssh":
+        from app.ssh_executor import AsyncSshExecutor
+        executor = AsyncSshExecutor()
+    else:
+        raise ValueError(f"알 수 없는 실행 백엔드입니다: {name} (사용 가능: {', '.join(SCRIPT_EXECUTORS)})")
+    return _script_executors.setdefault(name, executor)
+
+def close_script_executors():
+    for executor in _script_executors.values():
+        executor.close()
+
+def run_custom_script(ip, username, password, script_content, host_id=None, hostname=None,
+                      timeout=DEFAULT_CHECK_TIMEOUT, executor=None, profile=None):
+    """커스텀 스크립트 실행 (executor 미지정 시 튜닝 프로필의 백엔드, 그것도 없으면 CHECK_EXECUTOR)"""
+    backend = get_script_executor(executor or (profile.executor if profile else None))
+    reason = backend.unavailable_reason()
+    if reason:
+        return {"stdout": "", "stderr": f"실행 백엔드 {backend.name} 사용 불가: {reason}", "returncode": 1}
+    return backend.run_script(ip, username, password, script_content, host_id, hostname, timeout, profile)
+
+def _run_script_with_ansible(ip, username, password, script_content, host_id=None, hostname=None,
+                             timeout=DEFAULT_CHECK_TIMEOUT, profile=None):
+    """ansible -m script로 커스텀 스크립트 실행 (ansible-cli 백엔드)"""
     
     import tempfile
     import os
 
     try:
-        # 임시 스크립트 파일 생성
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sh', delete=False, encoding='utf-8') as temp_script:
-            temp_script.write("#!/bin/bash\n")
-            temp_script.write("set -e\n")  # 오류 발생시 즉시 중단
-            temp_script.write(script_content)
-            temp_script_path = temp_script.name
-        
-        # 실행 권한 부여
-        os.chmod(temp_script_path, 0o755)
-        
-        # Ansible 인벤토리 생성
-        inventory_content = f"""[target]
+        with tracing.span("prepare"):
+            # 임시 스크립트 파일 생성
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.sh', delete=False, encoding='utf-8') as temp_script:
+                temp_script.write(build_check_script(script_content))
+                temp_script_path = temp_script.name
+            
+            # 실행 권한 부여
+            os.chmod(temp_script_path, 0o755)
+            
+            # Ansible 인벤토리 생성
+            inventory_content = f"""[target]
 {ip} ansible_user={username} ansible_password={password} ansible_become=yes ansible_become_method=sudo ansible_become_password={password} ansible_ssh_common_args='-o StrictHostKeyChecking=no'
 """
-        
-        with tempfile.NamedTemporaryFile(mode='w+', delete=False) as inv_file:
-            inv_file.write(inventory_content)
-            inv_path = inv_file.name
-        
-        # 결과 수집 디렉토리 설정
-        result_dir = "/home/user/ansible-manager/backend/playbooks/collected_results"
-        os.makedirs(result_dir, exist_ok=True)
+            
+            with tempfile.NamedTemporaryFile(mode='w+', delete=False) as inv_file:
+                inv_file.write(inventory_content)
+                inv_path = inv_file.name
+            
+            # 결과 수집 디렉토리 설정
+            result_dir = f"{CHECK_PLAYBOOK_DIR}/collected_results"
+            os.makedirs(result_dir, exist_ok=True)
         
         # 환경 변수 설정
         env_vars = {
@@ -118,42 +592,47 @@ def run_custom_script(ip, username, password, script_content, host_id=None, host
         
         try:
             # Ansible을 통해 스크립트 실행
-            result = subprocess.run([
-                "ansible",
-                "all",
-                "-i", inv_path,
-                "-m", "script",
-                "-a", temp_script_path,
-                "-o"
-            ], 
-            capture_output=True, 
-            text=True, 
-            timeout=300,
-            env={**os.environ, **env_vars}
-            )
+            with metrics.ansible_phase("script"), tracing.span("ansible") as attrs:
+                result = ansible_pool.run([
+                    "ansible",
+                    "all",
+                    "-i", inv_path,
+                    "-m", "script",
+                    "-a", temp_script_path,
+                    "-o"
+                ], 
+                phase="script", 
+                timeout=timeout,
+                env={**os.environ, **tuning.ansible_env(profile), **env_vars}
+                )
+                attrs["returncode"] = result.returncode
+                _record_remote_span(result.stdout)
             
             # 결과 정리
-            clean_stdout = extract_check_result(result.stdout) if result.stdout else ""
+            clean_stdout = extract_check_result(_REMOTE_TRACE_RE.sub("", result.stdout)) if result.stdout else ""
             
             return {
                 "stdout": clean_stdout,
                 "stderr": result.stderr,
-                "returncode": result.returncode
+                "returncode": result.returncode,
+                "usage": result.usage
             }
             
         finally:
             # 임시 파일들 정리
-            try:
-                os.remove(inv_path)
-                os.remove(temp_script_path)
-            except:
-                pass
+            with tracing.span("cleanup"):
+                try:
+                    os.remove(inv_path)
+                    os.remove(temp_script_path)
+                except:
+                    pass
                 
-    except subprocess.TimeoutExpired:
+    except subprocess.TimeoutExpired as e:
         return {
             "stdout": "",
-            "stderr": "스크립트 실행 시간 초과 (5분)",
-            "returncode": 1
+            "stderr": f"스크립트 실행 시간 초과 ({timeout}초)",
+            "returncode": TIMEOUT_EXIT_CODE,
+            "usage": process_usage.timeout_usage(e)
         }
     except Exception as e:
         return {
@@ -162,103 +641,6 @@ def run_custom_script(ip, username, password, script_content, host_id=None, host
             "returncode": 1
         }
 
-
-    # 결과 파일명 생성
-    import time
-    timestamp = str(int(time.time()))
-    result_filename = f"Results_{host_id or 'unknown'}_{username}_{timestamp}.csv"
-    
-    # 스크립트 헤더 + 내용 결합
-    script_header = f"""#!/bin/bash
-
-# 환경변수 설정
-export HOST_ID="{host_id or 'unknown'}"
-export USERNAME="{username}"
-export resultfile="/tmp/{result_filename}"
-
-# 결과 파일 초기화
-echo "항목코드,결과" > "$resultfile"
-
-echo "=== 점검 시작 ===" >&2
-echo "Result file: $resultfile" >&2
-
-"""
-    
-    # 기존 스크립트 정리 후 결합
-    cleaned_script = clean_script_content(script_content)
-    full_script = script_header + cleaned_script + f"""
-
-echo "=== 점검 완료 ===" >&2
-if [ -f "$resultfile" ]; then
-    echo "결과 파일 생성 완료: $resultfile" >&2
-    cat "$resultfile" >&2
-else
-    echo "ERROR: 결과 파일이 생성되지 않았습니다" >&2
-    exit 1
-fi
-"""
-    
-    # 임시 파일들 생성
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.sh', delete=False, encoding='utf-8') as temp_script:
-        temp_script.write(full_script)
-        temp_script_path = temp_script.name
-    
-    inventory_content = f"""[target]
-{ip} ansible_user={username} ansible_password={password} ansible_become=yes ansible_become_method=sudo ansible_become_password={password} ansible_ssh_common_args='-o StrictHostKeyChecking=no'
-"""
-    
-    with tempfile.NamedTemporaryFile(mode='w+', delete=False) as inv_file:
-        inv_file.write(inventory_content)
-        inv_path = inv_file.name
-
-    try:
-        print(f"🚀 스크립트 실행: {ip} -> {result_filename}")
-        
-        # 1단계: 스크립트 실행
-        script_result = subprocess.run([
-            "ansible", "all", "-i", inv_path,
-            "-m", "script", "-a", temp_script_path,
-            "-v"
-        ], capture_output=True, text=True, timeout=300)
-        
-        print(f"스크립트 실행 결과: {script_result.returncode}")
-        
-        # 2단계: 결과 파일 가져오기
-        fetch_result = subprocess.run([
-            "ansible", "all", "-i", inv_path,
-            "-m", "fetch",
-            "-a", f"src=/tmp/{result_filename} dest=/home/user/projects/OneClickSecure-BE/backend/playbooks/collected_results/ flat=yes",
-        ], capture_output=True, text=True)
-        
-        print(f"파일 가져오기 결과: {fetch_result.returncode}")
-        
-        # 3단계: 원격 임시 파일 정리
-        cleanup_result = subprocess.run([
-            "ansible", "all", "-i", inv_path,
-            "-m", "file",
-            "-a", f"path=/tmp/{result_filename} state=absent",
-        ], capture_output=True, text=True)
-        
-        return {
-            "stdout": script_result.stdout + "\n=== FETCH ===\n" + fetch_result.stdout,
-            "stderr": script_result.stderr + "\n" + fetch_result.stderr,
-            "returncode": script_result.returncode
-        }
-        
-    except subprocess.TimeoutExpired:
-        return {
-            "stdout": "",
-            "stderr": "스크립트 실행 시간 초과",
-            "returncode": 124
-        }
-    finally:
-        # 로컬 임시 파일 정리
-        try:
-            os.remove(temp_script_path)
-            os.remove(inv_path)
-        except:
-            pass
-
 def clean_script_content(script_content):
     """스크립트에서 기존 resultfile 정의나 shebang 제거"""
     lines = script_content.split('\n')
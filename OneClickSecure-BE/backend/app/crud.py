@@ -1,14 +1,32 @@
 # app/crud.py
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc, func, cast, Integer, String
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
-from app import models, schemas
+from app import models, schemas, check_bitset, metrics, tracing
+from app.inventory_provider import inventory, INVENTORY_GENERATION_KEY, read_generation
+import ipaddress
 import json
 
 # ==================== Host CRUD ====================
 
+def bump_inventory_generation(db: Session) -> int:
+    """인벤토리 세대 번호 증가 (커밋은 호출자가 수행)"""
+    db.execute(sqlite_insert(models.SystemConfig).values(
+        config_key=INVENTORY_GENERATION_KEY,
+        config_value="0",
+        config_type="int",
+        description="호스트 변경 시 증가하는 인벤토리 세대 번호"
+    ).on_conflict_do_nothing())
+    db.query(models.SystemConfig).filter(
+        models.SystemConfig.config_key == INVENTORY_GENERATION_KEY
+    ).update({
+        models.SystemConfig.config_value: cast(cast(models.SystemConfig.config_value, Integer) + 1, String)
+    }, synchronize_session=False)
+    return read_generation(db)
+
 def create_host(db: Session, host: schemas.HostCreate, os_info: str = None) -> models.Host:
     """호스트 생성"""
     # IP 중복 체크
@@ -20,13 +38,53 @@ def create_host(db: Session, host: schemas.HostCreate, os_info: str = None) -> m
         name=host.name,
         username=host.username,
         ip=host.ip,
+        ip_num=ip_to_int(host.ip),
         os=os_info
     )
     db.add(db_host)
+    bump_dashboard_counters(db, total_hosts=1, active_hosts=1)
+    generation = bump_inventory_generation(db)
     db.commit()
     db.refresh(db_host)
+    inventory.host_changed(db_host, generation)
     return db_host
 
+def create_hosts_bulk(db: Session, hosts: List[schemas.HostCreate],
+                      os_infos: Dict[str, str]) -> List[models.Host]:
+    """호스트 일괄 생성 (단일 트랜잭션, 중복 IP는 호출 전에 제외할 것)"""
+    db_hosts = [
+        models.Host(
+            name=host.name,
+            username=host.username,
+            ip=host.ip,
+            ip_num=ip_to_int(host.ip),
+            os=os_infos.get(host.ip)
+        )
+        for host in hosts
+    ]
+    try:
+        db.add_all(db_hosts)
+        bump_dashboard_counters(db, total_hosts=len(db_hosts), active_hosts=len(db_hosts))
+        generation = bump_inventory_generation(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    for db_host in db_hosts:
+        db.refresh(db_host)
+    inventory.hosts_changed(db_hosts, generation)
+    return db_hosts
+
+def get_existing_host_ips(db: Session, ips: List[str]) -> set:
+    """이미 등록된 IP 조회"""
+    existing = set()
+    for start in range(0, len(ips), 500):
+        chunk = ips[start:start + 500]
+        existing.update(
+            ip for (ip,) in db.query(models.Host.ip).filter(models.Host.ip.in_(chunk))
+        )
+    return existing
+
 def get_host(db: Session, host_id: int) -> Optional[models.Host]:
     """호스트 단일 조회"""
     return db.query(models.Host).filter(models.Host.id == host_id).first()
@@ -35,21 +93,147 @@ def get_host_by_ip(db: Session, ip: str) -> Optional[models.Host]:
     """IP로 호스트 조회"""
     return db.query(models.Host).filter(models.Host.ip == ip).first()
 
-def get_hosts(db: Session, skip: int = 0, limit: int = 100, 
-              filter_params: schemas.HostFilter = None) -> List[models.Host]:
-    """호스트 목록 조회 (필터링 지원)"""
+HOST_SORT_COLUMNS = {
+    "id": models.Host.id,
+    "name": models.Host.name,
+    "ip": models.Host.ip,
+    "os": models.Host.os,
+    "last_check_at": models.Host.last_check_at,
+    "last_status": models.Host.last_status,
+    "last_score": models.Host.last_score,
+    "last_failed_checks": models.Host.last_failed_checks,
+}
+
+def ip_to_int(ip: str) -> Optional[int]:
+    """IPv4 주소를 정수로 변환 (그 외는 None)"""
+    try:
+        address = ipaddress.ip_address(ip.strip())
+    except (ValueError, AttributeError):
+        return None
+    return int(address) if address.version == 4 else None
+
+def _prefix_filter(column, prefix: str):
+    """LIKE '%x%' 대신 인덱스 범위 스캔이 가능한 접두사 조건"""
+    return and_(column >= prefix, column < prefix + "\U0010ffff")
+
+def _host_filter_query(db: Session, filter_params: schemas.HostFilter = None):
+    """호스트 필터 조건 적용"""
     query = db.query(models.Host)
     
     if filter_params:
         if filter_params.name:
-            query = query.filter(models.Host.name.contains(filter_params.name))
+            query = query.filter(_prefix_filter(models.Host.name, filter_params.name))
         if filter_params.ip:
-            query = query.filter(models.Host.ip.contains(filter_params.ip))
+            query = query.filter(_prefix_filter(models.Host.ip, filter_params.ip))
+        if filter_params.ip_network:
+            network = ipaddress.ip_network(filter_params.ip_network, strict=False)
+            if network.version != 4:
+                raise ValueError("CIDR 필터는 IPv4만 지원합니다.")
+            query = query.filter(models.Host.ip_num.between(
+                int(network.network_address), int(network.broadcast_address)
+            ))
         if filter_params.os:
-            query = query.filter(models.Host.os.contains(filter_params.os))
+            query = query.filter(_prefix_filter(models.Host.os, filter_params.os))
+        if filter_params.last_status:
+            query = query.filter(models.Host.last_status == filter_params.last_status)
+        if filter_params.min_score is not None:
+            query = query.filter(models.Host.last_score >= filter_params.min_score)
+        if filter_params.max_score is not None:
+            query = query.filter(models.Host.last_score <= filter_params.max_score)
+        if filter_params.min_failed_checks is not None:
+            query = query.filter(models.Host.last_failed_checks >= filter_params.min_failed_checks)
+    
+    return query
+
+def get_hosts(db: Session, skip: int = 0, limit: Optional[int] = None, 
+              filter_params: schemas.HostFilter = None,
+              sort_by: str = "id", descending: bool = False) -> List[models.Host]:
+    """호스트 목록 조회 (필터링/정렬 지원, limit=None이면 전체)"""
+    query = _host_filter_query(db, filter_params)
+    
+    sort_column = HOST_SORT_COLUMNS.get(sort_by, models.Host.id)
+    if descending:
+        query = query.order_by(sort_column.desc(), models.Host.id.desc())
+    else:
+        query = query.order_by(sort_column, models.Host.id)
     
     return query.offset(skip).limit(limit).all()
 
+def get_hosts_page(db: Session, limit: int = 100, filter_params: schemas.HostFilter = None,
+                   sort_by: str = "id", descending: bool = False,
+                   after: Optional[tuple] = None) -> List[models.Host]:
+    """키셋(커서) 방식 호스트 목록 조회
+
+    after는 직전 페이지 마지막 행의 (정렬값, id). SQLite는 NULL을 ASC에서 앞,
+    DESC에서 뒤로 정렬하므로 같은 규칙으로 다음 위치를 계산한다.
+    """
+    query = _host_filter_query(db, filter_params)
+    sort_column = HOST_SORT_COLUMNS.get(sort_by, models.Host.id)
+    
+    if after is not None:
+        last_value, last_id = after
+        if sort_column is models.Host.id:
+            condition = models.Host.id < last_id if descending else models.Host.id > last_id
+        elif descending:
+            if last_value is None:
+                condition = and_(sort_column.is_(None), models.Host.id < last_id)
+            else:
+                condition = or_(
+                    sort_column < last_value,
+                    and_(sort_column == last_value, models.Host.id < last_id),
+                    sort_column.is_(None)
+                )
+        else:
+            if last_value is None:
+                condition = or_(
+                    and_(sort_column.is_(None), models.Host.id > last_id),
+                    sort_column.isnot(None)
+                )
+            else:
+                condition = or_(
+                    sort_column > last_value,
+                    and_(sort_column == last_value, models.Host.id > last_id)
+                )
+        query = query.filter(condition)
+    
+    if sort_column is models.Host.id:
+        query = query.order_by(models.Host.id.desc() if descending else models.Host.id)
+    elif descending:
+        query = query.order_by(sort_column.desc(), models.Host.id.desc())
+    else:
+        query = query.order_by(sort_column, models.Host.id)
+    
+    return query.limit(limit).all()
+
+def iter_hosts(db: Session, batch_size: int = 1000):
+    """전체 호스트를 id 키셋 배치로 순회 (내보내기용)"""
+    last_id = 0
+    while True:
+        batch = db.query(models.Host).filter(
+            models.Host.id > last_id
+        ).order_by(models.Host.id).limit(batch_size).all()
+        if not batch:
+            return
+        yield from batch
+        last_id = batch[-1].id
+        db.expunge_all()
+
+def backfill_host_ip_numbers(db: Session) -> int:
+    """ip_num이 비어 있는 기존 호스트 채우기"""
+    hosts = db.query(models.Host).filter(
+        models.Host.ip_num.is_(None),
+        models.Host.ip.isnot(None)
+    ).all()
+    updated = 0
+    for host in hosts:
+        ip_num = ip_to_int(host.ip)
+        if ip_num is not None:
+            host.ip_num = ip_num
+            updated += 1
+    if updated:
+        db.commit()
+    return updated
+
 def update_host(db: Session, host_id: int, host_update: schemas.HostCreate) -> Optional[models.Host]:
     """호스트 정보 업데이트"""
     db_host = get_host(db, host_id)
@@ -57,17 +241,45 @@ def update_host(db: Session, host_id: int, host_update: schemas.HostCreate) -> O
         db_host.name = host_update.name
         db_host.username = host_update.username
         db_host.ip = host_update.ip
+        db_host.ip_num = ip_to_int(host_update.ip)
+        generation = bump_inventory_generation(db)
         db.commit()
         db.refresh(db_host)
+        inventory.host_changed(db_host, generation)
     return db_host
 
-def update_host_last_check(db: Session, host_id: int) -> Optional[models.Host]:
-    """호스트 마지막 점검 시간 업데이트 - 현재 Host 모델에서는 스킵"""
+def update_host_os(db: Session, db_host: models.Host, os_info: str) -> models.Host:
+    """호스트 OS 정보 갱신 (OS 그룹이 바뀌므로 인벤토리 세대 증가)"""
+    db_host.os = os_info
+    generation = bump_inventory_generation(db)
+    db.commit()
+    db.refresh(db_host)
+    inventory.host_changed(db_host, generation)
+    return db_host
+
+def update_host_last_check(db: Session, host_id: int, execution: models.CheckExecution,
+                           commit: bool = True) -> Optional[models.Host]:
+    """호스트 최근 점검 결과(시간/상태/점수/취약 수) 갱신"""
     db_host = get_host(db, host_id)
     if db_host:
-        # last_check_at 필드가 없으므로 단순히 조회만 수행
-        db.commit()
-        db.refresh(db_host)
+        checked_at = execution.completed_at or execution.started_at or datetime.now()
+        if db_host.last_check_at and db_host.last_check_at > checked_at:
+            # 늦게 수집된 과거 실행은 최신 상태를 덮어쓰지 않음
+            return db_host
+        first_check = db_host.last_check_at is None
+        db_host.last_check_at = checked_at
+        db_host.last_status = execution.status
+        db_host.last_failed_checks = execution.failed_checks
+        score = compliance_score(execution.passed_checks or 0, execution.failed_checks or 0)
+        if score is not None:
+            # 점검 항목이 없는 실패(접속 불가 등)는 직전 점수를 유지
+            db_host.last_score = score
+        if first_check:
+            bump_dashboard_counters(db, checked_hosts=1)
+        
+        if commit:
+            db.commit()
+            db.refresh(db_host)
     return db_host
 
 def delete_host(db: Session, host_id: int) -> bool:
@@ -75,20 +287,30 @@ def delete_host(db: Session, host_id: int) -> bool:
     db_host = get_host(db, host_id)
     if db_host:
         db.delete(db_host)
+        bump_dashboard_counters(
+            db,
+            total_hosts=-1,
+            active_hosts=-1 if db_host.is_active is not False else 0,
+            checked_hosts=-1 if db_host.last_check_at else 0
+        )
+        generation = bump_inventory_generation(db)
         db.commit()
+        inventory.host_removed(host_id, generation)
         return True
     return False
 
+def get_last_check_execution_id(db: Session) -> int:
+    """마지막 점검 실행 id (호스트 최근 점검 결과는 새 실행 기록과 함께만 바뀜)"""
+    return db.query(func.max(models.CheckExecution.id)).scalar() or 0
+
 def get_hosts_stats(db: Session) -> schemas.HostStats:
-    """호스트 통계 정보 - 기본 Host 모델 호환"""
-    total_hosts = db.query(models.Host).count()
-    
-    # 기본 Host 모델에는 is_active, last_check_at 필드가 없으므로 간소화
+    """호스트 통계 정보 (대시보드 카운터 기반)"""
+    counters = get_dashboard_counters(db)
     return schemas.HostStats(
-        total_hosts=total_hosts,
-        active_hosts=total_hosts,  # 모든 호스트를 활성으로 간주
-        last_check_count=0,  # last_check_at 필드가 없으므로 0
-        failed_checks=0  # CheckExecution 테이블이 없을 수 있으므로 0
+        total_hosts=counters.total_hosts or 0,
+        active_hosts=counters.active_hosts or 0,
+        last_check_count=counters.checked_hosts or 0,
+        failed_checks=counters.failed_executions or 0
     )
 
 # ==================== CheckExecution CRUD ====================
@@ -104,6 +326,7 @@ def create_check_execution(db: Session, execution: schemas.CheckExecutionCreate)
             execution_config={"script_ids": execution.script_ids}
         )
         db.add(db_execution)
+        track_execution_counters(db, datetime.now(), None, "pending")
         db.commit()
         db.refresh(db_execution)
         return db_execution
@@ -139,13 +362,14 @@ def update_check_execution_status(db: Session, execution_id: int, status: str,
     try:
         db_execution = get_check_execution(db, execution_id)
         if db_execution:
+            previous_status = db_execution.status
             db_execution.status = status
             
             if status == "completed":
                 db_execution.completed_at = datetime.now()
                 if db_execution.started_at:
                     duration = db_execution.completed_at - db_execution.started_at
-                    db_execution.duration_seconds = int(duration.total_seconds())
+                    db_execution.duration_seconds = round(duration.total_seconds(), 3)
             
             if result_data:
                 db_execution.exit_code = result_data.get("exit_code")
@@ -157,12 +381,379 @@ def update_check_execution_status(db: Session, execution_id: int, status: str,
                 db_execution.passed_checks = result_data.get("passed_checks", 0)
                 db_execution.failed_checks = result_data.get("failed_checks", 0)
             
+            track_execution_counters(
+                db,
+                db_execution.started_at or datetime.now(),
+                previous_status,
+                status,
+                db_execution.duration_seconds
+            )
             db.commit()
             db.refresh(db_execution)
         return db_execution
     except Exception:
         return None
 
+def record_host_execution(db: Session, run_id: str, playbook_id: int, host_id: int,
+                          result: Dict, started_at: datetime, completed_at: datetime,
+                          section_ids: List[str] = None, attempt: int = 1,
+                          base_bits: bytes = None) -> Optional[models.CheckExecution]:
+    """호스트별 플레이북 실행 결과 저장 (항목별 결과는 비트셋으로 인코딩)
+
+    base_bits: 일부 섹션만 재실행한 경우 이전 시도의 비트셋 (현재 결과로 덮어써 병합)
+    """
+    try:
+        output = result.get("stdout", "")
+        outcome_bits = check_bitset.encode_outcomes(check_bitset.parse_check_outcomes(output))
+        if base_bits:
+            outcome_bits = check_bitset.merge_bitsets(base_bits, outcome_bits)
+        counts = check_bitset.count_outcomes(outcome_bits)
+        return_code = result.get("returncode", 1)
+        usage = result.get("usage") or {}
+
+        with tracing.span("db_write", host_id=host_id, table="check_executions"):
+            db_execution = models.CheckExecution(
+                host_id=host_id,
+                run_id=run_id,
+                playbook_id=playbook_id,
+                status="completed" if return_code == 0 else "failed",
+                started_at=started_at,
+                completed_at=completed_at,
+                # 호스트별 실행 시간을 알 수 없는 결과는 타임아웃 이력에서 제외
+                duration_seconds=None if result.get("duration_unknown")
+                else round((completed_at - started_at).total_seconds(), 3),
+                exit_code=return_code,
+                output_content=output,
+                error_content=result.get("stderr", ""),
+                total_checks=counts["total"],
+                passed_checks=counts["passed"],
+                failed_checks=counts["failed"],
+                outcome_bits=outcome_bits,
+                attempt=attempt,
+                selected_section_ids=section_ids,
+                execution_config={"playbook_id": playbook_id, "run_id": run_id, "attempt": attempt},
+                cpu_user_seconds=usage.get("cpu_user_seconds"),
+                cpu_system_seconds=usage.get("cpu_system_seconds"),
+                max_rss_kb=usage.get("max_rss_kb"),
+                process_wall_seconds=usage.get("wall_seconds"),
+                process_exit_status=usage.get("exit_status")
+            )
+            db.add(db_execution)
+            db.flush()
+            record_compliance_snapshot(db, db_execution)
+            update_host_last_check(db, host_id, db_execution, commit=False)
+            track_execution_counters(db, started_at, None, db_execution.status,
+                                     db_execution.duration_seconds)
+            db.commit()
+            db.refresh(db_execution)
+        metrics.HOST_DURATION.labels("playbook" if playbook_id else "os_check", db_execution.status).observe(
+            (completed_at - started_at).total_seconds()
+        )
+        return db_execution
+    except Exception as e:
+        db.rollback()
+        print(f"점검 실행 결과 저장 실패: {e}")
+        return None
+
+def get_outcome_history(db: Session, host_ids: List[int] = None,
+                        since: datetime = None) -> List[Any]:
+    """비트셋 기반 실행 이력 조회 (출력 텍스트는 읽지 않음)"""
+    query = db.query(
+        models.CheckExecution.id,
+        models.CheckExecution.host_id,
+        models.CheckExecution.started_at,
+        models.CheckExecution.outcome_bits
+    ).filter(models.CheckExecution.outcome_bits.isnot(None))
+
+    if host_ids:
+        query = query.filter(models.CheckExecution.host_id.in_(host_ids))
+    if since:
+        query = query.filter(models.CheckExecution.started_at >= since)
+
+    return query.order_by(
+        models.CheckExecution.host_id,
+        models.CheckExecution.started_at,
+        models.CheckExecution.id
+    ).all()
+
+def get_outcome_drift(db: Session, host_ids: List[int] = None,
+                      since: datetime = None) -> List[Dict]:
+    """연속된 실행 간 변경된 항목 조회 (XOR/popcount)"""
+    drift = []
+    previous = None
+
+    for row in get_outcome_history(db, host_ids, since):
+        if previous is not None and previous.host_id == row.host_id:
+            if check_bitset.changed_count(previous.outcome_bits, row.outcome_bits):
+                diff = check_bitset.diff_bitsets(previous.outcome_bits, row.outcome_bits)
+                drift.append({
+                    "host_id": row.host_id,
+                    "from_execution_id": previous.id,
+                    "to_execution_id": row.id,
+                    "from_started_at": previous.started_at,
+                    "to_started_at": row.started_at,
+                    **diff
+                })
+        previous = row
+
+    return drift
+
+def get_latest_outcome_changes(db: Session, host_ids: List[int] = None) -> List[Dict]:
+    """호스트별 마지막 점검 대비 직전 점검 변경 사항"""
+    latest: Dict[int, List[Any]] = {}
+    query = db.query(
+        models.CheckExecution.id,
+        models.CheckExecution.host_id,
+        models.CheckExecution.started_at,
+        models.CheckExecution.outcome_bits
+    ).filter(models.CheckExecution.outcome_bits.isnot(None))
+
+    if host_ids:
+        query = query.filter(models.CheckExecution.host_id.in_(host_ids))
+
+    # host_id, started_at 인덱스 역순 스캔으로 호스트별 최근 2건만 유지
+    for row in query.order_by(desc(models.CheckExecution.host_id),
+                              desc(models.CheckExecution.started_at),
+                              desc(models.CheckExecution.id)):
+        rows = latest.setdefault(row.host_id, [])
+        if len(rows) < 2:
+            rows.append(row)
+
+    changes = []
+    for host_id, rows in sorted(latest.items()):
+        current = rows[0]
+        previous = rows[1] if len(rows) > 1 else None
+        diff = check_bitset.diff_bitsets(previous.outcome_bits if previous else None,
+                                         current.outcome_bits)
+        changes.append({
+            "host_id": host_id,
+            "execution_id": current.id,
+            "previous_execution_id": previous.id if previous else None,
+            "started_at": current.started_at,
+            **check_bitset.count_outcomes(current.outcome_bits),
+            **diff
+        })
+
+    return changes
+
+# ==================== ExecutionRun (실행 체크포인트) ====================
+
+def create_execution_run(db: Session, run_id: str, playbook: Dict, host_ids: List[int],
+                         section_ids: List[str] = None, tuning_profile: str = None) -> models.ExecutionRun:
+    """플레이북 실행 기록 생성"""
+    db_run = models.ExecutionRun(
+        id=run_id,
+        playbook_id=playbook["id"],
+        playbook_name=playbook.get("name"),
+        playbook_filename=playbook.get("filename"),
+        host_ids=list(host_ids),
+        section_ids=section_ids,
+        tuning_profile=tuning_profile,
+        status="pending",
+        retries_used=0
+    )
+    db.add(db_run)
+    db.commit()
+    db.refresh(db_run)
+    return db_run
+
+def get_execution_run(db: Session, run_id: str) -> Optional[models.ExecutionRun]:
+    """플레이북 실행 기록 조회"""
+    return db.get(models.ExecutionRun, run_id)
+
+def update_execution_run(db: Session, run_id: str, **fields) -> Optional[models.ExecutionRun]:
+    """플레이북 실행 기록 갱신"""
+    db_run = get_execution_run(db, run_id)
+    if db_run:
+        for key, value in fields.items():
+            setattr(db_run, key, value)
+        db.commit()
+        db.refresh(db_run)
+    return db_run
+
+def get_run_checkpoints(db: Session, run_id: str) -> Dict[int, models.CheckExecution]:
+    """실행 내 호스트별 마지막 시도 결과"""
+    latest = db.query(
+        models.CheckExecution.host_id,
+        func.max(models.CheckExecution.id).label("id")
+    ).filter(models.CheckExecution.run_id == run_id).group_by(
+        models.CheckExecution.host_id
+    ).subquery()
+    executions = db.query(models.CheckExecution).join(
+        latest, models.CheckExecution.id == latest.c.id
+    ).all()
+    return {execution.host_id: execution for execution in executions}
+
+def mark_interrupted_runs(db: Session, owner_alive=None) -> int:
+    """진행 중이던 실행 중 소유 워커가 종료된 것을 interrupted로 표시 (resume 대상)
+
+    owner_alive: 워커 생존 확인 함수 (다른 워커가 실행 중인 run은 건드리지 않음)
+    """
+    runs = db.query(models.ExecutionRun).filter(
+        models.ExecutionRun.status.in_(["pending", "running"])
+    ).all()
+    interrupted = [run for run in runs if owner_alive is None or not owner_alive(run.owner)]
+    for run in interrupted:
+        run.status = "interrupted"
+        run.error = "워커 종료로 중단됨"
+    db.commit()
+    return len(interrupted)
+
+# ==================== Compliance Trend ====================
+
+def compliance_score(passed: int, failed: int) -> Optional[float]:
+    """준수율 (N/A 제외)"""
+    if passed + failed == 0:
+        return None
+    return round(passed * 100.0 / (passed + failed), 1)
+
+def record_compliance_snapshot(db: Session, execution: models.CheckExecution) -> Optional[models.ComplianceSnapshot]:
+    """실행 결과 수집 시 준수율 스냅샷과 일별 집계를 증분 갱신 (커밋은 호출자가 수행)"""
+    counts = check_bitset.count_outcomes(execution.outcome_bits)
+    if counts["total"] == 0:
+        return None
+
+    previous = db.query(models.ComplianceSnapshot).filter(
+        models.ComplianceSnapshot.host_id == execution.host_id
+    ).order_by(desc(models.ComplianceSnapshot.taken_at), desc(models.ComplianceSnapshot.id)).first()
+
+    if previous:
+        diff = check_bitset.diff_bitsets(previous.outcome_bits, execution.outcome_bits)
+    else:
+        diff = {"changed": [], "newly_failed": [], "newly_passed": []}
+
+    taken_at = execution.started_at or datetime.now()
+    score = compliance_score(counts["passed"], counts["failed"])
+
+    snapshot = models.ComplianceSnapshot(
+        host_id=execution.host_id,
+        execution_id=execution.id,
+        taken_at=taken_at,
+        score=score,
+        passed_checks=counts["passed"],
+        failed_checks=counts["failed"],
+        na_checks=counts["na"],
+        outcome_bits=execution.outcome_bits,
+        newly_failed=diff["newly_failed"],
+        newly_passed=diff["newly_passed"],
+        changed_count=len(diff["changed"])
+    )
+    db.add(snapshot)
+
+    if score is not None:
+        # 같은 호스트/날짜를 동시에 수집해도 누락되지 않도록 SQL에서 증분 (upsert)
+        daily = models.ComplianceDaily
+        stmt = sqlite_insert(daily).values(
+            host_id=execution.host_id,
+            day=taken_at.date(),
+            executions=1,
+            score_sum=score,
+            score_min=score,
+            score_max=score,
+            last_score=score,
+            last_failed_checks=counts["failed"],
+            flips=len(diff["changed"])
+        )
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["host_id", "day"],
+            set_={
+                "executions": func.coalesce(daily.executions, 0) + excluded.executions,
+                "score_sum": func.coalesce(daily.score_sum, 0.0) + excluded.score_sum,
+                "score_min": func.min(func.coalesce(daily.score_min, excluded.score_min), excluded.score_min),
+                "score_max": func.max(func.coalesce(daily.score_max, excluded.score_max), excluded.score_max),
+                "last_score": excluded.last_score,
+                "last_failed_checks": excluded.last_failed_checks,
+                "flips": func.coalesce(daily.flips, 0) + excluded.flips
+            }
+        )
+        db.execute(stmt)
+
+    return snapshot
+
+def _rollup_daily(rows: List[Any], granularity: str) -> List[Dict]:
+    """일별 집계 행을 일/주 단위 구간으로 병합"""
+    buckets: Dict[Any, Dict] = {}
+    for row in rows:
+        if granularity == "weekly":
+            key = row.day - timedelta(days=row.day.weekday())
+        else:
+            key = row.day
+        bucket = buckets.setdefault(key, {
+            "period_start": key,
+            "executions": 0,
+            "score_sum": 0.0,
+            "score_min": None,
+            "score_max": None,
+            "flips": 0
+        })
+        bucket["executions"] += row.executions or 0
+        bucket["score_sum"] += row.score_sum or 0.0
+        bucket["flips"] += row.flips or 0
+        if row.score_min is not None:
+            bucket["score_min"] = row.score_min if bucket["score_min"] is None else min(bucket["score_min"], row.score_min)
+        if row.score_max is not None:
+            bucket["score_max"] = row.score_max if bucket["score_max"] is None else max(bucket["score_max"], row.score_max)
+
+    trend = []
+    for key in sorted(buckets):
+        bucket = buckets.pop(key)
+        score_sum = bucket.pop("score_sum")
+        bucket["average_score"] = round(score_sum / bucket["executions"], 1) if bucket["executions"] else None
+        trend.append(bucket)
+    return trend
+
+def get_host_compliance_trend(db: Session, host_id: int, since: datetime = None,
+                              granularity: str = "raw") -> List[Dict]:
+    """호스트 준수율 추이 (raw: 실행별 스냅샷, daily/weekly: 집계)"""
+    if granularity == "raw":
+        query = db.query(models.ComplianceSnapshot).filter(
+            models.ComplianceSnapshot.host_id == host_id
+        )
+        if since:
+            query = query.filter(models.ComplianceSnapshot.taken_at >= since)
+        return [
+            {
+                "execution_id": snapshot.execution_id,
+                "taken_at": snapshot.taken_at,
+                "score": snapshot.score,
+                "passed": snapshot.passed_checks,
+                "failed": snapshot.failed_checks,
+                "na": snapshot.na_checks,
+                "newly_failed": snapshot.newly_failed or [],
+                "newly_passed": snapshot.newly_passed or []
+            }
+            for snapshot in query.order_by(models.ComplianceSnapshot.taken_at,
+                                           models.ComplianceSnapshot.id)
+        ]
+
+    query = db.query(models.ComplianceDaily).filter(models.ComplianceDaily.host_id == host_id)
+    if since:
+        query = query.filter(models.ComplianceDaily.day >= since.date())
+    return _rollup_daily(query.order_by(models.ComplianceDaily.day).all(), granularity)
+
+def get_fleet_compliance_trend(db: Session, since: datetime = None,
+                               granularity: str = "daily") -> List[Dict]:
+    """전체 호스트 준수율 추이 (일별 집계 기반)"""
+    query = db.query(
+        models.ComplianceDaily.day,
+        func.sum(models.ComplianceDaily.executions).label("executions"),
+        func.sum(models.ComplianceDaily.score_sum).label("score_sum"),
+        func.min(models.ComplianceDaily.score_min).label("score_min"),
+        func.max(models.ComplianceDaily.score_max).label("score_max"),
+        func.sum(models.ComplianceDaily.flips).label("flips"),
+        func.count(models.ComplianceDaily.host_id).label("hosts")
+    )
+    if since:
+        query = query.filter(models.ComplianceDaily.day >= since.date())
+    rows = query.group_by(models.ComplianceDaily.day).order_by(models.ComplianceDaily.day).all()
+
+    trend = _rollup_daily(rows, granularity)
+    if granularity != "weekly":
+        for bucket, row in zip(trend, rows):
+            bucket["hosts"] = row.hosts
+    return trend
+
 def get_recent_check_executions(db: Session, limit: int = 10) -> List[models.CheckExecution]:
     """최근 점검 실행 목록"""
     try:
@@ -173,35 +764,26 @@ def get_recent_check_executions(db: Session, limit: int = 10) -> List[models.Che
         return []
 
 def get_check_execution_stats(db: Session, days: int = 30) -> Dict:
-    """점검 실행 통계"""
+    """점검 실행 통계 (일별 집계 기반, 일 단위 기간)"""
     try:
-        start_date = datetime.now() - timedelta(days=days)
+        start_day = (datetime.now() - timedelta(days=days)).date()
+        rows = db.query(models.ExecutionDailyStats).filter(
+            models.ExecutionDailyStats.day >= start_day
+        ).all()
         
-        # 총 실행 수
-        total_executions = db.query(models.CheckExecution).filter(
-            models.CheckExecution.started_at >= start_date
-        ).count()
+        status_breakdown = {}
+        for status in EXECUTION_STATUSES:
+            count = sum(getattr(row, f"{status}_executions") or 0 for row in rows)
+            if count:
+                status_breakdown[status] = count
         
-        # 상태별 집계
-        status_stats = db.query(
-            models.CheckExecution.status,
-            func.count(models.CheckExecution.id)
-        ).filter(
-            models.CheckExecution.started_at >= start_date
-        ).group_by(models.CheckExecution.status).all()
-        
-        # 평균 실행 시간
-        avg_duration = db.query(
-            func.avg(models.CheckExecution.duration_seconds)
-        ).filter(
-            models.CheckExecution.started_at >= start_date,
-            models.CheckExecution.status == "completed"
-        ).scalar()
+        duration_count = sum(row.completed_duration_count or 0 for row in rows)
+        duration_sum = sum(row.completed_duration_sum or 0 for row in rows)
         
         return {
-            "total_executions": total_executions,
-            "status_breakdown": dict(status_stats),
-            "average_duration_seconds": avg_duration or 0,
+            "total_executions": sum(row.total_executions or 0 for row in rows),
+            "status_breakdown": status_breakdown,
+            "average_duration_seconds": duration_sum / duration_count if duration_count else 0,
             "period_days": days
         }
     except Exception:
@@ -212,6 +794,47 @@ def get_check_execution_stats(db: Session, days: int = 30) -> Dict:
             "period_days": days
         }
 
+RESOURCE_USAGE_GROUPS = ("playbook", "host")
+
+def get_resource_usage(db: Session, group_by: str = "playbook", days: int = 30,
+                       limit: int = 50) -> List[Dict]:
+    """ansible 프로세스 자원 사용량 집계 (플레이북별 또는 호스트별, CPU 합계 내림차순)"""
+    execution = models.CheckExecution
+    cpu = func.coalesce(execution.cpu_user_seconds, 0) + func.coalesce(execution.cpu_system_seconds, 0)
+    if group_by == "host":
+        keys = [execution.host_id, func.max(models.Host.name).label("host_name"),
+                func.max(models.Host.ip).label("ip")]
+        query = db.query(*keys).outerjoin(models.Host, models.Host.id == execution.host_id)
+        group_column = execution.host_id
+    else:
+        keys = [execution.playbook_id, func.max(models.ExecutionRun.playbook_name).label("playbook_name")]
+        query = db.query(*keys).outerjoin(models.ExecutionRun, models.ExecutionRun.id == execution.run_id)
+        group_column = execution.playbook_id
+
+    total_cpu = func.sum(cpu).label("cpu_seconds")
+    rows = query.add_columns(
+        func.count(execution.id).label("executions"),
+        total_cpu,
+        func.sum(execution.cpu_user_seconds).label("cpu_user_seconds"),
+        func.sum(execution.cpu_system_seconds).label("cpu_system_seconds"),
+        func.max(execution.max_rss_kb).label("max_rss_kb"),
+        func.avg(execution.max_rss_kb).label("avg_rss_kb"),
+        func.sum(execution.process_wall_seconds).label("wall_seconds")
+    ).filter(
+        execution.started_at >= datetime.now() - timedelta(days=days),
+        execution.cpu_user_seconds.isnot(None)
+    ).group_by(group_column).order_by(desc(total_cpu)).limit(limit).all()
+
+    usage = []
+    for row in rows:
+        entry = dict(row._mapping)
+        entry["avg_cpu_seconds"] = round(entry["cpu_seconds"] / entry["executions"], 3)
+        entry["avg_rss_kb"] = int(entry["avg_rss_kb"]) if entry["avg_rss_kb"] is not None else None
+        for key in ("cpu_seconds", "cpu_user_seconds", "cpu_system_seconds", "wall_seconds"):
+            entry[key] = round(entry[key] or 0, 3)
+        usage.append(entry)
+    return usage
+
 # ==================== CheckScript CRUD (파일 기반 메타데이터) ====================
 
 def create_check_script_record(db: Session, script_data: Dict) -> models.CheckScript:
@@ -227,6 +850,12 @@ def create_check_script_record(db: Session, script_data: Dict) -> models.CheckSc
             tags=script_data.get("tags", [])
         )
         db.add(db_script)
+        bump_dashboard_counters(
+            db,
+            total_scripts=1,
+            active_scripts=1,
+            template_count=1 if db_script.script_type == "template" else 0
+        )
         db.commit()
         db.refresh(db_script)
         return db_script
@@ -239,6 +868,11 @@ def sync_check_scripts_from_metadata(db: Session, metadata: List[Dict]):
     try:
         # 기존 레코드 삭제
         db.query(models.CheckScript).delete()
+        db.query(models.DashboardCounters).update({
+            models.DashboardCounters.total_scripts: 0,
+            models.DashboardCounters.active_scripts: 0,
+            models.DashboardCounters.template_count: 0
+        }, synchronize_session=False)
         
         # 새 레코드 생성
         for script_data in metadata:
@@ -249,6 +883,144 @@ def sync_check_scripts_from_metadata(db: Session, metadata: List[Dict]):
     except Exception as e:
         print(f"CheckScript 동기화 실패: {e}")
 
+# ==================== Dashboard Counters ====================
+# 호스트/스크립트/실행 쓰기 시 같은 트랜잭션에서 증분 갱신하고, 주기적으로 재계산
+
+EXECUTION_STATUSES = ("pending", "running", "completed", "failed")
+
+def bump_dashboard_counters(db: Session, **deltas: int) -> bool:
+    """대시보드 카운터 증분 갱신 (변경 후 호출, 커밋은 호출자가 수행)
+
+    카운터 행이 없어 재계산했으면 True. 재계산은 이 트랜잭션의 변경을 이미 포함하므로
+    같은 트랜잭션의 이후 증분은 건너뜀 (호출자는 일별 통계 증분도 건너뛸 것)
+    """
+    if db.info.get("dashboard_rebuilt_in") is db.get_transaction():
+        return True
+    values = {
+        getattr(models.DashboardCounters, key): getattr(models.DashboardCounters, key) + delta
+        for key, delta in deltas.items() if delta
+    }
+    if not values:
+        return False
+    updated = db.query(models.DashboardCounters).filter(
+        models.DashboardCounters.id == 1
+    ).update(values, synchronize_session=False)
+    if updated:
+        return False
+    # 카운터 행이 없으면 현재 세션 상태 기준으로 재계산
+    db.flush()
+    _rebuild_dashboard_counters(db)
+    db.info["dashboard_rebuilt_in"] = db.get_transaction()
+    return True
+
+def bump_execution_daily_stats(db: Session, day, **deltas: int):
+    """일별 실행 통계 증분 갱신 (커밋은 호출자가 수행)"""
+    values = {key: delta for key, delta in deltas.items() if delta}
+    if not values:
+        return
+    stmt = sqlite_insert(models.ExecutionDailyStats).values(day=day, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["day"],
+        set_={
+            key: getattr(models.ExecutionDailyStats, key) + stmt.excluded[key]
+            for key in values
+        }
+    )
+    db.execute(stmt)
+
+def track_execution_counters(db: Session, started_at: datetime, previous_status: Optional[str],
+                             status: str, duration_seconds: float = None):
+    """실행 상태 전이를 대시보드/일별 카운터에 반영"""
+    deltas: Dict[str, int] = {}
+    if previous_status is None:
+        deltas["total_executions"] = 1
+    elif previous_status in EXECUTION_STATUSES:
+        deltas[f"{previous_status}_executions"] = -1
+    if status in EXECUTION_STATUSES:
+        key = f"{status}_executions"
+        deltas[key] = deltas.get(key, 0) + 1
+
+    if bump_dashboard_counters(db, **deltas):
+        return  # 재계산된 일별 통계에 이미 포함
+
+    daily_deltas = dict(deltas)
+    if status == "completed" and previous_status != "completed" and duration_seconds is not None:
+        daily_deltas["completed_duration_sum"] = duration_seconds
+        daily_deltas["completed_duration_count"] = 1
+    bump_execution_daily_stats(db, started_at.date(), **daily_deltas)
+
+def get_dashboard_counters(db: Session) -> models.DashboardCounters:
+    """대시보드 카운터 단일 행 조회 (없으면 재계산)"""
+    counters = db.get(models.DashboardCounters, 1)
+    if counters is None:
+        counters = rebuild_dashboard_counters(db)
+    return counters
+
+def _rebuild_dashboard_counters(db: Session) -> models.DashboardCounters:
+    """원본 테이블에서 카운터 전체 재계산 (커밋은 호출자가 수행)"""
+    host_active = or_(models.Host.is_active == True, models.Host.is_active.is_(None))
+    host_counts = db.query(
+        func.count(models.Host.id),
+        func.count(models.Host.id).filter(host_active),
+        func.count(models.Host.last_check_at)
+    ).one()
+    script_counts = db.query(
+        func.count(models.CheckScript.id),
+        func.count(models.CheckScript.id).filter(models.CheckScript.is_active == True),
+        func.count(models.CheckScript.id).filter(models.CheckScript.script_type == "template")
+    ).one()
+
+    status_counts = {status: 0 for status in EXECUTION_STATUSES}
+    daily: Dict[str, Dict[str, int]] = {}
+    rows = db.query(
+        func.date(models.CheckExecution.started_at),
+        models.CheckExecution.status,
+        func.count(models.CheckExecution.id),
+        func.sum(models.CheckExecution.duration_seconds),
+        func.count(models.CheckExecution.duration_seconds)
+    ).group_by(
+        func.date(models.CheckExecution.started_at),
+        models.CheckExecution.status
+    ).all()
+    total_executions = 0
+    for day, status, count, duration_sum, duration_count in rows:
+        total_executions += count
+        if status in status_counts:
+            status_counts[status] += count
+        if day is None:
+            continue
+        bucket = daily.setdefault(day, {"total_executions": 0})
+        bucket["total_executions"] += count
+        if status in EXECUTION_STATUSES:
+            bucket[f"{status}_executions"] = count
+        if status == "completed":
+            bucket["completed_duration_sum"] = float(duration_sum or 0)
+            bucket["completed_duration_count"] = duration_count
+
+    # 동시에 재계산될 수 있으므로 단일 행은 INSERT OR IGNORE로 확보
+    db.execute(sqlite_insert(models.DashboardCounters).values(id=1).on_conflict_do_nothing())
+    counters = db.get(models.DashboardCounters, 1)
+    counters.total_hosts, counters.active_hosts, counters.checked_hosts = host_counts
+    counters.total_scripts, counters.active_scripts, counters.template_count = script_counts
+    counters.total_executions = total_executions
+    for status, count in status_counts.items():
+        setattr(counters, f"{status}_executions", count)
+    counters.reconciled_at = datetime.now()
+
+    db.query(models.ExecutionDailyStats).delete()
+    for day, bucket in daily.items():
+        db.add(models.ExecutionDailyStats(day=datetime.strptime(day, "%Y-%m-%d").date(), **bucket))
+
+    db.flush()
+    return counters
+
+def rebuild_dashboard_counters(db: Session) -> models.DashboardCounters:
+    """대시보드 카운터 재계산 (reconciliation)"""
+    counters = _rebuild_dashboard_counters(db)
+    db.commit()
+    db.refresh(counters)
+    return counters
+
 # ==================== SystemConfig CRUD ====================
 
 def get_config(db: Session, config_key: str) -> Optional[models.SystemConfig]:
@@ -293,6 +1065,15 @@ def get_all_configs(db: Session) -> List[models.SystemConfig]:
     except Exception:
         return []
 
+def delete_config(db: Session, config_key: str) -> bool:
+    """설정 삭제 (없으면 False)"""
+    db_config = get_config(db, config_key)
+    if not db_config:
+        return False
+    db.delete(db_config)
+    db.commit()
+    return True
+
 # ==================== AuditLog CRUD ====================
 
 def create_audit_log(db: Session, action: str, resource_type: str, 
@@ -343,6 +1124,7 @@ def cleanup_old_executions(db: Session, days: int = 30) -> int:
         ).delete()
         
         db.commit()
+        rebuild_dashboard_counters(db)
         return deleted_count
     except Exception:
         return 0
@@ -352,22 +1134,12 @@ def get_dashboard_stats(db: Session) -> schemas.DashboardStats:
     try:
         host_stats = get_hosts_stats(db)
         
-        # 스크립트 통계 (파일 기반이므로 간단히)
-        try:
-            script_count = db.query(models.CheckScript).count()
-            active_script_count = db.query(models.CheckScript).filter(
-                models.CheckScript.is_active == True
-            ).count()
-            template_count = db.query(models.CheckScript).filter(
-                models.CheckScript.script_type == "template"
-            ).count()
-        except Exception:
-            script_count = active_script_count = template_count = 0
-            
+        # 스크립트 통계 (대시보드 카운터 단일 행)
+        counters = get_dashboard_counters(db)
         script_stats = schemas.ScriptStats(
-            total_scripts=script_count,
-            active_scripts=active_script_count,
-            template_count=template_count
+            total_scripts=counters.total_scripts or 0,
+            active_scripts=counters.active_scripts or 0,
+            template_count=counters.template_count or 0
         )
         
         # 최근 점검 목록
@@ -1,8 +1,54 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, declarative_base
+from app import metrics
 
 DATABASE_URL = "sqlite:///./hosts.db"
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False, "timeout": 15})
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """여러 워커 프로세스가 동시에 읽고 쓸 수 있도록 WAL 모드 사용"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+metrics.instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+def ensure_schema(bind=engine):
+    """누락된 테이블/컬럼/인덱스 생성 (create_all은 기존 테이블을 변경하지 않음)
+
+    여러 워커가 동시에 시작해도 되도록 이미 생성된 경우의 오류는 무시한다.
+    """
+    for table in Base.metadata.sorted_tables:
+        try:
+            table.create(bind=bind, checkfirst=True)
+        except OperationalError as e:
+            if "already exists" not in str(e):
+                raise
+
+    inspector = inspect(bind)
+    for table in Base.metadata.sorted_tables:
+        existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=bind.dialect)
+            try:
+                with bind.begin() as conn:
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+            except OperationalError as e:
+                # 다른 워커가 먼저 추가한 경우
+                if "duplicate column" not in str(e):
+                    raise
+
+        for index in table.indexes:
+            try:
+                index.create(bind=bind, checkfirst=True)
+            except OperationalError as e:
+                if "already exists" not in str(e):
+                    raise
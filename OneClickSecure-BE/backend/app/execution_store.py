@@ -0,0 +1,434 @@
+# app/execution_store.py
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+from app import job_secrets
+
+# 실행 상태 저장소 선택 (uvicorn --workers N에서도 모든 워커가 같은 상태를 보도록 sqlite가 기본)
+EXECUTION_STORE_BACKEND = os.environ.get("EXECUTION_STORE", "sqlite")  # sqlite, memory
+EXECUTION_STORE_PATH = os.environ.get("EXECUTION_STORE_PATH", "./execution_state.db")
+EXECUTION_STORE_BUSY_TIMEOUT = 5.0
+
+# 이 프로세스 식별자 (실행 소유 워커 표시용)
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# 호스트별 행으로 분리 저장하는 필드 외에는 run 단위 JSON으로 저장
+COUNTER_FIELDS = ("completed_hosts", "failed_hosts", "retries_used")
+
+# 원격 워커 작업 큐 (lease 만료 시 다른 워커가 다시 가져감)
+JOB_MAX_LEASES = 3  # 이 횟수만큼 lease가 만료되면 실패 처리 (워커를 계속 죽이는 작업 차단)
+
+def process_alive(owner: Optional[str]) -> bool:
+    """실행 소유 워커가 살아 있는지 (같은 호스트의 프로세스만 확인 가능, 다른 호스트는 살아 있다고 간주)"""
+    if not owner:
+        return False
+    hostname, _, pid = owner.rpartition(":")
+    if hostname != socket.gethostname():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class MemoryExecutionStore:
+    """프로세스 내 딕셔너리 저장소 (단일 워커 전용)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict] = {}
+        self._jobs: Dict[int, Dict] = {}
+        self._next_job_id = 1
+
+    def create(self, execution_id: str, state: Dict):
+        with self._lock:
+            self._states[execution_id] = {**state, "results": dict(state.get("results") or {})}
+
+    def get(self, execution_id: str) -> Optional[Dict]:
+        with self._lock:
+            state = self._states.get(execution_id)
+            if state is None:
+                return None
+            return {**state, "results": dict(state["results"])}
+
+    def update(self, execution_id: str, **fields):
+        with self._lock:
+            if execution_id in self._states:
+                self._states[execution_id].update(fields)
+
+    def increment(self, execution_id: str, **deltas):
+        with self._lock:
+            state = self._states.get(execution_id)
+            if state is not None:
+                for field, delta in deltas.items():
+                    state[field] = (state.get(field) or 0) + delta
+
+    def set_host_result(self, execution_id: str, host_id: int, result: Dict):
+        """호스트 결과 기록 + 완료/실패 카운터 조정 (재시도로 결과가 바뀐 경우 포함)"""
+        with self._lock:
+            state = self._states.get(execution_id)
+            if state is None:
+                return
+            previous = state["results"].get(host_id)
+            if previous is not None:
+                key = "completed_hosts" if previous["success"] else "failed_hosts"
+                state[key] = state.get(key, 0) - 1
+            state["results"][host_id] = result
+            key = "completed_hosts" if result["success"] else "failed_hosts"
+            state[key] = state.get(key, 0) + 1
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._states)
+
+    def enqueue_jobs(self, execution_id: str, jobs: List[Dict]) -> int:
+        """작업 등록 (jobs: [{"host_id", "payload", "secret"}])"""
+        with self._lock:
+            for job in jobs:
+                self._jobs[self._next_job_id] = {
+                    "job_id": self._next_job_id, "execution_id": execution_id,
+                    "host_id": job["host_id"], "payload": job["payload"], "secret": job.get("secret"),
+                    "status": "queued", "leases": 0, "worker_id": None, "lease_expires_at": None
+                }
+                self._next_job_id += 1
+            return len(jobs)
+
+    def claim_jobs(self, worker_id: str, limit: int, lease_seconds: float) -> List[Dict]:
+        now = time.time()
+        claimed = []
+        with self._lock:
+            for job in self._jobs.values():
+                if len(claimed) >= limit:
+                    break
+                expired = job["status"] == "leased" and job["lease_expires_at"] < now
+                if (job["status"] == "queued" or expired) and job["leases"] < JOB_MAX_LEASES:
+                    job.update(status="leased", worker_id=worker_id,
+                               lease_expires_at=now + lease_seconds, leases=job["leases"] + 1)
+                    claimed.append(dict(job))
+        return claimed
+
+    def heartbeat_jobs(self, worker_id: str, job_ids: List[int], lease_seconds: float) -> List[int]:
+        expires_at = time.time() + lease_seconds
+        renewed = []
+        with self._lock:
+            for job_id in job_ids:
+                job = self._jobs.get(job_id)
+                if job and job["status"] == "leased" and job["worker_id"] == worker_id:
+                    job["lease_expires_at"] = expires_at
+                    renewed.append(job_id)
+        return renewed
+
+    def complete_job(self, job_id: int, worker_id: str, failed: bool = False) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job["status"] != "leased" or job["worker_id"] != worker_id:
+                return None
+            job.update(status="failed" if failed else "done", secret=None)
+            return dict(job)
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def fail_exhausted_jobs(self) -> List[Dict]:
+        now = time.time()
+        exhausted = []
+        with self._lock:
+            for job in self._jobs.values():
+                if (job["status"] == "leased" and job["lease_expires_at"] < now
+                        and job["leases"] >= JOB_MAX_LEASES):
+                    job.update(status="failed", secret=None)
+                    exhausted.append(dict(job))
+        return exhausted
+
+    def pending_jobs(self, execution_id: str) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values()
+                       if job["execution_id"] == execution_id and job["status"] in ("queued", "leased"))
+
+    def job_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats: Dict[str, int] = {}
+            for job in self._jobs.values():
+                stats[job["status"]] = stats.get(job["status"], 0) + 1
+            return stats
+
+class SQLiteExecutionStore:
+    """SQLite(WAL) 파일 저장소 - 여러 워커 프로세스가 공유
+
+    run 단위 상태는 JSON 1행, 호스트 결과는 (execution_id, host_id) 행으로 저장하고
+    카운터는 UPDATE ... SET col = col + ?로 원자적으로 갱신한다.
+    """
+
+    def __init__(self, path: str = EXECUTION_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._conn().executescript("""
+            CREATE TABLE IF NOT EXISTS execution_state (
+                execution_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                completed_hosts INTEGER NOT NULL DEFAULT 0,
+                failed_hosts INTEGER NOT NULL DEFAULT 0,
+                retries_used INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS execution_host_results (
+                execution_id TEXT NOT NULL,
+                host_id INTEGER NOT NULL,
+                success INTEGER NOT NULL,
+                return_code INTEGER,
+                attempt INTEGER,
+                completed_at TEXT,
+                data TEXT NOT NULL,
+                PRIMARY KEY (execution_id, host_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS execution_jobs (
+                job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                execution_id TEXT NOT NULL,
+                host_id INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                secret TEXT,                        -- SSH 비밀번호 (app.job_secrets로 암호화), 종료 상태가 되면 삭제
+                status TEXT NOT NULL DEFAULT 'queued',  -- queued, leased, done, failed
+                leases INTEGER NOT NULL DEFAULT 0,
+                worker_id TEXT,
+                lease_expires_at REAL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_execution_jobs_status ON execution_jobs (status, lease_expires_at);
+            CREATE INDEX IF NOT EXISTS ix_execution_jobs_execution ON execution_jobs (execution_id, status);
+        """)
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 연결 (WAL 모드, 잠금 대기)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=EXECUTION_STORE_BUSY_TIMEOUT, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _connect(self, write: bool = True) -> "_Transaction":
+        """트랜잭션 컨텍스트 (쓰기는 BEGIN IMMEDIATE, 읽기는 일관된 스냅샷)"""
+        return _Transaction(self._conn(), "IMMEDIATE" if write else "DEFERRED")
+
+    def create(self, execution_id: str, state: Dict):
+        state = dict(state)
+        results = state.pop("results", None) or {}
+        counters = {field: state.pop(field, 0) or 0 for field in COUNTER_FIELDS}
+        with self._connect() as conn:
+            conn.execute("DELETE FROM execution_host_results WHERE execution_id = ?", (execution_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO execution_state "
+                "(execution_id, data, completed_hosts, failed_hosts, retries_used, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (execution_id, json.dumps(state, ensure_ascii=False, default=str),
+                 counters["completed_hosts"], counters["failed_hosts"], counters["retries_used"], time.time())
+            )
+            for host_id, result in results.items():
+                self._write_host_result(conn, execution_id, int(host_id), result)
+
+    def get(self, execution_id: str) -> Optional[Dict]:
+        with self._connect(write=False) as conn:
+            row = conn.execute(
+                "SELECT data, completed_hosts, failed_hosts, retries_used FROM execution_state "
+                "WHERE execution_id = ?", (execution_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            host_rows = conn.execute(
+                "SELECT host_id, data FROM execution_host_results WHERE execution_id = ?", (execution_id,)
+            ).fetchall()
+        state = json.loads(row[0])
+        state.update(zip(COUNTER_FIELDS, row[1:]))
+        state["results"] = {host_id: json.loads(data) for host_id, data in host_rows}
+        return state
+
+    def update(self, execution_id: str, **fields):
+        counters = {field: fields.pop(field) for field in COUNTER_FIELDS if field in fields}
+        with self._connect() as conn:
+            if fields:
+                # 바꾸는 필드만 json_set으로 교체 (다른 워커가 바꾼 필드는 유지)
+                paths = ", ".join(f"'$.{field}', json(?)" for field in fields)
+                conn.execute(
+                    f"UPDATE execution_state SET data = json_set(data, {paths}), updated_at = ? WHERE execution_id = ?",
+                    (*(json.dumps(value, ensure_ascii=False, default=str) for value in fields.values()),
+                     time.time(), execution_id)
+                )
+            if counters:
+                assignments = ", ".join(f"{field} = ?" for field in counters)
+                conn.execute(
+                    f"UPDATE execution_state SET {assignments}, updated_at = ? WHERE execution_id = ?",
+                    (*counters.values(), time.time(), execution_id)
+                )
+
+    def increment(self, execution_id: str, **deltas):
+        deltas = {field: delta for field, delta in deltas.items() if field in COUNTER_FIELDS}
+        if not deltas:
+            return
+        assignments = ", ".join(f"{field} = {field} + ?" for field in deltas)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE execution_state SET {assignments}, updated_at = ? WHERE execution_id = ?",
+                (*deltas.values(), time.time(), execution_id)
+            )
+
+    def _write_host_result(self, conn, execution_id: str, host_id: int, result: Dict):
+        conn.execute(
+            "INSERT OR REPLACE INTO execution_host_results "
+            "(execution_id, host_id, success, return_code, attempt, completed_at, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (execution_id, host_id, int(bool(result.get("success"))), result.get("return_code"),
+             result.get("attempt"), result.get("completed_at"),
+             json.dumps(result, ensure_ascii=False, default=str))
+        )
+
+    def set_host_result(self, execution_id: str, host_id: int, result: Dict):
+        """호스트 결과 기록 + 완료/실패 카운터 조정 (단일 트랜잭션)"""
+        with self._connect() as conn:
+            previous = conn.execute(
+                "SELECT success FROM execution_host_results WHERE execution_id = ? AND host_id = ?",
+                (execution_id, host_id)
+            ).fetchone()
+            self._write_host_result(conn, execution_id, host_id, result)
+            completed_delta = int(bool(result.get("success")))
+            failed_delta = 1 - completed_delta
+            if previous is not None:
+                completed_delta -= previous[0]
+                failed_delta -= 1 - previous[0]
+            conn.execute(
+                "UPDATE execution_state SET completed_hosts = completed_hosts + ?, "
+                "failed_hosts = failed_hosts + ?, updated_at = ? WHERE execution_id = ?",
+                (completed_delta, failed_delta, time.time(), execution_id)
+            )
+
+    def count(self) -> int:
+        with self._connect(write=False) as conn:
+            return conn.execute("SELECT COUNT(*) FROM execution_state").fetchone()[0]
+
+    @staticmethod
+    def _job_from_row(row) -> Dict:
+        job_id, execution_id, host_id, payload, secret, leases = row
+        return {"job_id": job_id, "execution_id": execution_id, "host_id": host_id,
+                "payload": json.loads(payload), "secret": job_secrets.decrypt(secret), "leases": leases}
+
+    def enqueue_jobs(self, execution_id: str, jobs: List[Dict]) -> int:
+        """작업 등록 (jobs: [{"host_id", "payload", "secret"}], secret은 DB 밖의 키로 암호화해 저장)"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO execution_jobs (execution_id, host_id, payload, secret, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(execution_id, job["host_id"], json.dumps(job["payload"], ensure_ascii=False),
+                  job_secrets.encrypt(job.get("secret")), now) for job in jobs]
+            )
+        return len(jobs)
+
+    def claim_jobs(self, worker_id: str, limit: int, lease_seconds: float) -> List[Dict]:
+        """대기 작업 또는 lease가 만료된 작업을 원자적으로 가져감 (UPDATE ... RETURNING)"""
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "UPDATE execution_jobs SET status = 'leased', worker_id = ?, lease_expires_at = ?, "
+                "leases = leases + 1, updated_at = ? "
+                "WHERE job_id IN ("
+                "  SELECT job_id FROM execution_jobs "
+                "  WHERE (status = 'queued' OR (status = 'leased' AND lease_expires_at < ?)) AND leases < ? "
+                "  ORDER BY job_id LIMIT ?"
+                ") RETURNING job_id, execution_id, host_id, payload, secret, leases",
+                (worker_id, now + lease_seconds, now, now, JOB_MAX_LEASES, limit)
+            ).fetchall()
+        return [self._job_from_row(row) for row in rows]
+
+    def heartbeat_jobs(self, worker_id: str, job_ids: List[int], lease_seconds: float) -> List[int]:
+        """보유 중인 작업의 lease 연장 (다른 워커에 넘어간 작업은 제외하고 반환)"""
+        if not job_ids:
+            return []
+        placeholders = ", ".join("?" for _ in job_ids)
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"UPDATE execution_jobs SET lease_expires_at = ?, updated_at = ? "
+                f"WHERE job_id IN ({placeholders}) AND status = 'leased' AND worker_id = ? "
+                f"RETURNING job_id",
+                (now + lease_seconds, now, *job_ids, worker_id)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def complete_job(self, job_id: int, worker_id: str, failed: bool = False) -> Optional[Dict]:
+        """lease를 가진 워커만 완료 처리 가능 (만료 후 늦게 도착한 결과는 무시)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "UPDATE execution_jobs SET status = ?, secret = NULL, updated_at = ? "
+                "WHERE job_id = ? AND status = 'leased' AND worker_id = ? "
+                "RETURNING job_id, execution_id, host_id, payload, secret, leases",
+                ("failed" if failed else "done", time.time(), job_id, worker_id)
+            ).fetchone()
+        return self._job_from_row(row) if row else None
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        with self._connect(write=False) as conn:
+            row = conn.execute(
+                "SELECT job_id, execution_id, host_id, payload, secret, leases FROM execution_jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+        return self._job_from_row(row) if row else None
+
+    def fail_exhausted_jobs(self) -> List[Dict]:
+        """lease 만료가 JOB_MAX_LEASES회 반복된 작업을 실패 처리"""
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "UPDATE execution_jobs SET status = 'failed', secret = NULL, updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires_at < ? AND leases >= ? "
+                "RETURNING job_id, execution_id, host_id, payload, secret, leases",
+                (now, now, JOB_MAX_LEASES)
+            ).fetchall()
+        return [self._job_from_row(row) for row in rows]
+
+    def pending_jobs(self, execution_id: str) -> int:
+        """실행의 미완료 작업 수"""
+        with self._connect(write=False) as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM execution_jobs WHERE execution_id = ? AND status IN ('queued', 'leased')",
+                (execution_id,)
+            ).fetchone()[0]
+
+    def job_stats(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        with self._connect(write=False) as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM execution_jobs GROUP BY status").fetchall())
+
+class _Transaction:
+    """BEGIN ~ COMMIT 컨텍스트 (쓰기는 IMMEDIATE로 잠금을 먼저 잡아 카운터 갱신 경합 방지)"""
+
+    def __init__(self, conn: sqlite3.Connection, mode: str):
+        self.conn = conn
+        self.mode = mode
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute(f"BEGIN {self.mode}")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+def create_execution_store():
+    """설정된 백엔드로 저장소 생성"""
+    if EXECUTION_STORE_BACKEND == "memory":
+        return MemoryExecutionStore()
+    if EXECUTION_STORE_BACKEND == "sqlite":
+        return SQLiteExecutionStore(EXECUTION_STORE_PATH)
+    raise ValueError(f"지원하지 않는 EXECUTION_STORE: {EXECUTION_STORE_BACKEND}")
+
+# 프로세스 전역 저장소
+execution_store = create_execution_store()
@@ -0,0 +1,120 @@
+# app/fact_cache.py
+
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.ansible_utils import ANSIBLE_FACT_CACHE_TTL, get_os_info_bulk
+from app import models, metrics, tracing
+
+# 이 시간 안의 facts는 그대로 사용 (Ansible 팩트 캐시와 같은 TTL)
+FACT_CACHE_TTL = ANSIBLE_FACT_CACHE_TTL
+# TTL이 지났어도 이 시간 안이면 캐시를 반환하고 백그라운드에서 갱신
+FACT_CACHE_MAX_STALE = timedelta(days=7)
+
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def get_cached_entry(db: Session, ip: str) -> Optional[models.HostFactCache]:
+    """캐시된 facts 조회"""
+    return db.query(models.HostFactCache).filter(models.HostFactCache.ip == ip).first()
+
+def store_facts(db: Session, ip: str, os_info: Optional[str], facts: Optional[Dict],
+                error: Optional[str] = None) -> models.HostFactCache:
+    """facts 저장 (감지 실패 시 기존 facts는 유지하고 오류만 기록)"""
+    entry = get_cached_entry(db, ip)
+    if entry is None:
+        entry = models.HostFactCache(ip=ip)
+        db.add(entry)
+    if os_info:
+        entry.os_info = os_info
+        entry.facts = facts
+        entry.gathered_at = datetime.now()
+        entry.last_error = None
+    else:
+        entry.last_error = error
+    db.commit()
+    return entry
+
+def invalidate(db: Session, ip: str):
+    """캐시 항목 삭제"""
+    db.query(models.HostFactCache).filter(models.HostFactCache.ip == ip).delete()
+    db.commit()
+
+def _entry_age(entry: Optional[models.HostFactCache]) -> Optional[timedelta]:
+    if entry is None or entry.gathered_at is None or not entry.os_info:
+        return None
+    return datetime.now() - entry.gathered_at
+
+def _detect_and_store(hosts: List[Dict]) -> Dict[str, Dict]:
+    """OS 감지 후 캐시에 저장 (자체 세션 사용)"""
+    with tracing.span("os_detect", hosts=len(hosts)):
+        detection = get_os_info_bulk(hosts)
+    with tracing.span("db_write", table="host_fact_cache"):
+        db = SessionLocal()
+        try:
+            for ip, entry in detection.items():
+                store_facts(db, ip, entry["os"], entry["facts"], entry["error"])
+        finally:
+            db.close()
+    return detection
+
+def _refresh_in_background(host: Dict):
+    """stale 항목 백그라운드 갱신 (IP별 중복 실행 방지)"""
+    ip = host["ip"]
+    with _refreshing_lock:
+        if ip in _refreshing:
+            return
+        _refreshing.add(ip)
+
+    def worker():
+        try:
+            _detect_and_store([host])
+        except Exception as e:
+            print(f"❌ facts 백그라운드 갱신 실패 ({ip}): {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(ip)
+
+    threading.Thread(target=worker, daemon=True).start()
+
+def get_os_info_many(db: Session, hosts: List[Dict], force_refresh: bool = False) -> Dict[str, Dict]:
+    """여러 호스트 OS 정보 조회 (캐시 우선, 미스만 setup 1회로 감지)
+
+    hosts: [{"ip", "username", "password"}, ...]
+    반환: {ip: {"os": str | None, "error": str | None, "cached": bool}}
+    """
+    results = {}
+    misses = []
+
+    ips = [host["ip"] for host in hosts]
+    entries = {
+        entry.ip: entry
+        for entry in db.query(models.HostFactCache).filter(models.HostFactCache.ip.in_(ips))
+    } if ips and not force_refresh else {}
+
+    for host in hosts:
+        entry = entries.get(host["ip"])
+        age = _entry_age(entry)
+        if age is not None and age <= FACT_CACHE_MAX_STALE:
+            results[host["ip"]] = {"os": entry.os_info, "error": None, "cached": True}
+            if age > FACT_CACHE_TTL:
+                _refresh_in_background(host)
+        else:
+            misses.append(host)
+    metrics.cache_lookup("facts", hits=len(results), misses=len(misses))
+
+    if misses:
+        for ip, entry in _detect_and_store(misses).items():
+            results[ip] = {"os": entry["os"], "error": entry["error"], "cached": False}
+
+    return results
+
+def get_os_info(db: Session, ip: str, username: str, password: str,
+                force_refresh: bool = False) -> str:
+    """단일 호스트 OS 정보 조회 (실패 시 'Unknown')"""
+    entry = get_os_info_many(
+        db, [{"ip": ip, "username": username, "password": password}], force_refresh
+    )[ip]
+    return entry["os"] or "Unknown"
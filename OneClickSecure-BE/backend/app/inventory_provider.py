@@ -0,0 +1,162 @@
+# app/inventory_provider.py
+
+import re
+import threading
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from app import models
+
+# 호스트 변경 시 증가하는 세대 번호 (system_configs)
+INVENTORY_GENERATION_KEY = "inventory_generation"
+
+def read_generation(db: Session) -> int:
+    """DB에 기록된 인벤토리 세대 번호"""
+    value = db.query(models.SystemConfig.config_value).filter(
+        models.SystemConfig.config_key == INVENTORY_GENERATION_KEY
+    ).scalar()
+    return int(value) if value else 0
+
+def os_group_names(os_info: Optional[str]) -> List[str]:
+    """OS 정보로 그룹 이름 생성 ('Ubuntu 22.04' -> os_ubuntu, os_ubuntu_22, os_ubuntu_22_04)"""
+    if not os_info or os_info == "Unknown":
+        return ["os_unknown"]
+    parts = os_info.strip().split()
+    family = re.sub(r"[^a-z0-9]+", "_", parts[0].lower()).strip("_") or "unknown"
+    groups = [f"os_{family}"]
+    if len(parts) > 1:
+        version = parts[1].split(".")
+        groups.append(f"os_{family}_{re.sub(r'[^0-9a-z]+', '_', version[0].lower())}")
+        if len(version) > 1:
+            full_version = re.sub(r"[^0-9a-z]+", "_", parts[1].lower()).strip("_")
+            groups.append(f"os_{family}_{full_version}")
+    return groups
+
+class DynamicInventory:
+    """hosts 테이블 기반 인메모리 Ansible 인벤토리
+
+    호스트 변경은 세대 번호와 함께 O(1)로 반영하고, 다른 프로세스에서 바뀐
+    경우(세대 번호 불일치)에만 전체를 다시 읽는다. 렌더링 결과는 세대별로 캐시한다.
+
+    자격 증명을 포함하지 않으므로 GET /inventory/ansible과 dynamic_inventory.py(수동 ansible 실행)용이며,
+    점검/플레이북 실행은 자격 증명이 들어간 실행별 임시 인벤토리를 사용한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._hosts: Dict[int, Dict] = {}
+        self._groups: Dict[str, set] = {}
+        self.generation: Optional[int] = None
+        self._rendered: Dict[str, tuple] = {}
+
+    def _host_entry(self, host: models.Host) -> Dict:
+        return {
+            "ip": host.ip,
+            "groups": os_group_names(host.os),
+            "vars": {
+                "ansible_host": host.ip,
+                "ansible_user": host.username,
+                "host_id": host.id,
+                "hostname": host.name,
+                "os_info": host.os or "Unknown",
+            }
+        }
+
+    def _add(self, host: models.Host):
+        self._remove(host.id)
+        if not host.ip:
+            return
+        entry = self._host_entry(host)
+        self._hosts[host.id] = entry
+        for group in entry["groups"]:
+            self._groups.setdefault(group, set()).add(entry["ip"])
+
+    def _remove(self, host_id: int):
+        entry = self._hosts.pop(host_id, None)
+        if not entry:
+            return
+        for group in entry["groups"]:
+            members = self._groups.get(group)
+            if members is not None:
+                members.discard(entry["ip"])
+                if not members:
+                    del self._groups[group]
+
+    def reload(self, db: Session):
+        """hosts 테이블 전체 로드"""
+        with self._lock:
+            generation = read_generation(db)
+            self._hosts.clear()
+            self._groups.clear()
+            for host in db.query(models.Host).yield_per(1000):
+                self._add(host)
+            self.generation = generation
+            self._rendered.clear()
+
+    def sync(self, db: Session) -> "DynamicInventory":
+        """세대 번호가 다르면 다시 로드"""
+        if self.generation is None or read_generation(db) != self.generation:
+            self.reload(db)
+        return self
+
+    def _apply(self, generation: int, change):
+        with self._lock:
+            if self.generation is not None and generation == self.generation + 1:
+                change()
+                self.generation = generation
+                self._rendered.clear()
+            else:
+                # 중간 변경을 놓쳤으면 다음 조회 때 전체 로드
+                self.generation = None
+
+    def host_changed(self, host: models.Host, generation: int):
+        """호스트 추가/수정 반영"""
+        self._apply(generation, lambda: self._add(host))
+
+    def hosts_changed(self, hosts: List[models.Host], generation: int):
+        """여러 호스트 추가/수정 반영 (일괄 등록 시 세대 번호 1회 증가)"""
+        def change():
+            for host in hosts:
+                self._add(host)
+        self._apply(generation, change)
+
+    def host_removed(self, host_id: int, generation: int):
+        """호스트 삭제 반영"""
+        self._apply(generation, lambda: self._remove(host_id))
+
+    def to_dict(self) -> Dict:
+        """Ansible 동적 인벤토리 JSON (--list) 형식"""
+        with self._lock:
+            cached = self._rendered.get("json")
+            if cached and cached[0] == self.generation:
+                return cached[1]
+            inventory = {
+                "all": {"children": sorted(self._groups) + ["ungrouped"]},
+                "_meta": {"hostvars": {entry["ip"]: entry["vars"] for entry in self._hosts.values()}}
+            }
+            for group, members in self._groups.items():
+                inventory[group] = {"hosts": sorted(members)}
+            self._rendered["json"] = (self.generation, inventory)
+            return inventory
+
+    def to_ini(self) -> str:
+        """INI 형식 인벤토리 (자격 증명 제외)"""
+        with self._lock:
+            cached = self._rendered.get("ini")
+            if cached and cached[0] == self.generation:
+                return cached[1]
+            lines = ["[all]"]
+            for entry in sorted(self._hosts.values(), key=lambda item: item["ip"]):
+                host_vars = " ".join(f"{key}={value!r}" if " " in str(value) else f"{key}={value}"
+                                     for key, value in entry["vars"].items())
+                lines.append(f"{entry['ip']} {host_vars}")
+            lines.append("")
+            for group in sorted(self._groups):
+                lines.append(f"[{group}]")
+                lines.extend(sorted(self._groups[group]))
+                lines.append("")
+            content = "\n".join(lines)
+            self._rendered["ini"] = (self.generation, content)
+            return content
+
+# 프로세스 전역 인벤토리
+inventory = DynamicInventory()
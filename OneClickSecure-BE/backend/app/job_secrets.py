@@ -0,0 +1,62 @@
+# app/job_secrets.py
+"""작업 큐 SSH 비밀번호 암호화 (Fernet)
+
+키는 DB와 분리해서 JOB_SECRET_KEY 환경 변수 또는 JOB_SECRET_KEY_PATH 파일(0600)에서 읽고,
+둘 다 없으면 키 파일을 새로 만듭니다. 같은 서버의 API 워커들과 로컬 실행 워커는 같은 키 파일을 사용합니다.
+"""
+
+import os
+import tempfile
+import threading
+from typing import Optional
+
+JOB_SECRET_KEY_PATH = os.environ.get(
+    "JOB_SECRET_KEY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(os.environ.get("EXECUTION_STORE_PATH", "./execution_state.db"))),
+                 "job_secret.key")
+)
+
+_fernet = None
+_fernet_lock = threading.Lock()
+
+def _load_key() -> bytes:
+    """키 조회 (없으면 생성, 여러 프로세스가 동시에 시작해도 같은 키 사용)"""
+    from cryptography.fernet import Fernet
+
+    key = os.environ.get("JOB_SECRET_KEY")
+    if key:
+        return key.encode()
+    if not os.path.exists(JOB_SECRET_KEY_PATH):
+        directory = os.path.dirname(JOB_SECRET_KEY_PATH) or "."
+        fd, tmp_path = tempfile.mkstemp(prefix=".job_secret_", dir=directory)  # 0600
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(Fernet.generate_key())
+            # 완성된 파일만 연결 (이미 있으면 다른 프로세스가 만든 키 사용)
+            os.link(tmp_path, JOB_SECRET_KEY_PATH)
+            print(f"🔑 작업 비밀번호 암호화 키 생성: {JOB_SECRET_KEY_PATH}")
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp_path)
+    with open(JOB_SECRET_KEY_PATH, "rb") as f:
+        return f.read().strip()
+
+def _cipher():
+    global _fernet
+    with _fernet_lock:
+        if _fernet is None:
+            from cryptography.fernet import Fernet
+            _fernet = Fernet(_load_key())
+        return _fernet
+
+def encrypt(secret: Optional[str]) -> Optional[str]:
+    if secret is None:
+        return None
+    return _cipher().encrypt(secret.encode("utf-8")).decode("ascii")
+
+def decrypt(token: Optional[str]) -> Optional[str]:
+    """복호화 (키가 다르거나 변조된 경우 cryptography.fernet.InvalidToken)"""
+    if token is None:
+        return None
+    return _cipher().decrypt(token.encode("ascii")).decode("utf-8")
@@ -1,7 +1,13 @@
+import asyncio
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import inventory, download, playbooks
-from app.database import Base, engine
+from app.routers import inventory, download, playbooks, compliance, dashboard, workers, traces, profiles, tuning
+from app.database import engine, ensure_schema, SessionLocal
+from app import crud, metrics, tracing, profiling, ansible_pool
+from app.check_runner import prewarm_executor_pool, get_script_executor, close_script_executors
+from app.tuning import get_profile as get_tuning_profile
+from app.execution_store import process_alive
 
 app = FastAPI(
     title="OneClickSecure API",
@@ -24,13 +30,71 @@ app.add_middleware(
     expose_headers=["Content-Disposition"],
 )
 
-# DB 테이블 자동 생성
-Base.metadata.create_all(bind=engine)
+# 라우터별 HTTP 처리 시간 측정 (/metrics)
+metrics.instrument_app(app)
+
+# DB 테이블 자동 생성 (기존 DB는 누락 컬럼/인덱스 추가)
+ensure_schema(engine)
 
 # 라우터 등록
 app.include_router(inventory.router)
 app.include_router(download.router, prefix="/api")
 app.include_router(playbooks.router)
+app.include_router(compliance.router)
+app.include_router(dashboard.router)
+app.include_router(workers.router)
+app.include_router(traces.router)
+app.include_router(profiles.router)
+app.include_router(tuning.router)
+
+async def _reconcile_dashboard_loop():
+    """대시보드 카운터 주기적 재계산"""
+    while True:
+        await asyncio.to_thread(dashboard.reconcile_dashboard_counters)
+        await asyncio.sleep(dashboard.RECONCILE_INTERVAL_SECONDS)
+
+async def _reap_expired_jobs_loop():
+    """lease 만료가 반복된 작업 주기적 실패 처리 (/claim 호출이 없어도 실행이 마감되도록)"""
+    while True:
+        await asyncio.sleep(workers.JOB_REAP_INTERVAL)
+        try:
+            await asyncio.to_thread(workers.reap_expired_jobs)
+        except Exception as e:
+            print(f"❌ 만료 작업 정리 실패: {e}")
+
+@app.on_event("startup")
+async def start_background_jobs():
+    db = SessionLocal()
+    try:
+        crud.backfill_host_ip_numbers(db)
+        # 종료된 워커가 진행 중이던 실행은 resume 대상으로 표시
+        interrupted = crud.mark_interrupted_runs(db, process_alive)
+        if interrupted:
+            print(f"⚠️ 중단된 플레이북 실행 {interrupted}건 (resume으로 재개 가능)")
+    finally:
+        db.close()
+    app.state.reconcile_task = asyncio.create_task(_reconcile_dashboard_loop())
+    app.state.reap_jobs_task = asyncio.create_task(_reap_expired_jobs_loop())
+    # 대화형 점검용 ansible 워커 미리 준비 (활성 튜닝 프로필 환경, EXECUTOR_POOL_SIZE=0이면 사용 안 함)
+    prewarm_executor_pool(get_tuning_profile())
+    ansible_pool.pool.start_health_checks()
+    executor = get_script_executor()
+    if executor.unavailable_reason():
+        print(f"⚠️ 스크립트 실행 백엔드 {executor.name} 사용 불가: {executor.unavailable_reason()}")
+
+@app.on_event("shutdown")
+def flush_traces():
+    tracing.flush()
+
+@app.on_event("shutdown")
+def stop_executors():
+    ansible_pool.pool.shutdown()
+    close_script_executors()
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    """Prometheus 메트릭 (uvicorn 워커마다 별도 값)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 @app.get("/")
 def root():
@@ -42,4 +106,7 @@ def root():
             "playbooks": True,
             "download": True
         }
-    }
\ No newline at end of file
+    }
+
+# 요청 프로파일링 (PROFILING=1일 때만 설치, 모든 라우트 등록 후)
+profiling.instrument_app(app, profiles.is_authorized)
@@ -0,0 +1,308 @@
+# app/metrics.py
+"""Prometheus 텍스트 형식 메트릭 (/metrics)
+
+외부 의존성 없이 카운터/게이지/히스토그램만 구현. 관측 1회는 dict 조회 + 락 1회로 끝나고,
+큐 깊이처럼 조회 비용이 있는 값은 스크레이프 시점에만 계산합니다.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# 초 단위 기본 버킷 (HTTP/SQL은 짧게, ansible 실행은 길게)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+EXECUTION_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200)
+RSS_BUCKETS = tuple(mb * 1024 * 1024 for mb in (16, 32, 64, 128, 256, 512, 1024, 2048))
+
+_registry: List["_Metric"] = []
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def labels(self, *values):
+        """라벨 값별 하위 메트릭 (한 번 만든 뒤에는 dict 조회만)"""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterable[str]:
+        for key, child in list(self._children.items()):
+            yield from child.samples(self.name, self.labelnames, key)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+    def samples(self, name, labelnames, key):
+        yield f"{name}{_format_labels(labelnames, key)} {_format_value(self.value)}"
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+class Gauge(_Metric):
+    """게이지 (collect를 주면 스크레이프 시점에 {라벨 튜플: 값}을 계산)"""
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                 collect: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None):
+        super().__init__(name, help_text, labelnames)
+        self.collect = collect
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1):
+        self.labels().dec(amount)
+
+    def _samples(self):
+        if self.collect is None:
+            yield from super()._samples()
+            return
+        try:
+            values = self.collect()
+        except Exception as e:
+            print(f"⚠️ 메트릭 수집 실패 ({self.name}): {e}")
+            return
+        for key, value in values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, tuple(map(str, key)))} {_format_value(value)}"
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "total", "count", "_lock")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def samples(self, name, labelnames, key):
+        with self._lock:
+            counts, total, count = list(self.counts), self.total, self.count
+        cumulative = 0
+        for bound, bucket_count in zip(self.bounds + (float("inf"),), counts):
+            cumulative += bucket_count
+            le = 'le="' + _format_value(bound) + '"'
+            yield f"{name}_bucket{_format_labels(labelnames, key, le)} {cumulative}"
+        yield f"{name}_sum{_format_labels(labelnames, key)} {_format_value(total)}"
+        yield f"{name}_count{_format_labels(labelnames, key)} {count}"
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames)
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+def render() -> str:
+    """전체 메트릭 (Prometheus text exposition 0.0.4)"""
+    return "\n".join(metric.render() for metric in _registry) + "\n"
+
+# === 실행 엔진 메트릭 ===
+
+EXECUTION_DURATION = Histogram(
+    "oneclicksecure_execution_duration_seconds",
+    "플레이북 실행 1회 전체 소요 시간", ("mode", "status"), EXECUTION_BUCKETS
+)
+HOST_DURATION = Histogram(
+    "oneclicksecure_host_duration_seconds",
+    "호스트별 점검 소요 시간", ("kind", "status"), EXECUTION_BUCKETS
+)
+PHASE_DURATION = Histogram(
+    "oneclicksecure_ansible_phase_duration_seconds",
+    "ansible 단계별 소요 시간 (프로세스: script/playbook/setup, 그룹 점검 태스크: copy/script/find/fetch)",
+    ("phase",), EXECUTION_BUCKETS
+)
+SUBPROCESS_INFLIGHT = Gauge(
+    "oneclicksecure_ansible_subprocesses_inflight",
+    "실행 중인 ansible 프로세스 수", ("phase",)
+)
+SUBPROCESS_CPU_SECONDS = Counter(
+    "oneclicksecure_ansible_subprocess_cpu_seconds_total",
+    "ansible 프로세스 CPU 사용 시간 (하위 프로세스 포함)", ("phase", "mode")
+)
+SUBPROCESS_MAX_RSS = Histogram(
+    "oneclicksecure_ansible_subprocess_max_rss_bytes",
+    "ansible 프로세스 최대 RSS", ("phase",), RSS_BUCKETS
+)
+CACHE_REQUESTS = Counter(
+    "oneclicksecure_cache_requests_total",
+    "캐시 조회 수 (hit 비율 = hit / 전체)", ("cache", "result")
+)
+DB_QUERY_DURATION = Histogram(
+    "oneclicksecure_db_query_duration_seconds",
+    "SQLite 쿼리 소요 시간", ("statement",)
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "oneclicksecure_http_request_duration_seconds",
+    "HTTP 요청 처리 시간", ("router", "method", "route", "status")
+)
+
+def _job_queue_depth():
+    from app.execution_store import execution_store
+    stats = execution_store.job_stats()
+    return {(status,): stats.get(status, 0) for status in ("queued", "leased")}
+
+JOB_QUEUE_DEPTH = Gauge(
+    "oneclicksecure_job_queue_depth",
+    "원격 워커 작업 큐 대기/실행 중 작업 수", ("status",), collect=_job_queue_depth
+)
+EXECUTIONS_INFLIGHT = Gauge(
+    "oneclicksecure_executions_inflight",
+    "이 프로세스에서 진행 중인 플레이북 실행 수"
+)
+
+EXECUTOR_POOL_REQUESTS = Counter(
+    "oneclicksecure_executor_pool_requests_total",
+    "ansible 실행 풀 요청 수 (warm: 준비된 워커, cold: 새 프로세스, error: 워커 오류)", ("result",)
+)
+
+def _executor_pool_workers():
+    from app.ansible_pool import pool
+    return {(state,): count for state, count in pool.stats().items()}
+
+EXECUTOR_POOL_WORKERS = Gauge(
+    "oneclicksecure_executor_pool_workers",
+    "ansible 실행 풀 워커 수", ("state",), collect=_executor_pool_workers
+)
+
+@contextmanager
+def ansible_phase(phase: str):
+    """ansible 프로세스 실행 구간 (실행 중 개수 + 단계별 소요 시간)"""
+    inflight = SUBPROCESS_INFLIGHT.labels(phase)
+    inflight.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        inflight.dec()
+        PHASE_DURATION.labels(phase).observe(time.perf_counter() - start)
+
+def observe_phase(phase: str, seconds: float):
+    """프로세스 밖에서 측정한 단계 소요 시간 기록 (플레이북 태스크 등)"""
+    PHASE_DURATION.labels(phase).observe(seconds)
+
+def cache_lookup(cache: str, hits: int = 0, misses: int = 0):
+    """캐시 조회 결과 기록"""
+    if hits:
+        CACHE_REQUESTS.labels(cache, "hit").inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(cache, "miss").inc(misses)
+
+_STATEMENT_TYPES = ("SELECT", "INSERT", "UPDATE", "DELETE")
+
+def instrument_engine(engine):
+    """SQLAlchemy 엔진 쿼리 시간 측정"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        keyword = statement.lstrip()[:6].upper()
+        DB_QUERY_DURATION.labels(keyword if keyword in _STATEMENT_TYPES else "OTHER").observe(elapsed)
+
+def instrument_app(app):
+    """라우터/엔드포인트별 HTTP 처리 시간 미들웨어 (경로는 템플릿 기준으로 묶음)"""
+
+    @app.middleware("http")
+    async def _http_metrics(request, call_next):
+        start = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = request.scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            tags = getattr(route, "tags", None)
+            HTTP_REQUEST_DURATION.labels(
+                tags[0] if tags else "root", request.method, path, f"{status // 100}xx"
+            ).observe(time.perf_counter() - start)
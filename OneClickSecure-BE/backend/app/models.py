@@ -1,6 +1,6 @@
 # app/models.py
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Date, Float, Text, JSON, ForeignKey, LargeBinary, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from .database import Base
@@ -13,11 +13,16 @@ class Host(Base):
     username = Column(String)
     password = Column(String)
     ip = Column(String, unique=True, index=True)
+    ip_num = Column(Integer, index=True)  # IPv4 정수값 (CIDR 범위 검색용)
     os = Column(String, index=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    last_check_at = Column(DateTime(timezone=True))
+    last_check_at = Column(DateTime(timezone=True), index=True)
+    # 최근 점검 결과 (check_executions 조인 없이 목록 정렬/필터용)
+    last_status = Column(String, index=True)
+    last_score = Column(Float, index=True)
+    last_failed_checks = Column(Integer, index=True)
 
 class CheckExecution(Base):
     __tablename__ = "check_executions"
@@ -27,7 +32,7 @@ class CheckExecution(Base):
     status = Column(String, default="pending")  # pending, running, completed, failed
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True))
-    duration_seconds = Column(Integer)
+    duration_seconds = Column(Float)
     exit_code = Column(Integer)
     result_message = Column(Text)
     output_content = Column(Text)
@@ -38,10 +43,45 @@ class CheckExecution(Base):
     failed_checks = Column(Integer, default=0)
     selected_section_ids = Column(JSON)  # 선택된 섹션 ID 목록
     execution_config = Column(JSON)      # 실행 설정 (script_ids 등)
+    run_id = Column(String, index=True)  # 플레이북 실행 ID (여러 호스트 공통)
+    playbook_id = Column(Integer, index=True)
+    outcome_bits = Column(LargeBinary)   # 항목별 결과 비트셋 (check_bitset 참고)
+    attempt = Column(Integer, default=1)  # 같은 run_id 내 호스트별 시도 횟수
+    # ansible 프로세스 자원 사용량 (그룹 실행은 CPU를 호스트 수로 나눈 값, process_usage 참고)
+    cpu_user_seconds = Column(Float)
+    cpu_system_seconds = Column(Float)
+    max_rss_kb = Column(Integer)
+    process_wall_seconds = Column(Float)
+    process_exit_status = Column(Integer)
     
     # 관계 설정
     host = relationship("Host")
 
+    __table_args__ = (
+        Index("ix_check_executions_host_started", "host_id", "started_at"),
+        Index("ix_check_executions_started", "started_at"),
+        Index("ix_check_executions_run_host", "run_id", "host_id"),
+    )
+
+class ExecutionRun(Base):
+    __tablename__ = "execution_runs"
+    
+    # 플레이북 실행 단위 체크포인트 (호스트별 결과는 check_executions.run_id)
+    id = Column(String, primary_key=True)  # execution_id
+    playbook_id = Column(Integer, index=True)
+    playbook_name = Column(String)
+    playbook_filename = Column(String)
+    host_ids = Column(JSON)
+    section_ids = Column(JSON)
+    status = Column(String, default="pending", index=True)  # pending, running, completed, failed, interrupted
+    retries_used = Column(Integer, default=0)  # 재시도로 재실행한 호스트 수 (재시도 예산 차감)
+    owner = Column(String)  # 실행 중인 워커 ("hostname:pid")
+    tuning_profile = Column(String)  # 실행 튜닝 프로필 (재시도/재개 시 같은 프로필 사용)
+    error = Column(Text)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
 class CheckScript(Base):
     __tablename__ = "check_scripts"
     
@@ -77,4 +117,78 @@ class AuditLog(Base):
     resource_id = Column(String)  # 대상 리소스 ID
     details = Column(JSON)  # 추가 세부 정보
     ip_address = Column(String)  # 요청 IP
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ComplianceSnapshot(Base):
+    __tablename__ = "compliance_snapshots"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    host_id = Column(Integer, ForeignKey("hosts.id"), nullable=False)
+    execution_id = Column(Integer, ForeignKey("check_executions.id"), unique=True)
+    taken_at = Column(DateTime(timezone=True), nullable=False)
+    score = Column(Float)                # 양호 / (양호 + 취약) * 100
+    passed_checks = Column(Integer, default=0)
+    failed_checks = Column(Integer, default=0)
+    na_checks = Column(Integer, default=0)
+    outcome_bits = Column(LargeBinary)   # 다음 점검과의 비교용 비트셋
+    newly_failed = Column(JSON)          # 직전 점검 대비 취약으로 바뀐 항목
+    newly_passed = Column(JSON)          # 직전 점검 대비 양호로 바뀐 항목
+    changed_count = Column(Integer, default=0)
+
+    __table_args__ = (
+        Index("ix_compliance_snapshots_host_taken", "host_id", "taken_at"),
+    )
+
+class ComplianceDaily(Base):
+    __tablename__ = "compliance_daily"
+    
+    host_id = Column(Integer, ForeignKey("hosts.id"), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+    executions = Column(Integer, default=0)
+    score_sum = Column(Float, default=0.0)
+    score_min = Column(Float)
+    score_max = Column(Float)
+    last_score = Column(Float)
+    last_failed_checks = Column(Integer, default=0)
+    flips = Column(Integer, default=0)   # 그날 상태가 바뀐 항목 수 합계
+
+class DashboardCounters(Base):
+    __tablename__ = "dashboard_counters"
+    
+    id = Column(Integer, primary_key=True)  # 단일 행 (id=1)
+    total_hosts = Column(Integer, default=0)
+    active_hosts = Column(Integer, default=0)
+    checked_hosts = Column(Integer, default=0)  # last_check_at이 있는 호스트
+    total_scripts = Column(Integer, default=0)
+    active_scripts = Column(Integer, default=0)
+    template_count = Column(Integer, default=0)
+    total_executions = Column(Integer, default=0)
+    pending_executions = Column(Integer, default=0)
+    running_executions = Column(Integer, default=0)
+    completed_executions = Column(Integer, default=0)
+    failed_executions = Column(Integer, default=0)
+    reconciled_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class ExecutionDailyStats(Base):
+    __tablename__ = "execution_daily_stats"
+    
+    day = Column(Date, primary_key=True)  # started_at 기준
+    total_executions = Column(Integer, default=0)
+    pending_executions = Column(Integer, default=0)
+    running_executions = Column(Integer, default=0)
+    completed_executions = Column(Integer, default=0)
+    failed_executions = Column(Integer, default=0)
+    completed_duration_sum = Column(Float, default=0)
+    completed_duration_count = Column(Integer, default=0)
+
+class HostFactCache(Base):
+    __tablename__ = "host_facts"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    ip = Column(String, unique=True, index=True, nullable=False)  # 등록 전에도 조회하므로 IP 기준
+    os_info = Column(String)
+    facts = Column(JSON)                 # ansible_distribution* facts
+    gathered_at = Column(DateTime(timezone=True), index=True)
+    last_error = Column(Text)
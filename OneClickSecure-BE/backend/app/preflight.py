@@ -0,0 +1,115 @@
+# app/preflight.py
+
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+from app import metrics
+
+# SSH 포트 연결 + 배너 확인 설정
+PREFLIGHT_PORT = int(os.environ.get("PREFLIGHT_PORT", 22))
+PREFLIGHT_CONNECT_TIMEOUT = 1.5
+PREFLIGHT_BANNER_TIMEOUT = 1.5
+PREFLIGHT_CONCURRENCY = 256
+# 재시도/정기 실행 간 중복 probe 방지용 짧은 캐시
+PREFLIGHT_CACHE_TTL = 30
+
+_cache: Dict[str, tuple] = {}  # ip -> (만료 monotonic 시각, 결과)
+_cache_lock = threading.Lock()
+_cache_writes = 0  # 기록/제거 횟수 (목록 ETag용)
+
+async def probe_host(ip: str, port: int = PREFLIGHT_PORT) -> Dict:
+    """TCP 연결 후 SSH 배너('SSH-')까지 확인"""
+    started = time.monotonic()
+    result = {"ip": ip, "reachable": False, "banner": None, "error": None,
+              "latency_ms": None, "checked_at": datetime.now()}
+    writer = None
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(ip, port), PREFLIGHT_CONNECT_TIMEOUT
+        )
+        banner = await asyncio.wait_for(reader.readline(), PREFLIGHT_BANNER_TIMEOUT)
+        banner = banner.decode("utf-8", errors="replace").strip()
+        if banner.startswith("SSH-"):
+            result["reachable"] = True
+            result["banner"] = banner[:255]
+        else:
+            result["error"] = "SSH 배너가 아닙니다"
+    except asyncio.TimeoutError:
+        result["error"] = "SSH 응답 시간 초과"
+    except OSError as e:
+        result["error"] = f"SSH 포트 연결 실패: {e.strerror or e}"
+    except Exception as e:
+        result["error"] = f"SSH 확인 실패: {e}"
+    finally:
+        if writer is not None:
+            writer.close()
+    result["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+    return result
+
+def get_cached(ip: str) -> Optional[Dict]:
+    """만료되지 않은 probe 결과"""
+    with _cache_lock:
+        entry = _cache.get(ip)
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+def invalidate(ip: str):
+    """probe 캐시 제거"""
+    global _cache_writes
+    with _cache_lock:
+        if _cache.pop(ip, None) is not None:
+            _cache_writes += 1
+
+def cache_version() -> tuple:
+    """캐시 내용이 바뀌면 달라지는 값 (기록/제거 횟수, 만료된 항목 수)"""
+    now = time.monotonic()
+    with _cache_lock:
+        return _cache_writes, sum(1 for expires_at, _ in _cache.values() if expires_at <= now)
+
+async def probe_hosts(ips: Iterable[str], use_cache: bool = True) -> Dict[str, Dict]:
+    """여러 호스트 동시 probe (캐시 우선)
+
+    반환: {ip: {"reachable", "banner", "error", "latency_ms", "checked_at"}}
+    """
+    global _cache_writes
+    results: Dict[str, Dict] = {}
+    pending = []
+    for ip in dict.fromkeys(ip for ip in ips if ip):
+        cached = get_cached(ip) if use_cache else None
+        if cached is not None:
+            results[ip] = cached
+        else:
+            pending.append(ip)
+    metrics.cache_lookup("preflight", hits=len(results), misses=len(pending))
+
+    if pending:
+        semaphore = asyncio.Semaphore(PREFLIGHT_CONCURRENCY)
+
+        async def bounded(ip):
+            async with semaphore:
+                return await probe_host(ip)
+
+        expires_at = time.monotonic() + PREFLIGHT_CACHE_TTL
+        for probe in await asyncio.gather(*(bounded(ip) for ip in pending)):
+            results[probe["ip"]] = probe
+            with _cache_lock:
+                _cache[probe["ip"]] = (expires_at, probe)
+                _cache_writes += 1
+
+    return results
+
+def probe_hosts_sync(ips: Iterable[str], use_cache: bool = True) -> Dict[str, Dict]:
+    """동기 코드(스레드풀)에서 호출용"""
+    return asyncio.run(probe_hosts(ips, use_cache))
+
+def unreachable_result(probe: Dict) -> Dict:
+    """preflight 실패 호스트의 실행 결과 (ansible unreachable 종료 코드 4)"""
+    return {
+        "stdout": "",
+        "stderr": f"호스트에 연결할 수 없습니다 (preflight): {probe.get('error') or 'unreachable'}",
+        "returncode": 4
+    }
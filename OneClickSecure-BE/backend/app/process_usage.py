@@ -0,0 +1,100 @@
+# app/process_usage.py
+"""ansible 프로세스 자원 사용량 측정
+
+subprocess.run 대신 사용하면 자식 프로세스를 os.wait4로 직접 회수해서 그 프로세스(와 그 프로세스가
+회수한 하위 프로세스)의 CPU user/sys 시간, 최대 RSS를 얻습니다. 동시에 여러 ansible이 실행돼도
+프로세스별로 정확하게 분리됩니다 (RUSAGE_CHILDREN 차이 계산은 동시 실행 시 섞임).
+출력은 임시 파일로 받고, 회수한 종료 코드를 Popen.returncode에 기록해 Popen이 다시 회수하지 않게 합니다.
+"""
+
+import os
+import subprocess
+import tempfile
+import time
+from typing import Dict, Optional
+from app import metrics
+
+WAIT_POLL_SECONDS = 0.01
+
+def usage_from_rusage(rusage, wall_seconds: float, exit_status: Optional[int]) -> Dict:
+    """os.wait4 rusage → 사용량 dict (check_executions 컬럼과 같은 키)"""
+    return {
+        "cpu_user_seconds": round(rusage.ru_utime, 3) if rusage else None,
+        "cpu_system_seconds": round(rusage.ru_stime, 3) if rusage else None,
+        "max_rss_kb": rusage.ru_maxrss if rusage else None,  # Linux는 KB 단위
+        "wall_seconds": round(wall_seconds, 3),
+        "exit_status": exit_status
+    }
+
+def _wait4(pid: int, timeout: Optional[float]):
+    """자식 종료 대기 후 회수, (status, rusage) 반환 (시간 초과 시 None)"""
+    if timeout is None:
+        return os.wait4(pid, 0)[1:]
+    deadline = time.monotonic() + timeout
+    while True:
+        waited, status, rusage = os.wait4(pid, os.WNOHANG)
+        if waited:
+            return status, rusage
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(WAIT_POLL_SECONDS)
+
+def _read(file) -> str:
+    """임시 파일 출력 (subprocess text=True와 같은 줄바꿈 변환)"""
+    file.seek(0)
+    return file.read().decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+def observe(phase: str, usage: Dict):
+    """단계별 CPU/RSS 메트릭 기록"""
+    if usage["cpu_user_seconds"] is None:
+        return
+    metrics.SUBPROCESS_CPU_SECONDS.labels(phase, "user").inc(usage["cpu_user_seconds"])
+    metrics.SUBPROCESS_CPU_SECONDS.labels(phase, "system").inc(usage["cpu_system_seconds"])
+    metrics.SUBPROCESS_MAX_RSS.labels(phase).observe(usage["max_rss_kb"] * 1024)
+
+def run(args, phase: str, timeout: Optional[float] = None, env: Optional[Dict[str, str]] = None
+        ) -> subprocess.CompletedProcess:
+    """subprocess.run(capture_output=True, text=True)과 동일 + 결과의 .usage에 자원 사용량
+
+    시간 초과 시 프로세스를 종료하고 TimeoutExpired를 발생 (예외의 .usage에 사용량)
+    """
+    started = time.monotonic()
+    with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(args, stdout=stdout_file, stderr=stderr_file, env=env)
+        try:
+            waited = _wait4(process.pid, timeout)
+            timed_out = waited is None
+            if timed_out:
+                process.kill()
+                waited = os.wait4(process.pid, 0)[1:]
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        status, rusage = waited
+        process.returncode = os.waitstatus_to_exitcode(status)
+        stdout, stderr = _read(stdout_file), _read(stderr_file)
+
+    usage = usage_from_rusage(rusage, time.monotonic() - started, process.returncode)
+    observe(phase, usage)
+    if timed_out:
+        error = subprocess.TimeoutExpired(args, timeout, stdout, stderr)
+        error.usage = usage
+        raise error
+    result = subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
+    result.usage = usage
+    return result
+
+def timeout_usage(error: subprocess.TimeoutExpired) -> Optional[Dict]:
+    return getattr(error, "usage", None)
+
+def share(usage: Optional[Dict], hosts: int) -> Optional[Dict]:
+    """여러 호스트를 한 프로세스로 실행한 경우 호스트별 몫 (CPU는 균등 분배, RSS/시간은 프로세스 값)"""
+    if not usage or hosts <= 1:
+        return usage
+    shared = dict(usage)
+    for key in ("cpu_user_seconds", "cpu_system_seconds"):
+        if shared[key] is not None:
+            shared[key] = round(shared[key] / hosts, 3)
+    shared["shared_by"] = hosts
+    return shared
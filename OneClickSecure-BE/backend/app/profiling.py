@@ -0,0 +1,363 @@
+# app/profiling.py
+"""운영 중 프로파일링 (PROFILING=1일 때만 동작)
+
+- 요청 1건 프로파일: X-Profile 헤더 또는 ?_profile= 쿼리 (cprofile / pyinstrument)
+  응답의 X-Profile-Id로 GET /api/profiling/requests/{id} 에서 결과 조회
+- tracemalloc 시작/중지, 할당 위치 상위 조회
+- 백그라운드 실행(스레드) 샘플링 프로파일러
+
+비활성화 상태에서는 미들웨어/엔드포인트 래핑을 설치하지 않으므로 요청 처리 비용이 없습니다.
+"""
+
+import collections
+import contextvars
+import cProfile
+import functools
+import inspect
+import io
+import itertools
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List, Optional
+
+PROFILING_ENABLED = os.environ.get("PROFILING", "").lower() in ("1", "true", "yes")
+PROFILING_TOKEN = os.environ.get("PROFILING_TOKEN")   # 미설정 시 로컬 요청만 허용
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY = "_profile"
+PROFILE_KEEP = 20            # 보관할 요청 프로파일 수
+PROFILE_TOP = 60             # 결과에 출력할 함수 수
+SAMPLER_DEFAULT_INTERVAL = 0.01
+SAMPLER_MAX_DEPTH = 64
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+try:
+    import pyinstrument
+except ImportError:
+    pyinstrument = None
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+# Python 3.12+의 cProfile은 sys.monitoring 기반이라 프로세스 전체에 하나만 활성화할 수 있고(두 번째는 ValueError)
+# 모든 스레드를 함께 수집하므로, 요청 프로파일러 하나로 스레드풀의 동기 엔드포인트까지 수집
+CPROFILE_PROCESS_WIDE = sys.version_info >= (3, 12)
+
+# === 요청 프로파일 ===
+
+class RequestProfile:
+    """요청 1건의 프로파일 (이벤트 루프 스레드 + 동기 엔드포인트 스레드)"""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._lock = threading.Lock()
+        self._parts = []
+
+    def _new_profiler(self):
+        if self.kind == "pyinstrument":
+            return pyinstrument.Profiler(async_mode="disabled")
+        return cProfile.Profile()
+
+    def start(self):
+        profiler = self._new_profiler()
+        (profiler.start if self.kind == "pyinstrument" else profiler.enable)()
+        return profiler
+
+    def stop(self, profiler):
+        (profiler.stop if self.kind == "pyinstrument" else profiler.disable)()
+        with self._lock:
+            self._parts.append(profiler)
+
+    @property
+    def per_thread(self) -> bool:
+        """스레드마다 별도 프로파일러가 필요한지 (3.12+ cProfile은 요청 프로파일러 하나가 모든 스레드 수집)"""
+        return not (self.kind == "cprofile" and CPROFILE_PROCESS_WIDE)
+
+    def run(self, func, kwargs):
+        """현재 스레드에서 프로파일하며 실행 (스레드풀에서 도는 동기 엔드포인트용)"""
+        if not self.per_thread:
+            return func(**kwargs)
+        profiler = self.start()
+        try:
+            return func(**kwargs)
+        finally:
+            self.stop(profiler)
+
+    def report(self, sort: str = "cumulative", top: int = PROFILE_TOP) -> str:
+        if self.kind == "pyinstrument":
+            return "\n".join(part.output_text(unicode=True) for part in self._parts)
+        stream = io.StringIO()
+        parts = [part for part in self._parts if part.getstats()]
+        if not parts:
+            return "(수집된 호출 없음)\n"
+        stats = pstats.Stats(parts[0], stream=stream)
+        for part in parts[1:]:
+            stats.add(part)
+        stats.sort_stats(sort).print_stats(top)
+        return stream.getvalue()
+
+_active: contextvars.ContextVar[Optional[RequestProfile]] = contextvars.ContextVar("request_profile", default=None)
+# cProfile/pyinstrument는 스레드당 하나만 활성화할 수 있어서 프로파일 요청은 한 번에 1건
+_request_lock = threading.Lock()
+_profiles: "collections.OrderedDict[str, Dict]" = collections.OrderedDict()
+_profile_ids = itertools.count(1)
+
+def _wrap_sync_call(call):
+    """프로파일 중인 요청이면 스레드풀 안에서도 프로파일 (컨텍스트는 스레드풀로 복사됨)"""
+    @functools.wraps(call)
+    def wrapper(**kwargs):
+        profile = _active.get()
+        if profile is None:
+            return call(**kwargs)
+        return profile.run(call, kwargs)
+    return wrapper
+
+def requested_profiler(request) -> Optional[str]:
+    value = request.headers.get(PROFILE_HEADER) or request.query_params.get(PROFILE_QUERY)
+    if value is None:
+        return None
+    return value.strip().lower() or "cprofile"
+
+def store_profile(profile: RequestProfile, request, status: int, duration: float) -> str:
+    profile_id = str(next(_profile_ids))
+    _profiles[profile_id] = {
+        "id": profile_id,
+        "profiler": profile.kind,
+        "method": request.method,
+        "path": request.url.path,
+        "status": status,
+        "duration_ms": round(duration * 1000, 2),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "profile": profile
+    }
+    while len(_profiles) > PROFILE_KEEP:
+        _profiles.popitem(last=False)
+    return profile_id
+
+def list_profiles() -> List[Dict]:
+    return [{key: value for key, value in entry.items() if key != "profile"}
+            for entry in reversed(_profiles.values())]
+
+def get_profile(profile_id: str) -> Optional[Dict]:
+    return _profiles.get(profile_id)
+
+def instrument_app(app, is_authorized):
+    """요청 프로파일 미들웨어 설치 + 동기 엔드포인트 래핑 (라우터 등록 후 호출)
+
+    is_authorized(request) -> bool: 프로파일 요청 권한 확인
+    """
+    if not PROFILING_ENABLED:
+        return
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import APIRoute
+
+    def wrap_routes(routes):
+        for route in routes:
+            if isinstance(route, APIRoute):
+                if not inspect.iscoroutinefunction(route.dependant.call):
+                    route.dependant.call = route.endpoint = _wrap_sync_call(route.dependant.call)
+            elif hasattr(route, "original_router"):
+                # 최신 FastAPI는 include_router 시 라우트를 복사하지 않고 원본 라우터를 참조
+                wrap_routes(route.original_router.routes)
+
+    wrap_routes(app.routes)
+
+    @app.middleware("http")
+    async def _profile_request(request, call_next):
+        kind = requested_profiler(request)
+        if kind is None:
+            return await call_next(request)
+        if not is_authorized(request):
+            return JSONResponse({"detail": "프로파일링 권한이 없습니다"}, status_code=403)
+        if kind not in PROFILERS:
+            return JSONResponse({"detail": f"지원하지 않는 프로파일러: {kind} ({', '.join(PROFILERS)})"},
+                                status_code=400)
+        if kind == "pyinstrument" and pyinstrument is None:
+            return JSONResponse({"detail": "pyinstrument가 설치되어 있지 않습니다"}, status_code=400)
+        if not _request_lock.acquire(blocking=False):
+            return JSONResponse({"detail": "다른 요청을 프로파일하는 중입니다"}, status_code=409)
+
+        profile = RequestProfile(kind)
+        token = _active.set(profile)
+        start = time.perf_counter()
+        # 이벤트 루프 스레드 프로파일 (같은 시간에 처리된 다른 요청의 코루틴도 섞일 수 있음)
+        profiler = profile.start()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+        finally:
+            profile.stop(profiler)
+            _active.reset(token)
+            _request_lock.release()
+        response.headers["X-Profile-Id"] = store_profile(profile, request, status, time.perf_counter() - start)
+        return response
+
+# === tracemalloc ===
+
+_tracemalloc_baseline: Optional[tracemalloc.Snapshot] = None
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+
+def start_tracemalloc(frames: int = 1):
+    global _tracemalloc_baseline
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    _tracemalloc_baseline = _snapshot()
+
+def tracemalloc_report(limit: int = 30, key_type: str = "lineno") -> Dict:
+    """할당 위치 상위 (현재 크기 기준) + 시작 시점 대비 증가량 상위"""
+    if not tracemalloc.is_tracing():
+        return {"tracing": False}
+    snapshot = _snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+
+    def describe(stat):
+        return {
+            "location": "\n".join(stat.traceback.format()[-4:]).strip(),
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count,
+            **({"size_diff_kb": round(stat.size_diff / 1024, 1), "count_diff": stat.count_diff}
+               if hasattr(stat, "size_diff") else {})
+        }
+
+    growth = snapshot.compare_to(_tracemalloc_baseline, key_type) if _tracemalloc_baseline else []
+    return {
+        "tracing": True,
+        "traceback_limit": tracemalloc.get_traceback_limit(),
+        "traced_current_mb": round(current / 1024 / 1024, 2),
+        "traced_peak_mb": round(peak / 1024 / 1024, 2),
+        "overhead_mb": round(tracemalloc.get_tracemalloc_memory() / 1024 / 1024, 2),
+        "top": [describe(stat) for stat in snapshot.statistics(key_type)[:limit]],
+        "growth": [describe(stat) for stat in growth[:limit] if stat.size_diff > 0]
+    }
+
+def stop_tracemalloc(limit: int = 30, key_type: str = "lineno") -> Dict:
+    global _tracemalloc_baseline
+    report = tracemalloc_report(limit, key_type)
+    tracemalloc.stop()
+    _tracemalloc_baseline = None
+    return report
+
+# === 샘플링 프로파일러 ===
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(APP_DIR):
+        module = "app/" + os.path.relpath(filename, APP_DIR)
+    else:
+        module = os.path.basename(filename)
+    return f"{module}:{code.co_name}"
+
+class StackSampler:
+    """주기적으로 모든 스레드의 스택을 수집 (app 코드가 포함된 스택만 집계)
+
+    실행 스레드풀, check_runner 그룹 점검, 원격 워커 실행 등 백그라운드 작업에서
+    시간이 어디에 쓰이는지 확인용. 결과는 함수별 self/누적 샘플과 collapsed stack(flamegraph 입력)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self.interval = SAMPLER_DEFAULT_INTERVAL
+        self._reset()
+
+    def _reset(self):
+        self.samples = 0
+        self.stacks = collections.Counter()
+        self.started_at = None
+        self.stopped_at = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: float = SAMPLER_DEFAULT_INTERVAL):
+        with self._lock:
+            if self.running:
+                return
+            self._reset()
+            self.interval = interval
+            self.started_at = datetime.now()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            thread = self._thread
+            self._stop.set()
+        if thread is not None:
+            thread.join()
+            self.stopped_at = datetime.now()
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            threads = {thread.ident: thread.name for thread in threading.enumerate()}
+            frames = sys._current_frames()
+            with self._lock:
+                for ident, frame in frames.items():
+                    if ident == own:
+                        continue
+                    stack = []
+                    in_app = False
+                    while frame is not None and len(stack) < SAMPLER_MAX_DEPTH:
+                        in_app = in_app or frame.f_code.co_filename.startswith(APP_DIR)
+                        stack.append(_frame_label(frame))
+                        frame = frame.f_back
+                    if not in_app:
+                        continue
+                    name = threads.get(ident, str(ident))
+                    # 스레드풀 스레드 이름의 번호는 묶어서 집계
+                    name = name.rstrip("0123456789_-") or name
+                    stack.append(name)
+                    self.stacks[";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def collapsed(self) -> str:
+        """flamegraph.pl / speedscope 입력 형식"""
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def report(self, top: int = 30) -> Dict:
+        with self._lock:
+            stacks = dict(self.stacks)
+            samples = self.samples
+        self_counts, total_counts = collections.Counter(), collections.Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")[1:]
+            if frames:
+                self_counts[frames[-1]] += count
+            for frame in set(frames):
+                total_counts[frame] += count
+        app_samples = sum(stacks.values())
+        end = self.stopped_at if not self.running and self.stopped_at else datetime.now()
+
+        def rows(counter):
+            return [{"function": function, "samples": count,
+                     "percent": round(count / app_samples * 100, 1) if app_samples else 0.0}
+                    for function, count in counter.most_common(top)]
+
+        return {
+            "running": self.running,
+            "interval_ms": round(self.interval * 1000, 2),
+            "started_at": self.started_at.isoformat(timespec="seconds") if self.started_at else None,
+            "duration_seconds": round((end - self.started_at).total_seconds(), 1) if self.started_at else 0,
+            "sample_rounds": samples,
+            "app_stack_samples": app_samples,
+            "self": rows(self_counts),
+            "cumulative": rows(total_counts)
+        }
+
+sampler = StackSampler()
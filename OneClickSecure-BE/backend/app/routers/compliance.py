@@ -0,0 +1,94 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import List, Optional
+from app.database import SessionLocal
+from app import crud, check_bitset
+
+router = APIRouter(prefix="/api/compliance", tags=["Compliance"])
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+@router.get("/codes")
+def get_check_codes():
+    """비트셋 인코딩에 사용되는 정규 항목코드 테이블"""
+    return {
+        "version": check_bitset.BITSET_VERSION,
+        "bitset_bytes": check_bitset.BITSET_BYTES,
+        "codes": list(check_bitset.CHECK_CODES)
+    }
+
+@router.get("/changes")
+def get_latest_changes(
+    host_ids: Optional[List[int]] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """호스트별 직전 점검 대비 변경된 항목"""
+    try:
+        return {"hosts": crud.get_latest_outcome_changes(db, host_ids)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"변경 항목 조회 실패: {str(e)}")
+
+@router.get("/drift")
+def get_drift(
+    host_ids: Optional[List[int]] = Query(None),
+    days: int = Query(365, ge=1),
+    db: Session = Depends(get_db)
+):
+    """기간 내 연속 점검 간 결과가 바뀐 항목 (출력 텍스트를 읽지 않음)"""
+    try:
+        since = datetime.now() - timedelta(days=days)
+        drift = crud.get_outcome_drift(db, host_ids, since)
+        return {
+            "period_days": days,
+            "total": len(drift),
+            "drift": drift
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"드리프트 조회 실패: {str(e)}")
+
+@router.get("/hosts/{host_id}/trend")
+def get_host_trend(
+    host_id: int,
+    days: int = Query(90, ge=1),
+    granularity: str = Query("raw", pattern="^(raw|daily|weekly)$"),
+    db: Session = Depends(get_db)
+):
+    """호스트 준수율 추이와 실행 간 바뀐 항목"""
+    host = crud.get_host(db, host_id)
+    if not host:
+        raise HTTPException(status_code=404, detail="Host not found")
+
+    try:
+        since = datetime.now() - timedelta(days=days)
+        return {
+            "host_id": host_id,
+            "host_name": host.name,
+            "granularity": granularity,
+            "period_days": days,
+            "trend": crud.get_host_compliance_trend(db, host_id, since, granularity)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"준수율 추이 조회 실패: {str(e)}")
+
+@router.get("/fleet/trend")
+def get_fleet_trend(
+    days: int = Query(90, ge=1),
+    granularity: str = Query("daily", pattern="^(daily|weekly)$"),
+    db: Session = Depends(get_db)
+):
+    """전체 호스트 준수율 추이"""
+    try:
+        since = datetime.now() - timedelta(days=days)
+        return {
+            "granularity": granularity,
+            "period_days": days,
+            "trend": crud.get_fleet_compliance_trend(db, since, granularity)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"전체 준수율 추이 조회 실패: {str(e)}")
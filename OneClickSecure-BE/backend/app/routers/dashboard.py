@@ -0,0 +1,65 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app import crud, schemas
+
+router = APIRouter(prefix="/api/dashboard", tags=["Dashboard"])
+
+# 대시보드 카운터 재계산 주기 (초)
+RECONCILE_INTERVAL_SECONDS = 3600
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def reconcile_dashboard_counters():
+    """대시보드 카운터 재계산 작업"""
+    db = SessionLocal()
+    try:
+        counters = crud.rebuild_dashboard_counters(db)
+        print(f"✅ 대시보드 카운터 재계산 완료: 호스트 {counters.total_hosts}, 실행 {counters.total_executions}")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ 대시보드 카운터 재계산 실패: {e}")
+    finally:
+        db.close()
+
+@router.get("", response_model=schemas.DashboardStats)
+def get_dashboard(db: Session = Depends(get_db)):
+    """대시보드 통계 (카운터 단일 행 조회)"""
+    return crud.get_dashboard_stats(db)
+
+@router.get("/executions")
+def get_execution_stats(days: int = Query(30, ge=1), db: Session = Depends(get_db)):
+    """기간별 점검 실행 통계"""
+    return crud.get_check_execution_stats(db, days)
+
+@router.get("/resource-usage")
+def get_resource_usage(
+    group_by: str = Query("playbook", pattern=f"^({'|'.join(crud.RESOURCE_USAGE_GROUPS)})$"),
+    days: int = Query(30, ge=1),
+    limit: int = Query(50, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """ansible 프로세스 CPU/메모리 사용량 (플레이북별 또는 호스트별 상위)"""
+    return {
+        "group_by": group_by,
+        "period_days": days,
+        "usage": crud.get_resource_usage(db, group_by, days, limit)
+    }
+
+@router.post("/reconcile")
+def reconcile(db: Session = Depends(get_db)):
+    """대시보드 카운터를 원본 테이블에서 재계산"""
+    try:
+        counters = crud.rebuild_dashboard_counters(db)
+        return {
+            "message": "대시보드 카운터가 재계산되었습니다",
+            "reconciled_at": counters.reconciled_at
+        }
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"카운터 재계산 실패: {str(e)}")
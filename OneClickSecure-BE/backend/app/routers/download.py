@@ -5,13 +5,17 @@ import re
 from datetime import datetime
 import os
 import csv
+from app.check_runner import CHECK_PLAYBOOK_DIR
+
+# 호스트별 점검 결과 CSV 수집 디렉토리
+RESULT_DIR = f"{CHECK_PLAYBOOK_DIR}/collected_results"
 
 app = FastAPI()
 router = APIRouter()
 
 @router.get("/download/{host_id}/{username}")
 def download_result_file(host_id: int, username: str):
-    file_pattern = f"/home/user/ansible-manager/backend/playbooks/collected_results/Results_{host_id}_{username}_*.csv"
+    file_pattern = f"{RESULT_DIR}/Results_{host_id}_{username}_*.csv"
     print(f"DEBUG: Searching for pattern: {file_pattern}") # 어떤 패턴으로 찾는지 로그!
 
     files = glob.glob(file_pattern)
@@ -54,7 +58,7 @@ def download_result_file(host_id: int, username: str):
 
 @router.get("/download/{host_id}/{username}/json")
 def download_result_file_json(host_id: int, username: str):
-    file_pattern = f"/home/user/ansible-manager/backend/playbooks/collected_results/Results_{host_id}_{username}_*.csv"
+    file_pattern = f"{RESULT_DIR}/Results_{host_id}_{username}_*.csv"
     files = glob.glob(file_pattern)
     if not files:
         raise HTTPException(status_code=404, detail="결과 파일이 없습니다")
@@ -1,13 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse, PlainTextResponse
 from sqlalchemy.orm import Session
-from pathlib import Path
+from typing import List, Optional
+from datetime import datetime
+import base64
+import csv
+import hashlib
+import io
+import json
+import uuid
 from app.database import SessionLocal
 from app import crud, schemas, models
-from app.ansible_utils import get_os_info_with_ansible
-from app.check_runner import run_os_check_script
+from app import fact_cache, preflight, timeouts, tracing, tuning
+from app.inventory_provider import inventory, read_generation
+from app.execution_store import execution_store
+from app.check_runner import run_os_check_script, run_os_check_groups
 
 router = APIRouter(prefix="/inventory", tags=["Inventory"])
 
+LIST_MAX_LIMIT = 1000
+EXPORT_BATCH_SIZE = 1000
+
 def get_db():
     db = SessionLocal()
     try:
@@ -15,58 +29,243 @@ def get_db():
     finally:
         db.close()
 
-def update_ansible_inventory(db: Session):
-    """Ansible 인벤토리 파일 업데이트"""
-    hosts = crud.get_hosts(db)
-    inventory_content = "[all]\n"
-    for host in hosts:
-        inventory_content += f"{host.ip}\n"
-    
-    inventory_path = Path("/home/user/ansible-manager/backend/playbooks/hosts")
-    inventory_path.parent.mkdir(parents=True, exist_ok=True)
-    inventory_path.write_text(inventory_content)
-
 @router.post("/register", response_model=schemas.HostRead)
 def register_host(host: schemas.HostCreate, db: Session = Depends(get_db)):
     """호스트 등록"""
     try:
-        # OS 정보 자동 감지
-        os_info = get_os_info_with_ansible(host.ip, host.username, host.password)
+        # OS 정보 자동 감지 (facts 캐시 우선)
+        os_info = fact_cache.get_os_info(db, host.ip, host.username, host.password)
         
         # 호스트 생성
         new_host = crud.create_host(db, host, os_info)
         
-        # 인벤토리 파일 갱신
-        update_ansible_inventory(db)
-        
         return new_host
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"호스트 등록 실패: {str(e)}")
 
+def _register_hosts_bulk(db: Session, hosts: List[schemas.HostCreate]) -> schemas.BulkHostRegisterResponse:
+    """호스트 일괄 등록 - OS 감지 1회, 단일 트랜잭션 삽입, 인벤토리 1회 갱신"""
+    rejected = []
+    candidates = []
+    seen_ips = set()
+    existing_ips = crud.get_existing_host_ips(db, [host.ip for host in hosts])
+
+    for host in hosts:
+        if not host.ip:
+            rejected.append(schemas.BulkHostFailure(name=host.name, ip=host.ip, error="IP 주소가 비어 있습니다"))
+        elif host.ip in existing_ips:
+            rejected.append(schemas.BulkHostFailure(name=host.name, ip=host.ip, error=f"IP 주소 {host.ip}는 이미 등록되어 있습니다."))
+        elif host.ip in seen_ips:
+            rejected.append(schemas.BulkHostFailure(name=host.name, ip=host.ip, error="요청 내 중복된 IP 주소입니다"))
+        else:
+            seen_ips.add(host.ip)
+            candidates.append(host)
+
+    # 전체 호스트 OS 병렬 감지 (캐시 미스만 setup 1회)
+    detection = fact_cache.get_os_info_many(db, [
+        {"ip": host.ip, "username": host.username, "password": host.password}
+        for host in candidates
+    ])
+    detection_failed = []
+    os_infos = {}
+    for host in candidates:
+        entry = detection.get(host.ip, {})
+        os_infos[host.ip] = entry.get("os") or "Unknown"
+        if entry.get("error"):
+            detection_failed.append(schemas.BulkHostFailure(name=host.name, ip=host.ip, error=entry["error"]))
+
+    registered = crud.create_hosts_bulk(db, candidates, os_infos) if candidates else []
+
+    print(f"✅ 호스트 일괄 등록: {len(registered)}개 등록, {len(rejected)}개 거부, OS 감지 실패 {len(detection_failed)}개")
+    return schemas.BulkHostRegisterResponse(
+        registered=registered,
+        rejected=rejected,
+        detection_failed=detection_failed,
+        total=len(hosts)
+    )
+
+def _register_hosts_bulk_in_thread(hosts: List[schemas.HostCreate]) -> schemas.BulkHostRegisterResponse:
+    """스레드풀에서 실행 (세션은 이 스레드에서 열고 닫음)"""
+    db = SessionLocal()
+    try:
+        return _register_hosts_bulk(db, hosts)
+    finally:
+        db.close()
+
+@router.post("/register/bulk", response_model=schemas.BulkHostRegisterResponse)
+def register_hosts_bulk(request: schemas.BulkHostRegisterRequest, db: Session = Depends(get_db)):
+    """호스트 일괄 등록 (JSON)"""
+    try:
+        return _register_hosts_bulk(db, request.hosts)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"호스트 일괄 등록 실패: {str(e)}")
+
+@router.post("/register/bulk/csv", response_model=schemas.BulkHostRegisterResponse)
+async def register_hosts_bulk_csv(file: UploadFile = File(...)):
+    """호스트 일괄 등록 (CSV: name,username,ip,password 헤더 필요)"""
+    try:
+        content = (await file.read()).decode("utf-8-sig")
+        reader = csv.DictReader(io.StringIO(content))
+        missing = {"name", "username", "ip", "password"} - set(reader.fieldnames or [])
+        if missing:
+            raise HTTPException(status_code=400, detail=f"CSV 헤더 누락: {', '.join(sorted(missing))}")
+        hosts = [
+            schemas.HostCreate(
+                name=(row["name"] or "").strip(),
+                username=(row["username"] or "").strip(),
+                ip=(row["ip"] or "").strip(),
+                password=row["password"] or ""
+            )
+            for row in reader
+        ]
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"CSV 파싱 실패: {str(e)}")
+
+    try:
+        return await run_in_threadpool(_register_hosts_bulk_in_thread, hosts)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"호스트 일괄 등록 실패: {str(e)}")
+
+def _encode_cursor(sort_by: str, order: str, host: models.Host) -> str:
+    """다음 페이지 커서 (정렬 기준, 마지막 정렬값, 마지막 id)"""
+    value = getattr(host, sort_by)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort_by, order, value, host.id], ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str, sort_by: str, order: str) -> tuple:
+    """커서 해석 (정렬 기준이 다르면 오류)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, cursor_order, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다")
+    if cursor_sort != sort_by or cursor_order != order:
+        raise HTTPException(status_code=400, detail="커서의 정렬 조건이 요청과 다릅니다")
+    if value is not None and sort_by == "last_check_at":
+        value = datetime.fromisoformat(value)
+    return value, int(last_id)
+
+def _list_etag(request: Request, db: Session) -> str:
+    """목록 응답 버전 기반 약한 ETag (페이지 조회 전에 계산, 304면 쿼리 생략)
+
+    호스트 정보는 인벤토리 세대, 최근 점검 결과는 마지막 실행 id, 연결 상태는 preflight 캐시 버전으로 판단
+    """
+    version = (read_generation(db), crud.get_last_check_execution_id(db), preflight.cache_version())
+    digest = hashlib.sha1(f"{request.url.query}|{version}".encode("utf-8"))
+    return f'W/"{digest.hexdigest()}"'
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """If-None-Match(쉼표 목록, *)를 약한 비교로 확인해서 일치하면 304"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return None
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    opaque = etag.removeprefix("W/")
+    if "*" in tags or any(tag.removeprefix("W/") == opaque for tag in tags):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+def _host_with_reachability(host: models.Host, probe: Optional[dict]) -> schemas.HostRead:
+    """호스트 조회 결과에 preflight 캐시 결과 추가"""
+    host_read = schemas.HostRead.model_validate(host)
+    if probe:
+        host_read.reachable = probe["reachable"]
+        host_read.reachability_error = probe["error"]
+        host_read.reachability_checked_at = probe["checked_at"]
+    return host_read
+
 @router.get("/list", response_model=list[schemas.HostRead])
-def list_hosts(db: Session = Depends(get_db)):
-    """호스트 목록 조회"""
+def list_hosts(
+    request: Request,
+    response: Response,
+    name: Optional[str] = Query(None, description="호스트명 접두사"),
+    ip: Optional[str] = Query(None, description="IP 접두사 또는 IPv4 CIDR"),
+    os: Optional[str] = Query(None, description="OS 접두사"),
+    last_status: Optional[str] = None,
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    min_failed_checks: Optional[int] = None,
+    sort_by: str = Query("id", pattern=f"^({'|'.join(crud.HOST_SORT_COLUMNS)})$"),
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    limit: int = Query(100, ge=1, le=LIST_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    probe: bool = Query(False, description="페이지 호스트 SSH 연결 확인 후 반환"),
+    db: Session = Depends(get_db)
+):
+    """호스트 목록 조회 (키셋 페이지네이션, 다음 페이지는 X-Next-Cursor 헤더)"""
+    after = _decode_cursor(cursor, sort_by, order) if cursor else None
+    if not probe:
+        etag = _list_etag(request, db)
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
     try:
-        return crud.get_hosts(db)
+        filter_params = schemas.HostFilter(
+            name=name,
+            ip=None if ip and "/" in ip else ip,
+            ip_network=ip if ip and "/" in ip else None,
+            os=os,
+            last_status=last_status,
+            min_score=min_score,
+            max_score=max_score,
+            min_failed_checks=min_failed_checks
+        )
+        hosts = crud.get_hosts_page(db, limit=limit + 1, filter_params=filter_params,
+                                    sort_by=sort_by, descending=order == "desc", after=after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"호스트 목록 조회 실패: {str(e)}")
 
+    has_more = len(hosts) > limit
+    hosts = hosts[:limit]
+
+    if probe:
+        # 연결 확인 결과가 캐시에 반영된 뒤의 버전
+        preflight.probe_hosts_sync([host.ip for host in hosts])
+        etag = _list_etag(request, db)
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
+    reachability = {host.ip: preflight.get_cached(host.ip) for host in hosts if host.ip}
+
+    response.headers["ETag"] = etag
+    if has_more:
+        next_cursor = _encode_cursor(sort_by, order, hosts[-1])
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    return [_host_with_reachability(host, reachability.get(host.ip)) for host in hosts]
+
+@router.get("/export.ndjson")
+def export_hosts():
+    """전체 인벤토리 NDJSON 스트리밍 내보내기"""
+    def generate():
+        db = SessionLocal()
+        try:
+            for host in crud.iter_hosts(db, batch_size=EXPORT_BATCH_SIZE):
+                yield schemas.HostRead.model_validate(host).model_dump_json() + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": "attachment; filename=inventory.ndjson"}
+    )
+
 @router.delete("/delete/{host_id}")
 def delete_host(host_id: int, db: Session = Depends(get_db)):
     """호스트 삭제"""
     try:
-        host = db.query(models.Host).filter(models.Host.id == host_id).first()
-        if not host:
+        if not crud.delete_host(db, host_id):
             raise HTTPException(status_code=404, detail="Host not found")
         
-        db.delete(host)
-        db.commit()
-        
-        # 인벤토리 파일 갱신
-        update_ansible_inventory(db)
-        
         return {"message": "호스트가 성공적으로 삭제되었습니다"}
     except HTTPException:
         raise
@@ -74,26 +273,77 @@ def delete_host(host_id: int, db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=500, detail=f"호스트 삭제 실패: {str(e)}")
 
+@router.get("/ansible")
+def get_ansible_inventory(format: str = Query("json", pattern="^(json|ini)$"), db: Session = Depends(get_db)):
+    """hosts 테이블 기반 Ansible 동적 인벤토리 (OS별 그룹, host vars 포함)"""
+    current = inventory.sync(db)
+    if format == "ini":
+        return PlainTextResponse(current.to_ini())
+    return current.to_dict()
+
+@router.get("/preflight")
+async def preflight_hosts(
+    host_ids: Optional[List[int]] = Query(None),
+    refresh: bool = False,
+    db: Session = Depends(get_db)
+):
+    """호스트 SSH 연결 사전 확인 (TCP/22 + 배너, 동시 실행)"""
+    query = db.query(models.Host.id, models.Host.name, models.Host.ip).filter(models.Host.ip != "")
+    if host_ids:
+        query = query.filter(models.Host.id.in_(host_ids))
+    hosts = query.all()
+
+    results = await preflight.probe_hosts([host.ip for host in hosts], use_cache=not refresh)
+    items = [{"host_id": host.id, "host_name": host.name, **results[host.ip]} for host in hosts]
+    return {
+        "total": len(items),
+        "reachable": sum(1 for item in items if item["reachable"]),
+        "hosts": items
+    }
+
 @router.post("/check")
 def check_host(info: schemas.HostCheck, db: Session = Depends(get_db)):
-    """호스트 점검 실행"""
+    """호스트 점검 실행 (응답의 trace_id로 단계별 워터폴 조회)"""
+    with tracing.span("os_check", execution_id=str(uuid.uuid4()), ip=info.ip):
+        return _check_host(info, db)
+
+def _check_host(info: schemas.HostCheck, db: Session):
     try:
         # 호스트 정보 조회
         host = db.query(models.Host).filter(models.Host.ip == info.ip).first()
         if not host:
             raise HTTPException(status_code=404, detail="Host not found")
+        profile = get_tuning_profile(info.tuning_profile)
         
-        # OS 정보 가져오기
-        os_info = host.os or "Unknown"
+        # OS 정보 가져오기 (facts 캐시, 만료 시 재수집)
+        os_info = fact_cache.get_os_info(db, info.ip, info.username, info.password)
+        if os_info == "Unknown":
+            os_info = host.os or "Unknown"
+        elif os_info != host.os:
+            crud.update_host_os(db, host, os_info)
         
         # 점검 스크립트 실행
+        started_at = datetime.now()
         result = run_os_check_script(
             ip=info.ip,
             username=info.username,
             password=info.password,
             os_info=os_info,
             host_id=host.id,
-            hostname=host.name
+            hostname=host.name,
+            timeout=tuning.scale_timeout(timeouts.get_timeout(db, host.id), profile),
+            profile=profile
+        )
+        
+        # 점검 이력 및 호스트 최근 상태 갱신
+        crud.record_host_execution(
+            db,
+            run_id=None,
+            playbook_id=None,
+            host_id=host.id,
+            result=result,
+            started_at=started_at,
+            completed_at=datetime.now()
         )
         
         return {
@@ -103,7 +353,9 @@ def check_host(info: schemas.HostCheck, db: Session = Depends(get_db)):
             "result": result.get("stdout", ""),
             "error": result.get("stderr", ""),
             "return_code": result.get("returncode", 0),
-            "success": result.get("returncode", 0) == 0
+            "success": result.get("returncode", 0) == 0,
+            "tuning_profile": profile.name,
+            "trace_id": tracing.current_trace_id()
         }
         
     except HTTPException:
@@ -111,6 +363,186 @@ def check_host(info: schemas.HostCheck, db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"점검 실행 실패: {str(e)}")
 
+def get_tuning_profile(name: Optional[str]):
+    """실행 튜닝 프로필 조회 (None이면 활성 프로필)"""
+    try:
+        return tuning.get_profile(name)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=e.args[0])
+
+@router.post("/check/fleet")
+def check_fleet(request: schemas.FleetCheckRequest, background_tasks: BackgroundTasks,
+                db: Session = Depends(get_db)):
+    """여러 호스트 일괄 점검 시작 - OS/버전 그룹(큰 그룹은 코어 수만큼 샤드)마다 ansible-playbook 1회, 병렬 실행
+
+    점검은 백그라운드에서 실행되고, 진행 상황과 결과는 GET /inventory/check/fleet/{run_id}로 조회
+    """
+    host_ids = list(dict.fromkeys(request.host_ids))
+    if not host_ids:
+        raise HTTPException(status_code=400, detail="점검할 호스트를 선택하세요")
+    profile = get_tuning_profile(request.tuning_profile)
+
+    found_ids = {host_id for (host_id,) in db.query(models.Host.id).filter(models.Host.id.in_(host_ids))}
+    missing = [host_id for host_id in host_ids if host_id not in found_ids]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"호스트를 찾을 수 없습니다: {missing}")
+
+    run_id = str(uuid.uuid4())
+    execution_store.create(run_id, {
+        "run_id": run_id,
+        "kind": "fleet_check",
+        "status": "준비중",
+        "start_time": datetime.now().isoformat(),
+        "end_time": None,
+        "results": {},
+        "tuning_profile": profile.name,
+        "total_hosts": len(host_ids),
+        "completed_hosts": 0,
+        "failed_hosts": 0,
+        "ansible_runs": 0,
+        "groups": [],
+        "skipped": [],
+        "error": None
+    })
+    background_tasks.add_task(run_fleet_check, run_id, host_ids, request.password, request.refresh_os, profile)
+    return {
+        "message": "일괄 점검이 시작되었습니다",
+        "run_id": run_id,
+        "hosts_count": len(host_ids),
+        "tuning_profile": profile.name
+    }
+
+@router.get("/check/fleet/{run_id}")
+def get_fleet_check(run_id: str):
+    """일괄 점검 진행 상황/결과 조회 (완료되면 end_time 설정)"""
+    state = execution_store.get(run_id)
+    if state is None or state.get("kind") != "fleet_check":
+        raise HTTPException(status_code=404, detail="일괄 점검 기록을 찾을 수 없습니다")
+    return state
+
+def run_fleet_check(run_id: str, host_ids: List[int], password: str, refresh_os: bool,
+                    profile: schemas.TuningProfile):
+    """일괄 점검 (백그라운드 작업, 호스트 결과와 요약은 execution_store에 기록)"""
+    with tracing.span("fleet_check", execution_id=run_id, hosts=len(host_ids)):
+        try:
+            print(f"🔄 일괄 점검 시작: {run_id} (호스트 {len(host_ids)}개)")
+            execution_store.update(run_id, status="실행중")
+            summary = _check_fleet(run_id, host_ids, password, refresh_os, profile)
+            state = execution_store.get(run_id)
+            execution_store.update(run_id, status="완료" if state["failed_hosts"] == 0 else "실패",
+                                   end_time=datetime.now().isoformat(), **summary)
+            print(f"✅ 일괄 점검 완료: {run_id}")
+        except Exception as e:
+            print(f"❌ 일괄 점검 실행 오류 ({run_id}): {e}")
+            execution_store.update(run_id, status="실패", end_time=datetime.now().isoformat(),
+                                   error=f"일괄 점검 실행 실패: {str(e)}")
+
+def _store_fleet_result(run_id: str, target: dict, group: Optional[str], result: dict):
+    """호스트 결과를 execution_store에 기록 (완료/실패 카운터 포함)"""
+    execution_store.set_host_result(run_id, target["host_id"], {
+        "host_id": target["host_id"],
+        "host_name": target["hostname"],
+        "ip": target["ip"],
+        "group": group,
+        "result": result.get("stdout", ""),
+        "error": result.get("stderr", ""),
+        "return_code": result["returncode"],
+        "success": result["returncode"] == 0,
+        "completed_at": datetime.now().isoformat()
+    })
+
+def _check_fleet(run_id: str, host_ids: List[int], password: str, refresh_os: bool,
+                 profile: schemas.TuningProfile) -> dict:
+    """준비(OS 감지/타임아웃) → 그룹별 실행 → 기록. DB 세션은 단계마다 짧게 사용 (실행 중에는 열지 않음)"""
+    skipped = []
+    db = SessionLocal()
+    try:
+        hosts = db.query(models.Host).filter(models.Host.id.in_(host_ids)).all()
+        # IP가 없거나 SSH 연결이 안 되는 호스트는 실행 대상에서 제외
+        for host in hosts:
+            if not host.ip:
+                skipped.append(({"host_id": host.id, "hostname": host.name, "ip": host.ip},
+                                {"stdout": "", "stderr": "IP 주소가 없습니다", "returncode": 1}))
+        hosts = [host for host in hosts if host.ip]
+        with tracing.span("preflight", hosts=len(hosts)):
+            reachability = preflight.probe_hosts_sync([host.ip for host in hosts])
+        for host in hosts:
+            probe = reachability[host.ip]
+            if not probe["reachable"]:
+                now = datetime.now()
+                result = preflight.unreachable_result(probe)
+                crud.record_host_execution(db, run_id=run_id, playbook_id=None, host_id=host.id,
+                                           result=result, started_at=now, completed_at=now)
+                skipped.append(({"host_id": host.id, "hostname": host.name, "ip": host.ip},
+                                {**result, "stderr": probe["error"]}))
+        hosts = [host for host in hosts if reachability[host.ip]["reachable"]]
+
+        # OS 정보 조회 (facts 캐시 우선, 미스만 setup 1회로 감지)
+        detected = fact_cache.get_os_info_many(
+            db,
+            [{"ip": host.ip, "username": host.username, "password": password} for host in hosts],
+            force_refresh=refresh_os
+        )
+        host_timeouts = tuning.scale_timeouts(timeouts.get_timeouts(db, [host.id for host in hosts]), profile)
+        targets = []
+        for host in hosts:
+            os_info = detected.get(host.ip, {}).get("os")
+            target = {
+                "ip": host.ip,
+                "username": host.username,
+                "os_info": os_info or host.os or "Unknown",
+                "host_id": host.id,
+                "hostname": host.name,
+                "timeout": host_timeouts[host.id]
+            }
+            if os_info and os_info != host.os:
+                crud.update_host_os(db, host, os_info)
+            targets.append(target)
+    finally:
+        db.close()
+
+    for target, result in skipped:
+        _store_fleet_result(run_id, target, None, result)
+
+    partitions = run_os_check_groups(targets, password, profile)
+
+    groups = []
+    db = SessionLocal()
+    try:
+        for group, partition in partitions.items():
+            succeeded = 0
+            for target in partition["hosts"]:
+                result = partition["results"][target["ip"]]
+                crud.record_host_execution(
+                    db,
+                    run_id=run_id,
+                    playbook_id=None,
+                    host_id=target["host_id"],
+                    result=result,
+                    started_at=result["started_at"],
+                    completed_at=result["completed_at"]
+                )
+                _store_fleet_result(run_id, target, group, result)
+                succeeded += result["returncode"] == 0
+            groups.append({
+                "group": group,
+                "script_path": partition["script_path"],
+                "host_count": len(partition["hosts"]),
+                "succeeded": succeeded,
+                "shards": partition["shards"],
+                "duration_seconds": partition["duration_seconds"]
+            })
+    finally:
+        db.close()
+
+    return {
+        # 샤드마다 ansible-playbook 프로세스 1개
+        "ansible_runs": sum(group["shards"] for group in groups),
+        "groups": groups,
+        "skipped": [{"host_id": target["host_id"], "host_name": target["hostname"], "ip": target["ip"],
+                     "error": result["stderr"]} for target, result in skipped]
+    }
+
 @router.get("/health")
 def health_check():
     """인벤토리 시스템 상태 확인"""
@@ -8,35 +8,63 @@ import os
 import uuid
 import tempfile
 import subprocess
+import asyncio
+import math
+import random
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
 from datetime import datetime
 
 # 데이터베이스 import
 from app.database import SessionLocal
-from app import crud, models
+from app import crud, models, preflight, timeouts, check_bitset, metrics, tracing, tuning
+from app.execution_store import execution_store, WORKER_ID
 from app.check_runner import run_custom_script
 from app.schemas import (
     ScriptSection,
     PlaybookResponse, 
     HostInfo,
     PlaybookExecuteRequest,
+    ExecutionRetryRequest,
     ExecutionResult,
+    TuningProfile,
     YAMLValidationRequest,
     YAMLValidationResponse
 )
 from app.yaml_validator import yaml_validator  
 
 # 경로 설정
-BASE_DIR = Path("/home/user/projects/OneClickSecure-BE/backend")
+BASE_DIR = Path(os.environ.get("ONECLICKSECURE_BASE_DIR", "/home/user/projects/OneClickSecure-BE/backend"))
 PLAYBOOKS_DIR = BASE_DIR / "playbooks"
 METADATA_FILE = PLAYBOOKS_DIR / "metadata.json"
 
 # 디렉토리 생성
 PLAYBOOKS_DIR.mkdir(parents=True, exist_ok=True)
 
-# 실행 상태 저장소
-execution_status_store: Dict[str, Dict] = {}
+# 실행 상태 저장소는 app.execution_store (워커 간 공유, EXECUTION_STORE로 백엔드 선택)
+
+# 실패 호스트 재시도 설정
+RETRY_MAX_ATTEMPTS = 3          # 호스트별 최대 시도 횟수 (최초 실행 포함)
+RETRY_BACKOFF_BASE = 5          # 재시도 라운드 간 대기 (초, 라운드마다 2배)
+RETRY_BACKOFF_MAX = 120
+RETRY_BUDGET_RATIO = 0.1        # 실행당 재시도 가능한 호스트 수 = 전체의 10% (최소 RETRY_BUDGET_MIN)
+RETRY_BUDGET_MIN = 5
+
+# 실행 방식: local(이 프로세스에서 ansible 실행) / queue(원격 워커가 작업을 가져가 실행, app.worker)
+EXECUTION_MODE = os.environ.get("EXECUTION_MODE", "local")
+JOB_LEASE_SECONDS = 120         # 워커 heartbeat가 없으면 이 시간 후 다른 워커가 재실행
+JOB_POLL_INTERVAL = 2           # queue 모드에서 작업 완료 확인 주기 (초)
+
+RUN_STATUS_LABELS = {
+    "pending": "준비중",
+    "running": "실행중",
+    "completed": "완료",
+    "failed": "실패",
+    "interrupted": "중단됨"
+}
 
 router = APIRouter(prefix="/api/playbooks", tags=["Playbooks"])
 
@@ -393,9 +421,14 @@ async def execute_playbook(
         playbook = next((p for p in metadata if p["id"] == playbook_id), None)
         if not playbook:
             raise HTTPException(status_code=404, detail="플레이북을 찾을 수 없습니다")
+        profile = get_tuning_profile(request.tuning_profile)
+        
+        # 실행 기록 (호스트별 체크포인트는 check_executions.run_id)
+        crud.create_execution_run(db, execution_id, playbook, [h.id for h in hosts], request.section_ids,
+                                  profile.name)
         
         # 실행 상태 초기화
-        execution_status_store[execution_id] = {
+        execution_store.create(execution_id, {
             "execution_id": execution_id,
             "playbook_id": playbook_id,
             "playbook_name": playbook["name"],
@@ -406,11 +439,15 @@ async def execute_playbook(
             "end_time": None,
             "results": {},
             "section_ids": request.section_ids,
+            "tuning_profile": profile.name,
             "total_hosts": len(hosts),
             "completed_hosts": 0,
             "failed_hosts": 0,
+            "unreachable_hosts": [],
+            "retries_used": 0,
+            "retry_budget": retry_budget(len(hosts)),
             "error": None
-        }
+        })
         
         # 백그라운드에서 실행
         background_tasks.add_task(
@@ -419,111 +456,336 @@ async def execute_playbook(
             playbook,
             hosts,
             request.password,
-            request.section_ids
+            request.section_ids,
+            profile=profile
         )
         
         return {
             "execution_id": execution_id,
             "message": f"플레이북 '{playbook['name']}' 실행이 시작되었습니다",
             "hosts_count": len(hosts),
-            "playbook_name": playbook["name"]
+            "playbook_name": playbook["name"],
+            "tuning_profile": profile.name
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"❌ 플레이북 실행 시작 오류: {e}")
         raise HTTPException(status_code=500, detail=f"플레이북 실행 시작 실패: {str(e)}")
 
+def _checkpoint_info(execution: models.CheckExecution) -> dict:
+    """호스트 체크포인트 요약 (세션 종료 후에도 사용)"""
+    return {
+        "attempt": execution.attempt or 1,
+        "status": execution.status,
+        "outcome_bits": execution.outcome_bits
+    }
+
+def _remaining_sections(script_text: str, section_ids: Optional[List[str]],
+                        outcome_bits: Optional[bytes]) -> Optional[List[str]]:
+    """이전 시도에서 결과가 나온 섹션을 제외한 재실행 섹션 (섹션 단위 재실행이 불가하면 None)"""
+    evaluated = set(check_bitset.codes_from_mask(check_bitset.status_masks(outcome_bits)["evaluated"]))
+    if not evaluated:
+        return None
+    candidates = section_ids or [
+        f"section_{int(num)}" for num in re.findall(r'^\s*u_(\d+)\s*\(\)\s*\{', script_text, re.MULTILINE)
+    ]
+    remaining = []
+    for section_id in candidates:
+        try:
+            code = f"U-{int(section_id.replace('section_', '')):02d}"
+        except ValueError:
+            return None
+        if code not in evaluated:
+            remaining.append(section_id)
+    # 모든 섹션 결과가 있는데 실패했다면 전체 재실행
+    return remaining or None
+
+def _host_attempt(host_id: int, checkpoints: Dict[int, dict], section_ids: Optional[List[str]],
+                  script_content: str, full_script_text: str):
+    """호스트별 시도 번호/실행 섹션/스크립트 (이전 시도에서 일부 섹션 결과가 있으면 나머지만)"""
+    checkpoint = checkpoints.get(host_id)
+    attempt = checkpoint["attempt"] + 1 if checkpoint else 1
+    if checkpoint and full_script_text:
+        remaining = _remaining_sections(full_script_text, section_ids, checkpoint["outcome_bits"])
+        if remaining:
+            return (attempt, remaining, build_selected_sections_script(full_script_text, remaining),
+                    checkpoint["outcome_bits"])
+    return attempt, section_ids, script_content, None
+
+def get_tuning_profile(name: Optional[str]) -> TuningProfile:
+    """실행 튜닝 프로필 조회 (None이면 활성 프로필)"""
+    try:
+        return tuning.get_profile(name)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=e.args[0])
+
+def record_host_result(execution_id: str, playbook_id: int, host_id: int, hostname: str, ip: str,
+                       result: dict, started_at: datetime, completed_at: datetime,
+                       section_ids: Optional[List[str]], attempt: int, base_bits: Optional[bytes] = None):
+    """호스트 실행 결과 기록 (check_executions 체크포인트 + 공유 실행 상태)"""
+    db = SessionLocal()
+    try:
+        crud.record_host_execution(
+            db,
+            run_id=execution_id,
+            playbook_id=playbook_id,
+            host_id=host_id,
+            result=result,
+            started_at=started_at,
+            completed_at=completed_at,
+            section_ids=section_ids,
+            attempt=attempt,
+            base_bits=base_bits
+        )
+    finally:
+        db.close()
+    
+    execution_result = ExecutionResult(
+        hostname=hostname,
+        ip=ip,
+        success=result.get("returncode", 1) == 0,
+        output=result.get("stdout", "") + result.get("stderr", ""),
+        return_code=result.get("returncode", 1),
+        completed_at=completed_at.isoformat()
+    )
+    with tracing.span("state_write", host_id=host_id):
+        execution_store.set_host_result(execution_id, host_id, {**execution_result.dict(), "attempt": attempt})
+
+def finalize_execution(execution_id: str):
+    """호스트별 마지막 시도 기준으로 최종 상태 반영 (여러 번 호출해도 동일)"""
+    completed_count, failed_count = _finish_execution_run(execution_id)
+    execution_store.update(
+        execution_id,
+        status="완료" if failed_count == 0 else "실패",
+        end_time=datetime.now().isoformat(),
+        completed_hosts=completed_count,
+        failed_hosts=failed_count
+    )
+    return completed_count, failed_count
+
+def _finish_execution_run(execution_id: str):
+    """호스트별 마지막 시도 기준으로 실행 상태 집계"""
+    db = SessionLocal()
+    try:
+        run = crud.get_execution_run(db, execution_id)
+        checkpoints = crud.get_run_checkpoints(db, execution_id)
+        host_ids = run.host_ids if run else list(checkpoints)
+        completed = sum(1 for host_id in host_ids
+                        if host_id in checkpoints and checkpoints[host_id].status == "completed")
+        failed = len(host_ids) - completed
+        crud.update_execution_run(db, execution_id,
+                                  status="completed" if failed == 0 else "failed",
+                                  completed_at=datetime.now())
+        return completed, failed
+    finally:
+        db.close()
+
 async def execute_playbook_on_hosts_task(
     execution_id: str,
     playbook: dict,
     hosts: List,
     password: str,
-    section_ids: Optional[List[str]] = None
+    section_ids: Optional[List[str]] = None,
+    checkpoints: Optional[Dict[int, dict]] = None,
+    profile: Optional[TuningProfile] = None
 ):
-    """실제 플레이북 실행 로직 (백그라운드 작업)"""
-    try:
-        print(f"🔄 플레이북 실행 시작: {execution_id}")
+    """실제 플레이북 실행 로직 (백그라운드 작업)
+
+    checkpoints: 재시도/재개 시 호스트별 이전 시도 ({host_id: _checkpoint_info})
+    profile: 실행 튜닝 프로필 (None이면 활성 프로필, 실행 중에는 시작 시점 값 유지)
+    """
+    checkpoints = checkpoints or {}
+    profile = profile or tuning.get_profile()
+    started = time.perf_counter()
+    status = "failed"
+    metrics.EXECUTIONS_INFLIGHT.inc()
+    # 실행 ID가 트레이스 ID (GET /api/traces/{execution_id}로 워터폴 조회)
+    with tracing.span("execution", execution_id=execution_id, playbook_id=playbook.get("id"),
+                      hosts=len(hosts), mode=EXECUTION_MODE, tuning_profile=profile.name):
+        try:
+            print(f"🔄 플레이북 실행 시작: {execution_id} (튜닝 프로필 {profile.name})")
         
-        # 상태 업데이트: 실행중
-        execution_status_store[execution_id]["status"] = "실행중"
+            # 상태 업데이트: 실행중 (이 워커가 소유)
+            execution_store.update(execution_id, status="실행중", owner=WORKER_ID)
+            db = SessionLocal()
+            try:
+                crud.update_execution_run(db, execution_id, status="running", error=None, owner=WORKER_ID)
+            finally:
+                db.close()
         
-        # 플레이북 파일 경로
-        playbook_file = playbook.get("filename")
-        if not playbook_file:
-            raise Exception("플레이북 파일이 지정되지 않았습니다")
+            # 플레이북 파일 경로
+            playbook_file = playbook.get("filename")
+            if not playbook_file:
+                raise Exception("플레이북 파일이 지정되지 않았습니다")
         
-        playbook_path = PLAYBOOKS_DIR / playbook_file
-        if not playbook_path.exists():
-            raise Exception(f"플레이북 파일을 찾을 수 없습니다: {playbook_path}")
+            playbook_path = PLAYBOOKS_DIR / playbook_file
+            if not playbook_path.exists():
+                raise Exception(f"플레이북 파일을 찾을 수 없습니다: {playbook_path}")
         
-        results = {}
-        completed_count = 0
-        failed_count = 0
+            # 스크립트 내용 준비
+            script_content = prepare_script_content(playbook_path, section_ids)
+            full_script_text = playbook_path.read_text(encoding="utf-8") if playbook_path.suffix == ".sh" else ""
         
-        # 스크립트 내용 준비
-        script_content = prepare_script_content(playbook_path, section_ids)
+            # SSH 연결 사전 확인 (연결 불가 호스트는 ansible 실행 없이 즉시 실패 처리)
+            with tracing.span("preflight", hosts=len(hosts)):
+                reachability = await preflight.probe_hosts([host.ip for host in hosts])
+            unreachable = [host.id for host in hosts
+                           if host.ip in reachability and not reachability[host.ip]["reachable"]]
+            execution_store.update(execution_id, unreachable_hosts=unreachable)
+            if unreachable:
+                print(f"⚠️ 연결 불가 호스트 {len(unreachable)}개 제외")
         
-        # 각 호스트에서 실행
-        for host in hosts:
+            # 호스트별 타임아웃 (이 플레이북의 실행 시간 이력 기반)
+            with tracing.span("timeouts"):
+                db = SessionLocal()
+                try:
+                    host_timeouts = timeouts.get_timeouts(db, [host.id for host in hosts], playbook["id"])
+                finally:
+                    db.close()
+                host_timeouts = tuning.scale_timeouts(host_timeouts, profile)
+        
+            if EXECUTION_MODE == "queue":
+                await _run_hosts_via_queue(execution_id, playbook, hosts, password, section_ids, checkpoints,
+                                           script_content, full_script_text, reachability, host_timeouts, profile)
+            else:
+                # 동기 SSH/ansible 실행은 스레드에서 (이벤트 루프 블로킹 방지, 트레이스 컨텍스트는 복사됨)
+                await asyncio.to_thread(_run_hosts_locally, execution_id, playbook, hosts, password, section_ids,
+                                        checkpoints, script_content, full_script_text, reachability,
+                                        host_timeouts, profile)
+        
+            # 최종 상태 업데이트 (재시도 시 이전 시도 결과 포함)
+            completed_count, failed_count = finalize_execution(execution_id)
+            status = "completed" if failed_count == 0 else "failed"
+        
+            print(f"✅ 플레이북 실행 완료: {execution_id}")
+        
+        except Exception as e:
+            print(f"❌ 플레이북 실행 오류 ({execution_id}): {e}")
+            execution_store.update(
+                execution_id,
+                status="실패",
+                end_time=datetime.now().isoformat(),
+                error=str(e),
+                failed_hosts=len(hosts)
+            )
+            db = SessionLocal()
             try:
-                print(f"🖥️ 호스트 {host.name}({host.ip})에서 실행 중...")
-                
+                crud.update_execution_run(db, execution_id, status="failed", error=str(e),
+                                          completed_at=datetime.now())
+            finally:
+                db.close()
+        finally:
+            metrics.EXECUTIONS_INFLIGHT.dec()
+            metrics.EXECUTION_DURATION.labels(EXECUTION_MODE, status).observe(time.perf_counter() - started)
+
+def _run_hosts_locally(execution_id, playbook, hosts, password, section_ids, checkpoints,
+                       script_content, full_script_text, reachability, host_timeouts, profile):
+    """각 호스트에서 실행 (호스트마다 check_executions에 체크포인트 기록)
+
+    튜닝 프로필의 max_parallel_hosts만큼 동시에 실행하고(기본 1 = 순차), 같은 서브넷은 subnet_parallel_cap 이하로 제한
+    """
+    limiter = tuning.SubnetLimiter(profile.subnet_parallel_cap, profile.subnet_prefix)
+
+    def run(host):
+        with limiter.slot(host.ip):
+            _run_host_locally(execution_id, playbook, host, password, section_ids, checkpoints,
+                              script_content, full_script_text, reachability, host_timeouts, profile)
+
+    hosts = limiter.order(hosts)
+    if profile.max_parallel_hosts <= 1 or len(hosts) <= 1:
+        for host in hosts:
+            run(host)
+        return
+    with ThreadPoolExecutor(max_workers=min(profile.max_parallel_hosts, len(hosts))) as pool:
+        # 호스트마다 트레이스 컨텍스트를 복사해 실행
+        futures = [pool.submit(contextvars.copy_context().run, run, host) for host in hosts]
+        for future in futures:
+            future.result()
+
+def _run_host_locally(execution_id, playbook, host, password, section_ids, checkpoints,
+                      script_content, full_script_text, reachability, host_timeouts, profile):
+    """호스트 1대 실행 후 결과 기록"""
+    with tracing.span("host", host_id=host.id, host=host.name):
+        try:
+            host_started_at = datetime.now()
+            attempt, host_sections, host_script, base_bits = _host_attempt(
+                host.id, checkpoints, section_ids, script_content, full_script_text
+            )
+        
+            probe = reachability.get(host.ip)
+            if probe and not probe["reachable"]:
+                result = preflight.unreachable_result(probe)
+            else:
+                print(f"🖥️ 호스트 {host.name}({host.ip})에서 실행 중... (시도 {attempt})")
                 result = run_custom_script(
                     ip=host.ip,
                     username=host.username,
                     password=password,
-                    script_content=script_content,
+                    script_content=host_script,
                     host_id=host.id,
-                    hostname=host.name
-                )
-                
-                execution_result = ExecutionResult(
                     hostname=host.name,
-                    ip=host.ip,
-                    success=result.get("returncode", 1) == 0,
-                    output=result.get("stdout", "") + result.get("stderr", ""),
-                    return_code=result.get("returncode", 1),
-                    completed_at=datetime.now().isoformat()
+                    timeout=host_timeouts[host.id],
+                    profile=profile
                 )
-                
-                results[host.id] = execution_result.dict()
-                
-                if execution_result.success:
-                    completed_count += 1
-                else:
-                    failed_count += 1
-                    
-            except Exception as e:
-                print(f"❌ 호스트 {host.name} 실행 오류: {e}")
-                results[host.id] = ExecutionResult(
-                    hostname=host.name,
-                    ip=host.ip,
-                    success=False,
-                    output=f"실행 오류: {str(e)}",
-                    return_code=1,
-                    completed_at=datetime.now().isoformat()
-                ).dict()
-                failed_count += 1
-        
-        # 최종 상태 업데이트
-        execution_status_store[execution_id].update({
-            "status": "완료" if failed_count == 0 else "실패",
-            "end_time": datetime.now().isoformat(),
-            "results": results,
-            "completed_hosts": completed_count,
-            "failed_hosts": failed_count
-        })
         
-        print(f"✅ 플레이북 실행 완료: {execution_id}")
-        
-    except Exception as e:
-        print(f"❌ 플레이북 실행 오류 ({execution_id}): {e}")
-        execution_status_store[execution_id].update({
-            "status": "실패",
-            "end_time": datetime.now().isoformat(),
-            "error": str(e),
-            "failed_hosts": len(hosts)
+            # 점검 이력 저장 (항목별 결과 비트셋 포함)
+            record_host_result(execution_id, playbook["id"], host.id, host.name, host.ip, result,
+                               host_started_at, datetime.now(), host_sections, attempt, base_bits)
+            
+        except Exception as e:
+            print(f"❌ 호스트 {host.name} 실행 오류: {e}")
+            execution_store.set_host_result(execution_id, host.id, ExecutionResult(
+                hostname=host.name,
+                ip=host.ip,
+                success=False,
+                output=f"실행 오류: {str(e)}",
+                return_code=1,
+                completed_at=datetime.now().isoformat()
+            ).dict())
+
+async def _run_hosts_via_queue(execution_id, playbook, hosts, password, section_ids, checkpoints,
+                               script_content, full_script_text, reachability, host_timeouts, profile):
+    """호스트별 작업을 공유 큐에 등록하고 원격 워커가 모두 처리할 때까지 대기
+
+    결과는 워커가 /api/workers/jobs/{job_id}/complete로 보고 (record_host_result)
+    """
+    jobs = []
+    for host in hosts:
+        attempt, host_sections, host_script, base_bits = _host_attempt(
+            host.id, checkpoints, section_ids, script_content, full_script_text
+        )
+        probe = reachability.get(host.ip)
+        if probe and not probe["reachable"]:
+            now = datetime.now()
+            record_host_result(execution_id, playbook["id"], host.id, host.name, host.ip,
+                               preflight.unreachable_result(probe), now, now, host_sections, attempt, base_bits)
+            continue
+        jobs.append({
+            "host_id": host.id,
+            "secret": password,
+            "payload": {
+                "playbook_id": playbook["id"],
+                "ip": host.ip,
+                "username": host.username,
+                "hostname": host.name,
+                "script_content": host_script,
+                "timeout": host_timeouts[host.id],
+                "attempt": attempt,
+                "section_ids": host_sections,
+                "base_bits": base_bits.hex() if base_bits else None,
+                # 원격 워커는 DB를 읽지 않으므로 프로필 값을 작업에 포함
+                "tuning": profile.model_dump(exclude={"overrides"})
+            }
         })
+    
+    if jobs:
+        with tracing.span("enqueue", jobs=len(jobs)):
+            execution_store.enqueue_jobs(execution_id, jobs)
+        print(f"📬 작업 {len(jobs)}개 등록 ({execution_id}), 워커 대기 중...")
+    while execution_store.pending_jobs(execution_id) > 0:
+        await asyncio.sleep(JOB_POLL_INTERVAL)
 
 def prepare_script_content(playbook_path: Path, section_ids: Optional[List[str]]) -> str:
     """스크립트 내용 준비 (섹션 선택 지원)"""
@@ -579,13 +841,210 @@ def build_selected_sections_script(script_content: str, section_ids: List[str])
     
     return '\n'.join(script_parts) if len(script_parts) > 2 else script_content
 
+def retry_budget(total_hosts: int) -> int:
+    """실행당 재시도 가능한 호스트 수"""
+    return max(RETRY_BUDGET_MIN, math.ceil(total_hosts * RETRY_BUDGET_RATIO))
+
+def _execution_status_from_db(db: Session, run: models.ExecutionRun) -> Dict:
+    """DB 체크포인트로 실행 상태 재구성 (서버 재시작 후 조회/재개용)"""
+    host_ids = run.host_ids or []
+    checkpoints = crud.get_run_checkpoints(db, run.id)
+    hosts = {host.id: host for host in db.query(models.Host).filter(models.Host.id.in_(host_ids))}
+
+    results = {}
+    for host_id, execution in checkpoints.items():
+        host = hosts.get(host_id)
+        results[host_id] = {
+            "hostname": host.name if host else "",
+            "ip": host.ip if host else "",
+            "success": execution.status == "completed",
+            "output": (execution.output_content or "") + (execution.error_content or ""),
+            "return_code": execution.exit_code,
+            "completed_at": execution.completed_at.isoformat() if execution.completed_at else None,
+            "attempt": execution.attempt or 1
+        }
+    completed = sum(1 for result in results.values() if result["success"])
+
+    return {
+        "execution_id": run.id,
+        "playbook_id": run.playbook_id,
+        "playbook_name": run.playbook_name,
+        "playbook_filename": run.playbook_filename or "",
+        "status": RUN_STATUS_LABELS.get(run.status, run.status),
+        "hosts": [{"id": host.id, "name": host.name, "ip": host.ip} for host in hosts.values()],
+        "start_time": run.started_at.isoformat() if run.started_at else None,
+        "end_time": run.completed_at.isoformat() if run.completed_at else None,
+        "results": results,
+        "section_ids": run.section_ids,
+        "tuning_profile": run.tuning_profile,
+        "total_hosts": len(host_ids),
+        "completed_hosts": completed,
+        "failed_hosts": len(results) - completed,
+        "unreachable_hosts": [],
+        "retries_used": run.retries_used or 0,
+        "retry_budget": retry_budget(len(host_ids)),
+        "error": run.error
+    }
+
 @router.get("/execution/{execution_id}")
-def get_execution_status(execution_id: str):
-    """실행 상태 조회"""
-    if execution_id not in execution_status_store:
+def get_execution_status(execution_id: str, db: Session = Depends(get_db)):
+    """실행 상태 조회 (공유 저장소에 없으면 DB 체크포인트 기준)"""
+    status = execution_store.get(execution_id)
+    if status is not None:
+        return status
+    
+    run = crud.get_execution_run(db, execution_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="실행 기록을 찾을 수 없습니다")
+    return _execution_status_from_db(db, run)
+
+def _next_targets(execution_id: str, include_failed: bool, max_attempts: int):
+    """다음 라운드 대상 호스트 (미실행 + 재시도 예산 내 실패 호스트)"""
+    db = SessionLocal()
+    try:
+        run = crud.get_execution_run(db, execution_id)
+        checkpoints = crud.get_run_checkpoints(db, execution_id)
+        unfinished = [host_id for host_id in run.host_ids or [] if host_id not in checkpoints]
+        failed = [
+            host_id for host_id in run.host_ids or []
+            if include_failed and host_id in checkpoints
+            and checkpoints[host_id].status != "completed"
+            and (checkpoints[host_id].attempt or 1) < max_attempts
+        ]
+
+        budget_left = retry_budget(len(run.host_ids or [])) - (run.retries_used or 0)
+        if len(failed) > budget_left:
+            print(f"⚠️ 재시도 예산 초과: 실패 {len(failed)}개 중 {max(budget_left, 0)}개만 재시도")
+            failed = failed[:max(budget_left, 0)]
+        if failed:
+            crud.update_execution_run(db, execution_id, retries_used=(run.retries_used or 0) + len(failed))
+
+        target_ids = unfinished + failed
+        hosts = db.query(models.Host).filter(models.Host.id.in_(target_ids)).all() if target_ids else []
+        infos = {host_id: _checkpoint_info(checkpoints[host_id]) for host_id in failed}
+        return hosts, infos, (run.retries_used or 0)
+    finally:
+        db.close()
+
+async def retry_execution_task(
+    execution_id: str,
+    playbook: dict,
+    password: str,
+    section_ids: Optional[List[str]],
+    include_failed: bool = True,
+    max_attempts: int = RETRY_MAX_ATTEMPTS,
+    tuning_profile: Optional[str] = None
+):
+    """실패/미완료 호스트만 재실행 (라운드 사이 지수 백오프)
+
+    include_failed=False이면 미실행 호스트만 1회 실행 (중단된 실행 재개)
+    tuning_profile: 라운드마다 최신 값으로 조회 (삭제된 프로필이면 활성 프로필)
+    """
+    round_no = 0
+    while True:
+        hosts, checkpoints, retries_used = _next_targets(execution_id, include_failed, max_attempts)
+        execution_store.update(execution_id, retries_used=retries_used)
+        if not hosts:
+            if round_no == 0:
+                # 재시도 예산 소진 등으로 실행할 호스트가 없으면 상태만 복원
+                finalize_execution(execution_id)
+            break
+        if round_no > 0:
+            delay = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (round_no - 1)) * random.uniform(0.5, 1.0)
+            print(f"⏳ 재시도 대기 {delay:.1f}초 ({execution_id}, {round_no + 1}차)")
+            await asyncio.sleep(delay)
+        
+        print(f"🔁 실행 {execution_id}: {len(hosts)}개 호스트 재실행 ({round_no + 1}차)")
+        try:
+            profile = tuning.get_profile(tuning_profile)
+        except KeyError as e:
+            print(f"⚠️ {e.args[0]}, 활성 프로필로 재실행")
+            profile = tuning.get_profile()
+        await execute_playbook_on_hosts_task(execution_id, playbook, hosts, password, section_ids, checkpoints,
+                                             profile)
+        round_no += 1
+        if not include_failed:
+            break
+
+def _start_retry(execution_id: str, password: str, background_tasks: BackgroundTasks,
+                 db: Session, include_failed: bool, max_attempts: int,
+                 tuning_profile: Optional[str] = None) -> Dict:
+    """재시도/재개 공통 처리 (tuning_profile 미지정 시 처음 실행한 프로필)"""
+    run = crud.get_execution_run(db, execution_id)
+    if not run:
         raise HTTPException(status_code=404, detail="실행 기록을 찾을 수 없습니다")
+    if run.status in ("pending", "running"):
+        raise HTTPException(status_code=409, detail="실행이 아직 진행 중입니다")
+    if not include_failed and run.status != "interrupted":
+        raise HTTPException(status_code=409, detail="중단된 실행만 재개할 수 있습니다")
+    checkpoints = crud.get_run_checkpoints(db, execution_id)
+    if all(host_id in checkpoints and checkpoints[host_id].status == "completed"
+           for host_id in run.host_ids or []):
+        raise HTTPException(status_code=409, detail="재실행할 호스트가 없습니다")
     
-    return execution_status_store[execution_id]
+    metadata = load_metadata()
+    playbook = next((p for p in metadata if p["id"] == run.playbook_id), None) or {
+        "id": run.playbook_id, "name": run.playbook_name, "filename": run.playbook_filename
+    }
+    
+    if tuning_profile:
+        get_tuning_profile(tuning_profile)
+    tuning_profile = tuning_profile or run.tuning_profile
+    
+    status = execution_store.get(execution_id)
+    if status is None:
+        status = _execution_status_from_db(db, run)
+        execution_store.create(execution_id, status)
+    execution_store.update(execution_id, status="준비중", end_time=None, error=None, tuning_profile=tuning_profile)
+    crud.update_execution_run(db, execution_id, status="pending", error=None, tuning_profile=tuning_profile)
+    
+    background_tasks.add_task(
+        retry_execution_task,
+        execution_id,
+        playbook,
+        password,
+        run.section_ids,
+        include_failed,
+        max_attempts,
+        tuning_profile
+    )
+    return status
+
+@router.post("/execution/{execution_id}/retry_failed")
+async def retry_failed_hosts(
+    execution_id: str,
+    request: ExecutionRetryRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """실패하거나 완료되지 않은 호스트만 재실행 (지수 백오프, 재시도 예산 적용)"""
+    max_attempts = request.max_attempts or RETRY_MAX_ATTEMPTS
+    status = _start_retry(execution_id, request.password, background_tasks, db, True, max_attempts,
+                          request.tuning_profile)
+    return {
+        "execution_id": execution_id,
+        "message": "실패 호스트 재시도가 시작되었습니다",
+        "max_attempts": max_attempts,
+        "retries_used": status["retries_used"],
+        "retry_budget": status["retry_budget"]
+    }
+
+@router.post("/execution/{execution_id}/resume")
+async def resume_execution(
+    execution_id: str,
+    request: ExecutionRetryRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """서버 재시작으로 중단된 실행을 미실행 호스트부터 재개"""
+    status = _start_retry(execution_id, request.password, background_tasks, db, False, RETRY_MAX_ATTEMPTS,
+                          request.tuning_profile)
+    return {
+        "execution_id": execution_id,
+        "message": "중단된 실행을 재개합니다",
+        "completed_hosts": status["completed_hosts"],
+        "total_hosts": status["total_hosts"]
+    }
 
 @router.get("/{playbook_id}/script")
 async def get_playbook_script(
@@ -684,7 +1143,7 @@ async def health_check():
             "metadata_file_exists": metadata_exists,
             "playbooks_count": playbooks_count,
             "actual_script_files": script_files,
-            "execution_count": len(execution_status_store)
+            "execution_count": execution_store.count()
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"헬스체크 실패: {str(e)}")
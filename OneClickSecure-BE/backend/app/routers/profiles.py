@@ -0,0 +1,91 @@
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from app import profiling
+
+router = APIRouter(prefix="/api/profiling", tags=["Profiling"])
+
+LOCAL_CLIENTS = ("127.0.0.1", "::1", "localhost")
+SORT_KEYS = ("cumulative", "tottime", "ncalls")
+
+def is_authorized(request: Request) -> bool:
+    """PROFILING_TOKEN이 있으면 X-Profile-Token 확인, 없으면 로컬 요청만 허용"""
+    if profiling.PROFILING_TOKEN:
+        token = request.headers.get("x-profile-token")
+        return bool(token) and hmac.compare_digest(token, profiling.PROFILING_TOKEN)
+    return bool(request.client) and request.client.host in LOCAL_CLIENTS
+
+def verify_profiling(request: Request, x_profile_token: Optional[str] = Header(None)):
+    """프로파일링 활성화 + 관리자 권한 확인"""
+    if not profiling.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="프로파일링이 비활성화되어 있습니다 (PROFILING=1)")
+    if not is_authorized(request):
+        if profiling.PROFILING_TOKEN:
+            raise HTTPException(status_code=401, detail="프로파일링 토큰이 올바르지 않습니다")
+        raise HTTPException(status_code=403, detail="PROFILING_TOKEN 미설정 시 로컬 요청만 허용됩니다")
+
+@router.get("/requests", dependencies=[Depends(verify_profiling)])
+def list_request_profiles():
+    """최근 요청 프로파일 목록 (X-Profile 헤더 또는 ?_profile= 로 수집)"""
+    return {"profiles": profiling.list_profiles()}
+
+@router.get("/requests/{profile_id}", response_class=PlainTextResponse, dependencies=[Depends(verify_profiling)])
+def get_request_profile(
+    profile_id: str,
+    sort: str = Query("cumulative", pattern=f"^({'|'.join(SORT_KEYS)})$"),
+    top: int = Query(profiling.PROFILE_TOP, ge=1, le=500)
+):
+    """요청 프로파일 결과 (cProfile은 pstats 표, pyinstrument는 호출 트리)"""
+    entry = profiling.get_profile(profile_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다")
+    header = (f"# {entry['method']} {entry['path']} → {entry['status']} "
+              f"{entry['duration_ms']}ms ({entry['profiler']}, {entry['created_at']})\n\n")
+    return PlainTextResponse(header + entry["profile"].report(sort, top))
+
+@router.post("/tracemalloc/start", dependencies=[Depends(verify_profiling)])
+def start_tracemalloc(frames: int = Query(1, ge=1, le=50, description="할당 위치별 저장할 스택 깊이")):
+    """메모리 할당 추적 시작 (추적 중에는 할당마다 비용이 있으므로 확인 후 중지)"""
+    profiling.start_tracemalloc(frames)
+    return {"message": "tracemalloc 추적을 시작했습니다", "frames": frames}
+
+@router.get("/tracemalloc", dependencies=[Depends(verify_profiling)])
+def get_tracemalloc(
+    limit: int = Query(30, ge=1, le=200),
+    key_type: str = Query("lineno", pattern="^(lineno|filename|traceback)$")
+):
+    """할당 위치 상위 + 시작 시점 대비 증가량 상위"""
+    return profiling.tracemalloc_report(limit, key_type)
+
+@router.post("/tracemalloc/stop", dependencies=[Depends(verify_profiling)])
+def stop_tracemalloc(
+    limit: int = Query(30, ge=1, le=200),
+    key_type: str = Query("lineno", pattern="^(lineno|filename|traceback)$")
+):
+    """마지막 결과를 반환하고 추적 중지"""
+    return profiling.stop_tracemalloc(limit, key_type)
+
+@router.post("/sampler/start", dependencies=[Depends(verify_profiling)])
+def start_sampler(interval_ms: float = Query(10, ge=1, le=1000)):
+    """백그라운드 실행 스레드 샘플링 시작 (이전 결과는 초기화)"""
+    if profiling.sampler.running:
+        raise HTTPException(status_code=409, detail="샘플링이 이미 실행 중입니다")
+    profiling.sampler.start(interval_ms / 1000)
+    return {"message": "샘플링을 시작했습니다", "interval_ms": interval_ms}
+
+@router.get("/sampler", dependencies=[Depends(verify_profiling)])
+def get_sampler(top: int = Query(30, ge=1, le=200)):
+    """함수별 self/누적 샘플 (실행 중에도 조회 가능)"""
+    return profiling.sampler.report(top)
+
+@router.get("/sampler/collapsed", response_class=PlainTextResponse, dependencies=[Depends(verify_profiling)])
+def get_sampler_collapsed():
+    """collapsed stack 형식 (flamegraph.pl, speedscope 입력)"""
+    return PlainTextResponse(profiling.sampler.collapsed())
+
+@router.post("/sampler/stop", dependencies=[Depends(verify_profiling)])
+def stop_sampler(top: int = Query(30, ge=1, le=200)):
+    """샘플링 중지 후 결과 반환"""
+    profiling.sampler.stop()
+    return profiling.sampler.report(top)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, HTTPException
+from app import tracing
+
+router = APIRouter(prefix="/api/traces", tags=["Traces"])
+
+@router.get("/{execution_id}")
+def get_trace_waterfall(execution_id: str):
+    """실행(플레이북 실행 ID, 일괄 점검 run_id, 단일 점검 trace_id)의 단계별 워터폴
+
+    TRACE_EXPORTERS에 file이 포함된 경우에만 조회 가능 (otlp만 쓰면 수집기에서 조회)
+    """
+    if "file" not in tracing.TRACE_EXPORTERS:
+        raise HTTPException(status_code=404, detail="파일 트레이스 저장이 비활성화되어 있습니다 (TRACE_EXPORTERS)")
+    tracing.flush()
+    spans = tracing.load_trace(execution_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail="트레이스를 찾을 수 없습니다")
+    return {"execution_id": execution_id, **tracing.waterfall(spans)}
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, Path
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app import schemas, tuning
+from app.check_runner import prewarm_executor_pool
+
+router = APIRouter(prefix="/api/tuning", tags=["Tuning"])
+
+PROFILE_NAME_PATTERN = r"^[a-z0-9][a-z0-9_-]{0,63}$"
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+@router.get("/profiles")
+def list_tuning_profiles():
+    """실행 튜닝 프로필 목록 (기본 제공 값 + system_configs 재정의)"""
+    profiles, active = tuning.list_profiles()
+    return {"active": active, "profiles": profiles}
+
+@router.get("/profiles/{name}", response_model=schemas.TuningProfile)
+def get_tuning_profile(name: str):
+    """튜닝 프로필 조회"""
+    try:
+        return tuning.get_profile(name)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+
+@router.put("/profiles/{name}", response_model=schemas.TuningProfile)
+def save_tuning_profile(
+    settings: schemas.TuningSettings,
+    name: str = Path(..., pattern=PROFILE_NAME_PATTERN),
+    db: Session = Depends(get_db)
+):
+    """튜닝 프로필 저장 (지정한 값만 재정의, 다음 실행부터 적용)"""
+    try:
+        return tuning.save_profile(db, name, settings)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.delete("/profiles/{name}")
+def delete_tuning_profile(name: str, db: Session = Depends(get_db)):
+    """튜닝 프로필 재정의 삭제 (기본 제공 프로필은 기본값으로 복원)"""
+    try:
+        deleted = tuning.delete_profile(db, name)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not deleted and name not in tuning.BUILTIN_PROFILES:
+        raise HTTPException(status_code=404, detail=f"튜닝 프로필을 찾을 수 없습니다: {name}")
+    return {"message": f"튜닝 프로필 {name} 재정의를 삭제했습니다", "builtin": name in tuning.BUILTIN_PROFILES}
+
+@router.put("/active", response_model=schemas.TuningProfile)
+def set_active_tuning_profile(request: schemas.TuningActiveRequest, db: Session = Depends(get_db)):
+    """실행 요청에서 프로필을 지정하지 않았을 때 쓸 프로필 변경 (재시작 불필요)"""
+    try:
+        profile = tuning.set_active_profile(db, request.profile)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except RuntimeError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    # 새 프로필의 ansible 환경으로 실행 풀 워커 준비 (백그라운드)
+    prewarm_executor_pool(profile)
+    return profile
@@ -0,0 +1,111 @@
+import hmac
+import os
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app import crud, job_secrets, schemas, tracing
+from app.execution_store import execution_store
+from app.routers.playbooks import JOB_LEASE_SECONDS, record_host_result, finalize_execution
+
+router = APIRouter(prefix="/api/workers", tags=["Workers"])
+
+# 원격 워커 인증 토큰 (미설정 시 같은 서버의 워커만 허용, 비밀번호는 암호화해서 전달)
+WORKER_TOKEN = os.environ.get("WORKER_TOKEN")
+JOB_MAX_CLAIM = 32
+JOB_REAP_INTERVAL = 30  # lease 만료가 반복된 작업 정리 주기 (초)
+LOCAL_CLIENTS = ("127.0.0.1", "::1", "localhost")
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def verify_worker(request: Request, x_worker_token: Optional[str] = Header(None)):
+    """워커 토큰 확인"""
+    if WORKER_TOKEN:
+        if not x_worker_token or not hmac.compare_digest(x_worker_token, WORKER_TOKEN):
+            raise HTTPException(status_code=401, detail="워커 토큰이 올바르지 않습니다")
+    elif not request.client or request.client.host not in LOCAL_CLIENTS:
+        raise HTTPException(status_code=403, detail="WORKER_TOKEN 미설정 시 로컬 워커만 허용됩니다")
+
+def _finalize_if_done(db: Session, execution_id: str):
+    """남은 작업이 없으면 실행 상태 마감 (실행을 시작한 API 프로세스가 종료된 경우 대비)"""
+    if execution_store.pending_jobs(execution_id) > 0:
+        return
+    run = crud.get_execution_run(db, execution_id)
+    if run and run.status != "pending":
+        finalize_execution(execution_id)
+        print(f"✅ 플레이북 실행 완료 (워커 보고): {execution_id}")
+
+def _record_job(job: dict, result: dict, started_at, completed_at):
+    payload = job["payload"]
+    base_bits = bytes.fromhex(payload["base_bits"]) if payload.get("base_bits") else None
+    with tracing.span("report", execution_id=job["execution_id"], host_id=job["host_id"], job_id=job["job_id"]):
+        record_host_result(job["execution_id"], payload["playbook_id"], job["host_id"], payload["hostname"],
+                           payload["ip"], result, started_at, completed_at, payload.get("section_ids"),
+                           payload["attempt"], base_bits)
+
+def reap_expired_jobs():
+    """lease 만료가 반복된 작업 실패 처리 (워커가 계속 종료되는 호스트, 주기적으로 실행)"""
+    jobs = execution_store.fail_exhausted_jobs()
+    if not jobs:
+        return
+    db = SessionLocal()
+    try:
+        for job in jobs:
+            print(f"⚠️ 작업 {job['job_id']} lease 만료 {job['leases']}회, 실패 처리")
+            now = datetime.now()
+            _record_job(job, {"stdout": "", "returncode": 1,
+                              "stderr": f"워커 응답 없음 (lease 만료 {job['leases']}회)"}, now, now)
+            _finalize_if_done(db, job["execution_id"])
+    finally:
+        db.close()
+
+@router.post("/claim", dependencies=[Depends(verify_worker)])
+def claim_jobs(request: schemas.WorkerClaimRequest):
+    """실행할 작업 가져가기 (대기 작업 + lease 만료된 작업)
+
+    WORKER_TOKEN 미설정 시 로컬 워커는 인증되지 않으므로 비밀번호를 암호화해서 전달
+    (같은 서버에서 키 파일을 읽을 수 있는 워커만 복호화 가능)
+    """
+    lease_seconds = request.lease_seconds or JOB_LEASE_SECONDS
+    jobs = execution_store.claim_jobs(request.worker_id, max(1, min(request.limit, JOB_MAX_CLAIM)), lease_seconds)
+    for job in jobs:
+        if job["leases"] > 1:
+            print(f"🔁 작업 {job['job_id']} 재할당 → {request.worker_id} ({job['leases']}번째 lease)")
+        if not WORKER_TOKEN:
+            job["secret"] = job_secrets.encrypt(job["secret"])
+            job["secret_encrypted"] = True
+    return {"jobs": jobs, "lease_seconds": lease_seconds}
+
+@router.post("/heartbeat", dependencies=[Depends(verify_worker)])
+def heartbeat(request: schemas.WorkerHeartbeatRequest):
+    """lease 연장 (응답에 없는 작업은 다른 워커에 넘어갔으므로 결과 보고 불필요)"""
+    renewed = execution_store.heartbeat_jobs(request.worker_id, request.job_ids,
+                                             request.lease_seconds or JOB_LEASE_SECONDS)
+    return {"job_ids": renewed}
+
+@router.post("/jobs/{job_id}/complete", dependencies=[Depends(verify_worker)])
+def complete_job(job_id: int, request: schemas.WorkerJobResult, db: Session = Depends(get_db)):
+    """작업 결과 보고
+
+    lease를 가진 워커의 결과만 기록하고, 기록 후에 완료 처리 (대기 중인 실행이 결과 누락 상태로 마감되지 않도록)
+    """
+    if not execution_store.heartbeat_jobs(request.worker_id, [job_id], JOB_LEASE_SECONDS):
+        raise HTTPException(status_code=409, detail="lease가 만료되었거나 다른 워커가 처리 중인 작업입니다")
+    job = execution_store.get_job(job_id)
+    _record_job(job, {"stdout": request.stdout, "stderr": request.stderr, "returncode": request.returncode,
+                      "usage": request.usage},
+                request.started_at, request.completed_at)
+    execution_store.complete_job(job_id, request.worker_id, failed=request.returncode != 0)
+    _finalize_if_done(db, job["execution_id"])
+    return {"job_id": job_id, "status": "failed" if request.returncode != 0 else "done"}
+
+@router.get("/jobs")
+def get_job_stats():
+    """작업 큐 상태별 개수"""
+    return {"jobs": execution_store.job_stats()}
@@ -1,7 +1,7 @@
 # app/schemas.py
 
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime
 
 # === 호스트 관련 스키마 ===
@@ -22,10 +22,35 @@ class HostRead(HostBase):
     os: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    last_check_at: Optional[datetime] = None
+    last_status: Optional[str] = None
+    last_score: Optional[float] = None
+    last_failed_checks: Optional[int] = None
+    # SSH preflight 결과 (캐시에 있을 때만 채워짐)
+    reachable: Optional[bool] = None
+    reachability_error: Optional[str] = None
+    reachability_checked_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
+class BulkHostRegisterRequest(BaseModel):
+    """호스트 일괄 등록 요청 스키마"""
+    hosts: List[HostCreate]
+
+class BulkHostFailure(BaseModel):
+    """일괄 등록 중 호스트별 실패 정보"""
+    name: Optional[str] = None
+    ip: str
+    error: str
+
+class BulkHostRegisterResponse(BaseModel):
+    """호스트 일괄 등록 결과 스키마"""
+    registered: List[HostRead]
+    rejected: List[BulkHostFailure]        # 등록되지 않은 호스트 (중복 IP 등)
+    detection_failed: List[BulkHostFailure]  # 등록되었지만 OS 감지에 실패한 호스트
+    total: int
+
 class HostUpdate(BaseModel):
     """호스트 업데이트 스키마"""
     name: Optional[str] = None
@@ -38,12 +63,25 @@ class HostCheck(BaseModel):
     ip: str
     username: str
     password: str
+    tuning_profile: Optional[str] = None  # 실행 튜닝 프로필 (기본 활성 프로필)
+
+class FleetCheckRequest(BaseModel):
+    """여러 호스트 OS 그룹별 일괄 점검 요청 스키마"""
+    host_ids: List[int]
+    password: str
+    refresh_os: bool = False  # facts 캐시를 무시하고 OS 재감지
+    tuning_profile: Optional[str] = None
 
 class HostFilter(BaseModel):
-    """호스트 필터링 스키마"""
+    """호스트 필터링 스키마 (name/ip/os는 인덱스를 타는 접두사 검색)"""
     name: Optional[str] = None
     ip: Optional[str] = None
+    ip_network: Optional[str] = None  # CIDR (예: 10.0.0.0/24)
     os: Optional[str] = None
+    last_status: Optional[str] = None
+    min_score: Optional[float] = None
+    max_score: Optional[float] = None
+    min_failed_checks: Optional[int] = None
 
 class HostInfo(BaseModel):
     """호스트 정보 (플레이북용)"""
@@ -88,6 +126,35 @@ class PlaybookExecuteRequest(BaseModel):
     host_ids: List[int]
     section_ids: Optional[List[str]] = None
     password: str
+    tuning_profile: Optional[str] = None  # 실행 튜닝 프로필 (기본 활성 프로필)
+
+class ExecutionRetryRequest(BaseModel):
+    """실패 호스트 재시도/중단 실행 재개 요청 (비밀번호는 저장하지 않으므로 다시 입력)"""
+    password: str
+    max_attempts: Optional[int] = None  # 호스트별 최대 시도 횟수 (기본 RETRY_MAX_ATTEMPTS)
+    tuning_profile: Optional[str] = None  # 지정하지 않으면 처음 실행한 프로필
+
+class WorkerClaimRequest(BaseModel):
+    """원격 워커 작업 요청"""
+    worker_id: str
+    limit: int = 1
+    lease_seconds: Optional[int] = None  # 기본 JOB_LEASE_SECONDS
+
+class WorkerHeartbeatRequest(BaseModel):
+    """원격 워커 lease 연장"""
+    worker_id: str
+    job_ids: List[int]
+    lease_seconds: Optional[int] = None
+
+class WorkerJobResult(BaseModel):
+    """원격 워커 실행 결과 보고"""
+    worker_id: str
+    stdout: str = ""
+    stderr: str = ""
+    returncode: int
+    started_at: datetime
+    completed_at: datetime
+    usage: Optional[Dict[str, Any]] = None  # ansible 프로세스 자원 사용량 (process_usage)
 
 class ExecuteRequest(BaseModel):
     """플레이북 실행 요청 스키마 (레거시)"""
@@ -114,6 +181,7 @@ class ExecutionStatus(BaseModel):
     end_time: Optional[str] = None
     results: Dict[int, ExecutionResult] = {}
     section_ids: Optional[List[str]] = None
+    tuning_profile: Optional[str] = None
     total_hosts: int
     completed_hosts: int
     failed_hosts: int
@@ -161,7 +229,7 @@ class CheckExecutionRead(BaseModel):
     status: str
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
-    duration_seconds: Optional[int] = None
+    duration_seconds: Optional[float] = None
     exit_code: Optional[int] = None
     result_message: Optional[str] = None
 
@@ -316,6 +384,32 @@ class SectionExecuteRequest(BaseModel):
     host_ids: List[int]
     section_ids: List[str]
 
+# === 실행 튜닝 프로필 스키마 ===
+
+class TuningSettings(BaseModel):
+    """실행 튜닝 값 (None이면 ansible 설정을 그대로 사용)"""
+    forks: int = Field(50, ge=1, le=1000)                          # 그룹 점검 ansible-playbook -f
+    strategy: Optional[Literal["linear", "free"]] = None           # ANSIBLE_STRATEGY
+    pipelining: Optional[bool] = None                              # ANSIBLE_PIPELINING (sudoers requiretty 해제 필요)
+    control_persist: Optional[int] = Field(None, ge=0, le=86400)   # SSH ControlPersist 초 (0이면 ControlMaster 끔)
+    connect_timeout: Optional[int] = Field(None, ge=1, le=300)     # ANSIBLE_TIMEOUT (SSH 연결)
+    timeout_factor: float = Field(1.0, gt=0, le=10)                # 이력 기반 호스트 타임아웃 배수
+    max_parallel_hosts: int = Field(1, ge=1, le=1000)              # 플레이북 실행(local 모드) 동시 호스트 수
+    subnet_parallel_cap: int = Field(0, ge=0, le=1000)             # 같은 서브넷 동시 실행 상한 (0이면 제한 없음)
+    subnet_prefix: int = Field(24, ge=8, le=32)                    # 서브넷 상한 기준 prefix 길이
+    executor: Optional[str] = None                                 # 스크립트 실행 백엔드 (기본 CHECK_EXECUTOR)
+    description: Optional[str] = None
+
+class TuningProfile(TuningSettings):
+    """실행 튜닝 프로필 (기본 제공 값 + system_configs 재정의)"""
+    name: str
+    builtin: bool = False
+    overrides: Dict[str, Any] = {}  # system_configs에 저장된 값
+
+class TuningActiveRequest(BaseModel):
+    """기본 튜닝 프로필 변경 요청"""
+    profile: str
+
 # === 응답 메시지 스키마 ===
 
 class MessageResponse(BaseModel):
@@ -0,0 +1,217 @@
+# app/ssh_executor.py
+"""asyncssh 직접 실행 백엔드 (CHECK_EXECUTOR=ssh)
+
+셸 점검 스크립트는 ansible을 거쳐도 결국 SSH 실행 + sudo이므로, 호스트별 SSH 연결을 재사용하면서
+스크립트를 stdin으로 `sudo bash -s`에 보내고 출력을 읽어 옵니다. ansible 프로세스 기동, 모듈 전송,
+임시 디렉토리 생성/삭제가 없어 컨트롤러 CPU와 호스트당 지연이 줄어듭니다.
+
+- asyncio 이벤트 루프를 전용 스레드에서 실행하고, 동기 호출자(실행 스레드풀)는 결과를 기다립니다.
+- 연결은 (ip, port, 계정, 비밀번호 해시)별로 재사용하고 SSH_IDLE_TIMEOUT 동안 쓰지 않으면 닫습니다.
+- sudo 비밀번호 필요 여부는 연결마다 한 번(sudo -n true) 확인해서, 필요할 때만 stdin 첫 줄로 보냅니다.
+  이때는 sudo -k로 캐시된 인증을 무시해 항상 비밀번호를 읽게 합니다 (캐시가 남아 있으면 비밀번호 줄이
+  스크립트의 첫 명령으로 실행되어 stderr에 노출되므로).
+- 연결 시간 초과/실패는 도달 불가(4), 스크립트 시간 초과는 다른 백엔드와 같은 TIMEOUT_EXIT_CODE(124)를 반환합니다.
+- 호스트 키는 확인하지 않습니다 (ansible 인벤토리의 StrictHostKeyChecking=no와 동일).
+- 실행 중인 프로세스가 이 프로세스 안에 없으므로 CPU/RSS 사용량은 기록하지 않습니다 (wall/exit만).
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from app import metrics, tracing
+from app.check_runner import DEFAULT_CHECK_TIMEOUT, ScriptExecutor, build_check_script, take_remote_span
+from app.timeouts import TIMEOUT_EXIT_CODE
+
+try:
+    import asyncssh
+except ImportError:
+    asyncssh = None
+
+SSH_PORT = int(os.environ.get("CHECK_SSH_PORT", "22"))
+SSH_CONNECT_TIMEOUT = 10
+SSH_IDLE_TIMEOUT = 300     # 이 시간 동안 쓰지 않은 연결은 닫음
+SSH_MAX_SESSIONS = 8       # 연결당 동시 실행 채널 수 (sshd MaxSessions 기본값 10)
+READ_CHUNK = 65536
+
+ConnectionKey = Tuple[str, int, str, str]
+
+class SshConnectTimeout(ConnectionError):
+    """SSH 연결 시간 초과 (스크립트 실행 시간 초과와 구분해 도달 불가로 처리)"""
+
+class _Connection:
+    def __init__(self, conn):
+        self.conn = conn
+        self.sessions = asyncio.Semaphore(SSH_MAX_SESSIONS)
+        self.active = 0
+        self.sudo_needs_password: Optional[bool] = None
+        self.last_used = time.monotonic()
+
+    def closed(self) -> bool:
+        return self.conn.is_closed()
+
+async def _read_stream(stream) -> str:
+    """채널 출력을 조각 단위로 읽기 (원격 출력이 끝날 때까지)"""
+    chunks = []
+    while True:
+        chunk = await stream.read(READ_CHUNK)
+        if not chunk:
+            return "".join(chunks)
+        chunks.append(chunk)
+
+class AsyncSshExecutor(ScriptExecutor):
+    name = "ssh"
+
+    def __init__(self, port: int = SSH_PORT):
+        self.port = port
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._connections: Dict[ConnectionKey, _Connection] = {}
+        self._connect_locks: Dict[ConnectionKey, asyncio.Lock] = {}
+
+    def unavailable_reason(self):
+        if asyncssh is None:
+            return "asyncssh 패키지가 설치되어 있지 않습니다 (pip install asyncssh)"
+        return None
+
+    # === 이벤트 루프 / 연결 ===
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="ssh-executor", daemon=True).start()
+                asyncio.run_coroutine_threadsafe(self._close_idle_loop(), self._loop)
+            return self._loop
+
+    def _key(self, ip: str, username: str, password: str) -> ConnectionKey:
+        # 비밀번호가 다른 요청이 이미 인증된 연결을 재사용하지 않도록 키에 포함
+        return (ip, self.port, username, hashlib.sha256((password or "").encode()).hexdigest())
+
+    async def _connection(self, ip: str, username: str, password: str, connect_timeout: float) -> _Connection:
+        key = self._key(ip, username, password)
+        lock = self._connect_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._connections.get(key)
+            if entry is not None and not entry.closed():
+                return entry
+            try:
+                conn = await asyncio.wait_for(
+                    asyncssh.connect(ip, port=self.port, username=username, password=password,
+                                     known_hosts=None, client_keys=None),
+                    connect_timeout
+                )
+            except asyncio.TimeoutError:
+                raise SshConnectTimeout(f"SSH 연결 시간 초과 ({connect_timeout}초)") from None
+            entry = self._connections[key] = _Connection(conn)
+            return entry
+
+    def _drop(self, ip: str, username: str, password: str):
+        entry = self._connections.pop(self._key(ip, username, password), None)
+        if entry is not None:
+            entry.conn.close()
+
+    async def _close_idle_loop(self):
+        while True:
+            await asyncio.sleep(60)
+            now = time.monotonic()
+            for key, entry in list(self._connections.items()):
+                if entry.closed() or (entry.active == 0 and now - entry.last_used > SSH_IDLE_TIMEOUT):
+                    self._connections.pop(key, None)
+                    entry.conn.close()
+
+    # === 실행 ===
+
+    async def _sudo_command(self, entry: _Connection, username: str) -> Tuple[str, bool]:
+        """(원격 명령, stdin 첫 줄에 비밀번호를 보낼지)"""
+        if username == "root":
+            return "bash -s", False
+        if entry.sudo_needs_password is None:
+            check = await entry.conn.run("sudo -n true", check=False)
+            entry.sudo_needs_password = check.exit_status != 0
+        if entry.sudo_needs_password:
+            return "sudo -k -S -p '' bash -s", True
+        return "sudo -n bash -s", False
+
+    async def _execute(self, ip: str, username: str, password: str, script: str,
+                       connect_timeout: float = SSH_CONNECT_TIMEOUT) -> Tuple[int, str, str]:
+        # 끊긴 연결이면 한 번 다시 연결 (아직 스크립트를 보내기 전이므로 중복 실행 없음)
+        for attempt in range(2):
+            entry = await self._connection(ip, username, password, connect_timeout)
+            async with entry.sessions:
+                try:
+                    command, send_password = await self._sudo_command(entry, username)
+                    process = await entry.conn.create_process(command, encoding="utf-8", errors="replace")
+                except (asyncssh.ChannelOpenError, asyncssh.ConnectionLost, ConnectionError):
+                    self._drop(ip, username, password)
+                    if attempt:
+                        raise
+                    continue
+                return await self._communicate(entry, process, password if send_password else None, script)
+
+    async def _communicate(self, entry: _Connection, process, password: Optional[str],
+                           script: str) -> Tuple[int, str, str]:
+        """stdin으로 (sudo 비밀번호 +) 스크립트 전송 후 stdout/stderr를 끝까지 읽기"""
+        entry.active += 1
+        try:
+            if password is not None:
+                process.stdin.write(password + "\n")
+            process.stdin.write(script)
+            process.stdin.write_eof()
+            stdout, stderr = await asyncio.gather(_read_stream(process.stdout), _read_stream(process.stderr))
+            completed = await process.wait()
+            returncode = completed.returncode if completed.returncode is not None else 255
+            return returncode, stdout, stderr
+        finally:
+            # 시간 초과(취소) 시에도 채널을 닫아 원격 bash에 EOF/HUP 전달
+            process.close()
+            entry.active -= 1
+            entry.last_used = time.monotonic()
+
+    def run_script(self, ip, username, password, script_content, host_id=None, hostname=None,
+                   timeout=DEFAULT_CHECK_TIMEOUT, profile=None):
+        # 튜닝 프로필 중 이 백엔드에 해당하는 값은 SSH 연결 타임아웃뿐 (ansible 설정은 무시)
+        connect_timeout = (profile.connect_timeout if profile else None) or SSH_CONNECT_TIMEOUT
+        loop = self._ensure_loop()
+        started = time.monotonic()
+        with metrics.ansible_phase("script"), tracing.span("ssh", port=self.port) as attrs:
+            future = asyncio.run_coroutine_threadsafe(
+                asyncio.wait_for(self._execute(ip, username, password, build_check_script(script_content),
+                                               connect_timeout), timeout),
+                loop
+            )
+            try:
+                returncode, stdout, stderr = future.result()
+            except SshConnectTimeout as e:
+                # TimeoutError보다 먼저 처리 (연결 시간 초과는 도달 불가)
+                return {"stdout": "", "stderr": f"SSH 실행 오류: {e}", "returncode": 4,
+                        "usage": self._usage(started, None)}
+            except (asyncio.TimeoutError, TimeoutError):
+                return {"stdout": "", "stderr": f"스크립트 실행 시간 초과 ({timeout}초)",
+                        "returncode": TIMEOUT_EXIT_CODE, "usage": self._usage(started, None)}
+            except (OSError, asyncssh.Error) as e:
+                # 연결 실패/인증 실패 (ansible의 UNREACHABLE과 같은 종료 코드)
+                return {"stdout": "", "stderr": f"SSH 실행 오류: {e}", "returncode": 4,
+                        "usage": self._usage(started, None)}
+            attrs["returncode"] = returncode
+
+        return {
+            "stdout": stdout,
+            "stderr": take_remote_span(stderr),
+            "returncode": returncode,
+            "usage": self._usage(started, returncode)
+        }
+
+    @staticmethod
+    def _usage(started: float, returncode: Optional[int]) -> Dict:
+        return {"cpu_user_seconds": None, "cpu_system_seconds": None, "max_rss_kb": None,
+                "wall_seconds": round(time.monotonic() - started, 3), "exit_status": returncode}
+
+    def close(self):
+        if self._loop is None:
+            return
+        for entry in list(self._connections.values()):
+            self._loop.call_soon_threadsafe(entry.conn.close)
+        self._connections.clear()
@@ -0,0 +1,124 @@
+# app/timeouts.py
+
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+from app import models, metrics
+
+# 기본값 (system_configs의 같은 키로 재정의 가능)
+TIMEOUT_DEFAULTS = {
+    "check_timeout_default": 300,      # 이력이 부족할 때 사용
+    "check_timeout_floor": 60,
+    "check_timeout_ceiling": 1800,
+    "check_timeout_factor": 2.0,       # p99 x factor
+    "check_timeout_percentile": 0.99,
+    "check_timeout_min_samples": 5,
+    "check_timeout_history": 50,       # (호스트, 플레이북)별 최근 N건
+    "check_timeout_timed_out_factor": 1.5,  # 시간 초과 실행은 실행 시간 x factor를 하한 표본으로 사용
+}
+
+# 모든 실행 백엔드가 시간 초과 시 반환하는 종료 코드 (coreutils timeout과 같은 값)
+TIMEOUT_EXIT_CODE = 124
+TIMEOUT_CACHE_TTL = 300
+
+_cache: Dict[tuple, tuple] = {}  # (host_id, playbook_id) -> (만료 monotonic 시각, 초)
+_cache_lock = threading.Lock()
+
+def timeout_settings(db: Session) -> Dict[str, float]:
+    """타임아웃 설정 (system_configs 값 우선)"""
+    settings = dict(TIMEOUT_DEFAULTS)
+    rows = db.query(models.SystemConfig.config_key, models.SystemConfig.config_value).filter(
+        models.SystemConfig.config_key.in_(TIMEOUT_DEFAULTS)
+    ).all()
+    for key, value in rows:
+        try:
+            settings[key] = type(TIMEOUT_DEFAULTS[key])(float(value))
+        except (TypeError, ValueError):
+            print(f"⚠️ 잘못된 타임아웃 설정 무시: {key}={value}")
+    return settings
+
+def percentile(values: List[float], q: float) -> float:
+    """nearest-rank 백분위수"""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q * len(ordered)))
+    return ordered[rank - 1]
+
+def compute_timeout(durations: List[float], settings: Dict[str, float]) -> int:
+    """실행 시간 이력으로 타임아웃 계산 (floor ~ ceiling 범위)"""
+    if len(durations) < settings["check_timeout_min_samples"]:
+        timeout = settings["check_timeout_default"]
+    else:
+        timeout = percentile(durations, settings["check_timeout_percentile"]) * settings["check_timeout_factor"]
+    timeout = min(max(timeout, settings["check_timeout_floor"]), settings["check_timeout_ceiling"])
+    return int(math.ceil(timeout))
+
+def _duration_history(db: Session, host_ids: List[int], playbook_id: Optional[int],
+                      limit: int, timed_out_factor: float) -> Dict[int, List[float]]:
+    """호스트별 최근 실행 시간 (윈도 함수로 1회 조회)
+
+    완료된 실행과 시간 초과된 실행을 함께 사용하며, 시간 초과 실행은 실제 소요 시간을 알 수 없으므로
+    실행 시간 x timed_out_factor를 하한 표본으로 사용 (시간 초과가 반복되는 호스트의 타임아웃이 늘어나도록)
+    """
+    timed_out = and_(models.CheckExecution.status == "failed",
+                     models.CheckExecution.exit_code == TIMEOUT_EXIT_CODE)
+    ranked = db.query(
+        models.CheckExecution.host_id.label("host_id"),
+        models.CheckExecution.duration_seconds.label("duration"),
+        timed_out.label("timed_out"),
+        func.row_number().over(
+            partition_by=models.CheckExecution.host_id,
+            order_by=models.CheckExecution.started_at.desc()
+        ).label("rn")
+    ).filter(
+        models.CheckExecution.host_id.in_(host_ids),
+        or_(models.CheckExecution.status == "completed", timed_out),
+        models.CheckExecution.duration_seconds.isnot(None),
+        models.CheckExecution.playbook_id == playbook_id if playbook_id is not None
+        else models.CheckExecution.playbook_id.is_(None)
+    ).subquery()
+
+    history: Dict[int, List[float]] = {host_id: [] for host_id in host_ids}
+    for host_id, duration, was_timed_out, _ in db.query(ranked).filter(ranked.c.rn <= limit):
+        history[host_id].append(duration * timed_out_factor if was_timed_out else duration)
+    return history
+
+def get_timeouts(db: Session, host_ids: Iterable[int], playbook_id: Optional[int] = None) -> Dict[int, int]:
+    """호스트별 점검 타임아웃(초) - 플레이북별로 따로 학습, 결과는 잠시 캐시
+
+    playbook_id가 None이면 OS 기본 점검(/inventory/check) 이력 기준
+    """
+    host_ids = list(dict.fromkeys(host_ids))
+    now = time.monotonic()
+    timeouts: Dict[int, int] = {}
+    misses = []
+    with _cache_lock:
+        for host_id in host_ids:
+            entry = _cache.get((host_id, playbook_id))
+            if entry and entry[0] > now:
+                timeouts[host_id] = entry[1]
+            else:
+                misses.append(host_id)
+    metrics.cache_lookup("timeouts", hits=len(timeouts), misses=len(misses))
+
+    if misses:
+        settings = timeout_settings(db)
+        history = _duration_history(db, misses, playbook_id, int(settings["check_timeout_history"]),
+                                    settings["check_timeout_timed_out_factor"])
+        with _cache_lock:
+            for host_id in misses:
+                timeouts[host_id] = compute_timeout(history[host_id], settings)
+                _cache[(host_id, playbook_id)] = (now + TIMEOUT_CACHE_TTL, timeouts[host_id])
+
+    return timeouts
+
+def get_timeout(db: Session, host_id: int, playbook_id: Optional[int] = None) -> int:
+    """단일 호스트 점검 타임아웃(초)"""
+    return get_timeouts(db, [host_id], playbook_id)[host_id]
+
+def clear_cache():
+    """설정 변경 시 캐시 초기화"""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,269 @@
+# app/tracing.py
+"""실행 단계별 트레이스 span
+
+실행 ID가 트레이스 ID가 되고, 호스트/단계는 span 속성으로 기록합니다.
+span은 백그라운드 스레드에서 모아서 내보내므로 실행 경로에서는 큐에 넣는 비용만 듭니다.
+
+TRACE_EXPORTERS (쉼표 구분, 기본 file)
+  file  TRACE_FILE(JSONL)에 기록, /api/traces 워터폴 조회에 사용
+  otlp  TRACE_OTLP_ENDPOINT(OTLP/HTTP JSON, 예: http://collector:4318/v1/traces)로 전송
+  none  비활성화
+"""
+
+import contextvars
+import json
+import os
+import queue
+import secrets
+import socket
+import threading
+import time
+import urllib.request
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+TRACE_EXPORTERS = [name.strip() for name in os.environ.get("TRACE_EXPORTERS", "file").split(",") if name.strip()]
+TRACE_FILE = os.environ.get("TRACE_FILE", "./traces.jsonl")
+TRACE_FILE_MAX_BYTES = 100 * 1024 * 1024   # 초과 시 .1로 교체
+TRACE_OTLP_ENDPOINT = os.environ.get("TRACE_OTLP_ENDPOINT", "http://127.0.0.1:4318/v1/traces")
+TRACE_SERVICE_NAME = os.environ.get("TRACE_SERVICE_NAME", "oneclicksecure")
+TRACE_FLUSH_INTERVAL = 2
+TRACE_BATCH_SIZE = 512
+TRACE_QUEUE_SIZE = 10000                    # 가득 차면 span 버림 (실행을 막지 않음)
+
+# 현재 span 컨텍스트: {"trace_id", "span_id", "attributes"}
+_current: contextvars.ContextVar[Optional[Dict]] = contextvars.ContextVar("trace_span", default=None)
+
+def enabled() -> bool:
+    return bool(TRACE_EXPORTERS) and TRACE_EXPORTERS != ["none"]
+
+def trace_id_for(execution_id: Optional[str]) -> str:
+    """실행 ID → 트레이스 ID (UUID는 그대로, 그 외는 해시)"""
+    if not execution_id:
+        return secrets.token_hex(16)
+    try:
+        return uuid.UUID(execution_id).hex
+    except ValueError:
+        return uuid.uuid5(uuid.NAMESPACE_URL, execution_id).hex
+
+def current_trace_id() -> Optional[str]:
+    context = _current.get()
+    return context["trace_id"] if context else None
+
+@contextmanager
+def span(name: str, execution_id: Optional[str] = None, **attributes):
+    """단계 span (상위 span의 실행/호스트 속성을 상속)
+
+    execution_id를 주면 새 트레이스의 루트로 시작, 진행 중인 트레이스가 없으면 기록하지 않음
+    """
+    parent = _current.get()
+    if not enabled() or (parent is None and execution_id is None):
+        yield {}
+        return
+
+    inherited = dict(parent["attributes"]) if parent and execution_id is None else {}
+    if execution_id is not None:
+        inherited["execution_id"] = execution_id
+    inherited.update({key: value for key, value in attributes.items() if key in ("host_id", "host")})
+
+    record = {
+        "trace_id": parent["trace_id"] if parent and execution_id is None else trace_id_for(execution_id),
+        "span_id": secrets.token_hex(8),
+        "parent_span_id": parent["span_id"] if parent and execution_id is None else None,
+        "name": name,
+        "start_ns": time.time_ns(),
+        "attributes": {**inherited, **attributes, "phase": attributes.get("phase", name)},
+        "status": "ok",
+        "error": None
+    }
+    token = _current.set({"trace_id": record["trace_id"], "span_id": record["span_id"], "attributes": inherited})
+    try:
+        yield record["attributes"]
+    except BaseException as e:
+        record["status"] = "error"
+        record["error"] = str(e)[:500]
+        raise
+    finally:
+        _current.reset(token)
+        record["end_ns"] = time.time_ns()
+        _processor.submit(record)
+
+def record_span(name: str, start_ns: int, end_ns: int, **attributes):
+    """이미 끝난 구간을 현재 span의 하위로 기록 (원격에서 측정한 시간 등)"""
+    parent = _current.get()
+    if not enabled() or parent is None:
+        return
+    _processor.submit({
+        "trace_id": parent["trace_id"],
+        "span_id": secrets.token_hex(8),
+        "parent_span_id": parent["span_id"],
+        "name": name,
+        "start_ns": start_ns,
+        "end_ns": end_ns,
+        "attributes": {**parent["attributes"], **attributes, "phase": attributes.get("phase", name)},
+        "status": "ok",
+        "error": None
+    })
+
+# === 내보내기 ===
+
+def _export_file(spans: List[Dict]):
+    try:
+        if os.path.exists(TRACE_FILE) and os.path.getsize(TRACE_FILE) > TRACE_FILE_MAX_BYTES:
+            os.replace(TRACE_FILE, TRACE_FILE + ".1")
+    except OSError:
+        pass
+    # 한 번의 write로 추가 (여러 워커가 같은 파일에 써도 줄 단위로 섞이지 않도록 O_APPEND)
+    data = "".join(json.dumps(item, ensure_ascii=False, default=str) + "\n" for item in spans)
+    with open(TRACE_FILE, "a", encoding="utf-8") as f:
+        f.write(data)
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def _export_otlp(spans: List[Dict]):
+    body = {"resourceSpans": [{
+        "resource": {"attributes": [
+            {"key": "service.name", "value": {"stringValue": TRACE_SERVICE_NAME}},
+            {"key": "host.name", "value": {"stringValue": socket.gethostname()}}
+        ]},
+        "scopeSpans": [{
+            "scope": {"name": "app.tracing"},
+            "spans": [{
+                "traceId": item["trace_id"],
+                "spanId": item["span_id"],
+                **({"parentSpanId": item["parent_span_id"]} if item["parent_span_id"] else {}),
+                "name": item["name"],
+                "kind": 1,
+                "startTimeUnixNano": str(item["start_ns"]),
+                "endTimeUnixNano": str(item["end_ns"]),
+                "attributes": [{"key": key, "value": _otlp_value(value)}
+                               for key, value in item["attributes"].items() if value is not None],
+                "status": {"code": 2, "message": item["error"]} if item["status"] == "error" else {"code": 1}
+            } for item in spans]
+        }]
+    }]}
+    request = urllib.request.Request(
+        TRACE_OTLP_ENDPOINT, data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"}, method="POST"
+    )
+    with urllib.request.urlopen(request, timeout=5):
+        pass
+
+_EXPORTERS = {"file": _export_file, "otlp": _export_otlp}
+
+class _BatchProcessor:
+    """span을 모아서 주기적으로 내보내는 백그라운드 스레드"""
+
+    def __init__(self):
+        self._queue: "queue.Queue[Dict]" = queue.Queue(TRACE_QUEUE_SIZE)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self.dropped = 0
+
+    def submit(self, record: Dict):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+                self._thread.start()
+
+    def _drain(self) -> List[Dict]:
+        batch = []
+        while len(batch) < TRACE_BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def flush(self):
+        """대기 중인 span 즉시 내보내기"""
+        with self._flush_lock:
+            while True:
+                batch = self._drain()
+                if not batch:
+                    return
+                for name in TRACE_EXPORTERS:
+                    exporter = _EXPORTERS.get(name)
+                    if exporter is None:
+                        continue
+                    try:
+                        exporter(batch)
+                    except Exception as e:
+                        print(f"⚠️ 트레이스 내보내기 실패 ({name}): {e}")
+
+    def _run(self):
+        while True:
+            time.sleep(TRACE_FLUSH_INTERVAL)
+            self.flush()
+
+_processor = _BatchProcessor()
+
+def flush():
+    _processor.flush()
+
+# === 워터폴 조회 ===
+
+def load_trace(execution_id: str) -> List[Dict]:
+    """TRACE_FILE에서 실행의 span 조회 (교체된 .1 파일 포함)"""
+    trace_id = trace_id_for(execution_id)
+    needle = f'"trace_id": "{trace_id}"'
+    spans = []
+    for path in (TRACE_FILE + ".1", TRACE_FILE):
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if needle in line:
+                    try:
+                        spans.append(json.loads(line))
+                    except ValueError:
+                        continue
+    return spans
+
+def waterfall(spans: List[Dict]) -> Dict:
+    """span 목록 → 시작 시각 기준 워터폴 (깊이/오프셋/소요 시간 ms)"""
+    if not spans:
+        return {"trace_id": None, "duration_ms": 0, "spans": []}
+    by_id = {item["span_id"]: item for item in spans}
+
+    def depth(item):
+        level = 0
+        parent = by_id.get(item["parent_span_id"])
+        while parent is not None and level < 50:
+            level += 1
+            parent = by_id.get(parent["parent_span_id"])
+        return level
+
+    origin = min(item["start_ns"] for item in spans)
+    end = max(item["end_ns"] for item in spans)
+    rows = [{
+        "span_id": item["span_id"],
+        "parent_span_id": item["parent_span_id"],
+        "name": item["name"],
+        "depth": depth(item),
+        "offset_ms": round((item["start_ns"] - origin) / 1e6, 1),
+        "duration_ms": round((item["end_ns"] - item["start_ns"]) / 1e6, 1),
+        "host_id": item["attributes"].get("host_id"),
+        "phase": item["attributes"].get("phase"),
+        "status": item["status"],
+        "error": item["error"],
+        "attributes": item["attributes"]
+    } for item in sorted(spans, key=lambda item: (item["start_ns"], item["end_ns"]))]
+    return {"trace_id": spans[0]["trace_id"], "duration_ms": round((end - origin) / 1e6, 1), "spans": rows}
@@ -0,0 +1,238 @@
+# app/tuning.py
+"""실행 튜닝 프로필 (system_configs 기반 설정 계층)
+
+프로필은 실행 엔진 설정 묶음입니다 (forks, strategy, pipelining, ControlPersist, 동시 호스트 수, 서브넷 상한 등).
+기본 제공 프로필(BUILTIN_PROFILES) 위에 system_configs의 "tuning.profile.<이름>" 값(JSON)을 덮어쓰고,
+실행 요청에서 프로필을 지정하지 않으면 "tuning.active_profile" 프로필을 사용합니다.
+
+설정은 TUNING_CACHE_TTL 동안 캐시하고 만료되면 다시 읽으므로 재시작 없이 반영됩니다
+(이 프로세스에서 API로 바꾸면 즉시, 다른 uvicorn 워커는 TTL 이내). 진행 중인 실행은 시작할 때의 값을 유지합니다.
+"""
+
+import ipaddress
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from app import crud, models
+from app.database import SessionLocal
+from app.schemas import TuningProfile, TuningSettings
+
+PROFILE_CONFIG_PREFIX = "tuning.profile."
+ACTIVE_PROFILE_KEY = "tuning.active_profile"
+DEFAULT_PROFILE = "default"
+TUNING_CACHE_TTL = float(os.environ.get("TUNING_CACHE_TTL", "15"))
+
+# 기본 제공 프로필 (default는 기존 동작과 같음, 값은 system_configs로 재정의 가능)
+BUILTIN_PROFILES: Dict[str, Dict] = {
+    DEFAULT_PROFILE: {
+        "description": "기존 동작 (ansible 설정 그대로, 플레이북은 호스트 순차 실행)"
+    },
+    "interactive": {
+        "forks": 20,
+        "strategy": "free",
+        "pipelining": True,
+        "control_persist": 120,
+        "connect_timeout": 5,
+        "max_parallel_hosts": 8,
+        "description": "소수 호스트 즉시 점검 (짧은 연결 타임아웃, 호스트 병렬 실행)"
+    },
+    "overnight-fleet": {
+        "forks": 100,
+        "strategy": "free",
+        "pipelining": True,
+        "control_persist": 600,
+        "connect_timeout": 30,
+        "timeout_factor": 2.0,
+        "max_parallel_hosts": 32,
+        "subnet_parallel_cap": 8,
+        "description": "야간 전체 점검 (높은 병렬도, 서브넷별 동시 실행 상한, 넉넉한 타임아웃)"
+    },
+}
+
+_cache = {"expires": 0.0, "profiles": {}, "active": DEFAULT_PROFILE}
+_cache_lock = threading.Lock()
+
+# === 조회 ===
+
+def _build(name: str, overrides: Dict) -> TuningProfile:
+    """기본 제공 값 + 재정의 값으로 프로필 생성 (값 검증 실패 시 ValidationError)"""
+    values = {**BUILTIN_PROFILES.get(name, {}), **overrides}
+    return TuningProfile(name=name, builtin=name in BUILTIN_PROFILES, overrides=overrides, **values)
+
+def _load(db: Session) -> Tuple[Dict[str, TuningProfile], str]:
+    """system_configs에서 프로필과 활성 프로필 읽기 (잘못된 값은 경고 후 무시)"""
+    rows = db.query(models.SystemConfig.config_key, models.SystemConfig.config_value).filter(
+        models.SystemConfig.config_key.like("tuning.%")
+    ).all()
+    overrides: Dict[str, Dict] = {name: {} for name in BUILTIN_PROFILES}
+    active = DEFAULT_PROFILE
+    for key, value in rows:
+        if key == ACTIVE_PROFILE_KEY:
+            active = value or DEFAULT_PROFILE
+        elif key.startswith(PROFILE_CONFIG_PREFIX):
+            try:
+                overrides[key[len(PROFILE_CONFIG_PREFIX):]] = json.loads(value or "{}")
+            except ValueError:
+                print(f"⚠️ 잘못된 튜닝 프로필 설정 무시: {key}")
+
+    profiles: Dict[str, TuningProfile] = {}
+    for name, values in overrides.items():
+        try:
+            profiles[name] = _build(name, values)
+        except (ValidationError, TypeError) as e:
+            print(f"⚠️ 잘못된 튜닝 프로필 설정 무시: {name} ({e})")
+            if name in BUILTIN_PROFILES:
+                profiles[name] = _build(name, {})
+    if active not in profiles:
+        print(f"⚠️ 활성 튜닝 프로필을 찾을 수 없어 {DEFAULT_PROFILE} 사용: {active}")
+        active = DEFAULT_PROFILE
+    return profiles, active
+
+def _snapshot(force: bool = False) -> Tuple[Dict[str, TuningProfile], str]:
+    """캐시된 (프로필, 활성 프로필 이름), 만료 시 다시 읽음"""
+    now = time.monotonic()
+    with _cache_lock:
+        if not force and _cache["expires"] > now:
+            return _cache["profiles"], _cache["active"]
+
+    db = SessionLocal()
+    try:
+        profiles, active = _load(db)
+    except Exception as e:
+        # DB를 읽을 수 없으면 기본 제공 값으로 실행 (다음 TTL에 다시 시도)
+        print(f"⚠️ 튜닝 프로필 조회 실패, 기본 제공 값 사용: {e}")
+        profiles, active = {name: _build(name, {}) for name in BUILTIN_PROFILES}, DEFAULT_PROFILE
+    finally:
+        db.close()
+
+    with _cache_lock:
+        _cache.update(expires=now + TUNING_CACHE_TTL, profiles=profiles, active=active)
+    return profiles, active
+
+def invalidate():
+    """설정 변경 시 캐시 초기화 (다음 조회에서 다시 읽음)"""
+    with _cache_lock:
+        _cache["expires"] = 0.0
+
+def list_profiles() -> Tuple[List[TuningProfile], str]:
+    """전체 프로필 목록과 활성 프로필 이름"""
+    profiles, active = _snapshot()
+    return list(profiles.values()), active
+
+def get_profile(name: Optional[str] = None) -> TuningProfile:
+    """이름으로 프로필 조회 (None이면 활성 프로필, 없으면 KeyError)"""
+    profiles, active = _snapshot()
+    name = name or active
+    if name not in profiles:
+        raise KeyError(f"튜닝 프로필을 찾을 수 없습니다: {name} (사용 가능: {', '.join(profiles)})")
+    return profiles[name]
+
+# === 변경 ===
+
+def save_profile(db: Session, name: str, settings: TuningSettings) -> TuningProfile:
+    """프로필 저장 (요청에 포함된 값만 재정의, 나머지는 기본 제공 값)"""
+    from app.check_runner import SCRIPT_EXECUTORS
+
+    overrides = settings.model_dump(exclude_unset=True)
+    if overrides.get("executor") and overrides["executor"] not in SCRIPT_EXECUTORS:
+        raise ValueError(f"알 수 없는 실행 백엔드입니다: {overrides['executor']} "
+                         f"(사용 가능: {', '.join(SCRIPT_EXECUTORS)})")
+    profile = _build(name, overrides)
+    saved = crud.set_config(db, PROFILE_CONFIG_PREFIX + name, json.dumps(overrides, ensure_ascii=False),
+                            "json", f"실행 튜닝 프로필 {name}")
+    if saved is None:
+        raise RuntimeError(f"튜닝 프로필 저장 실패: {name}")
+    invalidate()
+    return profile
+
+def delete_profile(db: Session, name: str) -> bool:
+    """프로필 재정의 삭제 (기본 제공 프로필은 기본값으로 복원, 활성 프로필은 삭제 불가)"""
+    if name == get_profile().name and name not in BUILTIN_PROFILES:
+        raise ValueError(f"활성 프로필은 삭제할 수 없습니다: {name}")
+    deleted = crud.delete_config(db, PROFILE_CONFIG_PREFIX + name)
+    invalidate()
+    return deleted
+
+def set_active_profile(db: Session, name: str) -> TuningProfile:
+    """실행 요청에서 지정하지 않았을 때 쓸 프로필 변경"""
+    profiles, _ = _snapshot(force=True)
+    if name not in profiles:
+        raise KeyError(f"튜닝 프로필을 찾을 수 없습니다: {name}")
+    if crud.set_config(db, ACTIVE_PROFILE_KEY, name, "string", "기본 실행 튜닝 프로필") is None:
+        raise RuntimeError(f"활성 튜닝 프로필 저장 실패: {name}")
+    invalidate()
+    return profiles[name]
+
+# === 실행 엔진 적용 ===
+
+def ansible_env(profile: Optional[TuningProfile]) -> Dict[str, str]:
+    """프로필의 ansible 환경 변수 (None인 값은 ansible.cfg/환경 설정 그대로)"""
+    env: Dict[str, str] = {}
+    if profile is None:
+        return env
+    if profile.strategy:
+        env["ANSIBLE_STRATEGY"] = profile.strategy
+    if profile.pipelining is not None:
+        env["ANSIBLE_PIPELINING"] = "True" if profile.pipelining else "False"
+    if profile.control_persist is not None:
+        env["ANSIBLE_SSH_ARGS"] = (f"-C -o ControlMaster=auto -o ControlPersist={profile.control_persist}s"
+                                   if profile.control_persist else "-C -o ControlMaster=no")
+    if profile.connect_timeout:
+        env["ANSIBLE_TIMEOUT"] = str(profile.connect_timeout)
+    return env
+
+def scale_timeout(timeout: int, profile: Optional[TuningProfile]) -> int:
+    """이력 기반 타임아웃에 프로필 배수 적용"""
+    if profile is None or profile.timeout_factor == 1:
+        return timeout
+    return int(math.ceil(timeout * profile.timeout_factor))
+
+def scale_timeouts(host_timeouts: Dict[int, int], profile: Optional[TuningProfile]) -> Dict[int, int]:
+    return {host_id: scale_timeout(timeout, profile) for host_id, timeout in host_timeouts.items()}
+
+class SubnetLimiter:
+    """같은 서브넷 호스트의 동시 실행 수 제한 (cap이 0이면 제한 없음, IPv4만 적용)"""
+
+    def __init__(self, cap: int, prefix: int = 24):
+        self.cap = cap
+        self.prefix = prefix
+        self._slots: Dict[str, threading.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def subnet(self, ip: Optional[str]) -> Optional[str]:
+        try:
+            address = ipaddress.ip_address(ip)
+        except (TypeError, ValueError):
+            return None
+        if address.version != 4:
+            return None
+        return str(ipaddress.ip_network(f"{address}/{self.prefix}", strict=False))
+
+    def order(self, hosts: List, ip=lambda host: host.ip) -> List:
+        """서브넷별로 번갈아 배치 (한 서브넷 호스트가 앞에 몰려 실행 스레드가 상한 대기로 막히지 않도록)"""
+        if not self.cap:
+            return list(hosts)
+        buckets: Dict[Optional[str], List] = {}
+        for host in hosts:
+            buckets.setdefault(self.subnet(ip(host)), []).append(host)
+        ordered = []
+        for index in range(max((len(bucket) for bucket in buckets.values()), default=0)):
+            ordered.extend(bucket[index] for bucket in buckets.values() if index < len(bucket))
+        return ordered
+
+    @contextmanager
+    def slot(self, ip: Optional[str]):
+        subnet = self.subnet(ip) if self.cap else None
+        if subnet is None:
+            yield
+            return
+        with self._lock:
+            semaphore = self._slots.setdefault(subnet, threading.Semaphore(self.cap))
+        with semaphore:
+            yield
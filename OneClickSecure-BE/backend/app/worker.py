@@ -0,0 +1,187 @@
+# app/worker.py
+"""원격 실행 워커 (EXECUTION_MODE=queue)
+
+API 서버의 작업 큐에서 호스트별 작업을 lease로 가져가 ansible로 실행하고 결과를 보고합니다.
+여러 서버에서 같은 API를 바라보도록 띄우면 처리량이 늘어나고, 워커가 종료되면
+lease 만료 후 다른 워커가 작업을 이어받습니다.
+
+    python -m app.worker --api http://api-server:8000 --concurrency 4
+"""
+
+import argparse
+import json
+import os
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.check_runner import run_custom_script
+from app.schemas import TuningProfile
+from app import job_secrets, tracing
+
+DEFAULT_API_URL = os.environ.get("WORKER_API_URL", "http://127.0.0.1:8000")
+DEFAULT_CONCURRENCY = 4
+DEFAULT_LEASE_SECONDS = 120
+IDLE_POLL_INTERVAL = 2      # 작업이 없을 때 대기 (초)
+ERROR_BACKOFF_MAX = 30      # API 연결 실패 시 최대 대기 (초)
+
+class WorkerClient:
+    """API 서버 작업 큐 클라이언트 (urllib만 사용)"""
+
+    def __init__(self, api_url: str, token: Optional[str] = None, timeout: float = 30):
+        self.api_url = api_url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+
+    def _post(self, path: str, body: Dict) -> Dict:
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["X-Worker-Token"] = self.token
+        request = urllib.request.Request(
+            f"{self.api_url}/api/workers{path}",
+            data=json.dumps(body, ensure_ascii=False).encode("utf-8"),
+            headers=headers,
+            method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def claim(self, worker_id: str, limit: int, lease_seconds: int) -> List[Dict]:
+        return self._post("/claim", {"worker_id": worker_id, "limit": limit,
+                                     "lease_seconds": lease_seconds})["jobs"]
+
+    def heartbeat(self, worker_id: str, job_ids: List[int], lease_seconds: int) -> List[int]:
+        return self._post("/heartbeat", {"worker_id": worker_id, "job_ids": job_ids,
+                                         "lease_seconds": lease_seconds})["job_ids"]
+
+    def complete(self, job_id: int, worker_id: str, result: Dict, started_at: datetime, completed_at: datetime):
+        return self._post(f"/jobs/{job_id}/complete", {
+            "worker_id": worker_id,
+            "stdout": result.get("stdout", ""),
+            "stderr": result.get("stderr", ""),
+            "returncode": result.get("returncode", 1),
+            "started_at": started_at.isoformat(),
+            "completed_at": completed_at.isoformat(),
+            "usage": result.get("usage")
+        })
+
+class Worker:
+    """작업 가져오기 루프 + 실행 스레드풀 + lease heartbeat 스레드"""
+
+    def __init__(self, client: WorkerClient, concurrency: int = DEFAULT_CONCURRENCY,
+                 lease_seconds: int = DEFAULT_LEASE_SECONDS, worker_id: Optional[str] = None):
+        self.client = client
+        self.concurrency = concurrency
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._active: Dict[int, Dict] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def run_job(self, job: Dict):
+        """작업 1건 실행 후 결과 보고"""
+        payload = job["payload"]
+        started_at = datetime.now()
+        try:
+            print(f"🖥️ [{self.worker_id}] 작업 {job['job_id']}: {payload['hostname']}({payload['ip']}) "
+                  f"실행 중... (시도 {payload['attempt']})")
+            with tracing.span("host", execution_id=job["execution_id"], host_id=job["host_id"],
+                              host=payload["hostname"], worker=self.worker_id, job_id=job["job_id"]):
+                result = run_custom_script(
+                    ip=payload["ip"],
+                    username=payload["username"],
+                    password=job_secrets.decrypt(job["secret"]) if job.get("secret_encrypted") else job["secret"],
+                    script_content=payload["script_content"],
+                    host_id=job["host_id"],
+                    hostname=payload["hostname"],
+                    timeout=payload["timeout"],
+                    profile=TuningProfile(**payload["tuning"]) if payload.get("tuning") else None
+                )
+        except Exception as e:
+            result = {"stdout": "", "stderr": f"실행 오류: {e}", "returncode": 1}
+
+        try:
+            self.client.complete(job["job_id"], self.worker_id, result, started_at, datetime.now())
+        except urllib.error.HTTPError as e:
+            if e.code == 409:
+                print(f"⚠️ [{self.worker_id}] 작업 {job['job_id']} lease 만료, 결과 폐기")
+            else:
+                print(f"❌ [{self.worker_id}] 작업 {job['job_id']} 결과 보고 실패: {e}")
+        except Exception as e:
+            # 보고하지 못한 작업은 lease 만료 후 다른 워커가 다시 실행
+            print(f"❌ [{self.worker_id}] 작업 {job['job_id']} 결과 보고 실패: {e}")
+        finally:
+            with self._lock:
+                self._active.pop(job["job_id"], None)
+
+    def _heartbeat_loop(self):
+        """lease의 1/3 주기로 실행 중인 작업 lease 연장"""
+        while not self._stop.wait(self.lease_seconds / 3):
+            with self._lock:
+                job_ids = list(self._active)
+            if not job_ids:
+                continue
+            try:
+                renewed = set(self.client.heartbeat(self.worker_id, job_ids, self.lease_seconds))
+                lost = [job_id for job_id in job_ids if job_id not in renewed]
+                if lost:
+                    print(f"⚠️ [{self.worker_id}] lease를 잃은 작업: {lost}")
+            except Exception as e:
+                print(f"❌ [{self.worker_id}] heartbeat 실패: {e}")
+
+    def serve(self):
+        """종료 신호 전까지 작업 처리"""
+        print(f"🚀 워커 시작: {self.worker_id} → {self.client.api_url} (동시 {self.concurrency})")
+        threading.Thread(target=self._heartbeat_loop, daemon=True).start()
+        backoff = IDLE_POLL_INTERVAL
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while not self._stop.is_set():
+                with self._lock:
+                    free = self.concurrency - len(self._active)
+                if free <= 0:
+                    time.sleep(0.2)
+                    continue
+                try:
+                    jobs = self.client.claim(self.worker_id, free, self.lease_seconds)
+                    backoff = IDLE_POLL_INTERVAL
+                except Exception as e:
+                    print(f"❌ [{self.worker_id}] 작업 요청 실패: {e} ({backoff}초 후 재시도)")
+                    self._stop.wait(backoff)
+                    backoff = min(backoff * 2, ERROR_BACKOFF_MAX)
+                    continue
+                if not jobs:
+                    self._stop.wait(IDLE_POLL_INTERVAL)
+                    continue
+                with self._lock:
+                    for job in jobs:
+                        self._active[job["job_id"]] = job
+                for job in jobs:
+                    pool.submit(self.run_job, job)
+
+    def stop(self):
+        self._stop.set()
+
+def main():
+    parser = argparse.ArgumentParser(description="OneClickSecure 원격 실행 워커")
+    parser.add_argument("--api", default=DEFAULT_API_URL, help="API 서버 주소")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시 실행 작업 수")
+    parser.add_argument("--lease", type=int, default=DEFAULT_LEASE_SECONDS, help="작업 lease 시간 (초)")
+    parser.add_argument("--worker-id", default=None, help="워커 ID (기본 hostname:pid)")
+    args = parser.parse_args()
+
+    worker = Worker(WorkerClient(args.api, os.environ.get("WORKER_TOKEN")),
+                    args.concurrency, args.lease, args.worker_id)
+    try:
+        worker.serve()
+    except KeyboardInterrupt:
+        worker.stop()
+        print(f"🛑 워커 종료: {worker.worker_id}")
+    finally:
+        tracing.flush()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""셸 점검 스크립트 실행 백엔드 비교 (ansible-cli / ansible-runner / ssh)
+
+로컬 sshd 대역(ssh_standin.py)을 띄우고 같은 점검 스크립트를 백엔드별로 반복 실행해서
+호스트당 지연, 처리량, 컨트롤러 CPU를 비교합니다. 대역 대신 실제 서버를 지정할 수도 있습니다.
+
+    python benchmarks/executor_bench.py --runs 50 --concurrency 1,8
+    python benchmarks/executor_bench.py --executors ssh --target 10.0.0.5:22 --user ubuntu --password ...
+
+측정 항목
+  first          백엔드 첫 실행 시간 (SSH 연결 수립, ansible 워커 준비 등 포함, 통계에서는 제외)
+  p50/p95        실행 1회 소요 시간
+  runs/s         동시 실행 수 기준 처리량
+  cpu/run        실행 1회당 컨트롤러 CPU (이 프로세스 + ansible 자식 프로세스 + 실행 풀 워커)
+  ok             종료 코드 0이고 모든 항목 결과가 파싱된 비율
+
+ansible 백엔드로 대역에 접속하려면 ansible과 sshpass(비밀번호 인증)가 필요합니다.
+ssh 백엔드와 대역에는 asyncssh가 필요합니다. 사용할 수 없는 백엔드는 사유를 출력하고 건너뜁니다.
+"""
+
+import argparse
+import atexit
+import getpass
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STANDIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ssh_standin.py")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+POOL_WARMUP_TIMEOUT = 60
+RUN_TIMEOUT = 120
+
+# === 대상 ===
+
+def start_standin(password: str):
+    """sshd 대역을 빈 포트로 실행, (프로세스, 포트) 반환"""
+    process = subprocess.Popen([sys.executable, STANDIN, "--port", "0", "--password", password],
+                               stdout=subprocess.PIPE, text=True)
+    atexit.register(process.kill)
+    line = process.stdout.readline()
+    if not line.startswith("ssh-standin listening"):
+        raise RuntimeError(f"sshd 대역 시작 실패 (종료 코드 {process.poll()})")
+    return process, int(line.rsplit(":", 1)[1])
+
+def check_script(sections: int) -> str:
+    """부작용 없는 합성 점검 스크립트 (실제 스크립트처럼 머리글 후 항목마다 결과 1줄)"""
+    lines = ['echo "=== 점검 시작 ==="']
+    for code in range(1, sections + 1):
+        lines += [f"u_{code:02d}() {{", f'\techo "U-{code:02d},{"양호" if code % 5 else "취약"}"', "}"]
+    lines += [f"u_{code:02d}" for code in range(1, sections + 1)]
+    return "\n".join(lines) + "\n"
+
+# === CPU ===
+
+def _proc_cpu(pid: int) -> float:
+    """프로세스 자신 + 회수한 자식 프로세스 CPU 시간 (초)"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return 0.0
+    return sum(int(value) for value in fields[11:15]) / CLOCK_TICKS
+
+def controller_cpu(exclude_pids) -> float:
+    """이 프로세스 + 회수한 자식 + 아직 실행 중인 직계 자식(실행 풀 워커 등)의 CPU 시간"""
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    reaped = resource.getrusage(resource.RUSAGE_CHILDREN)
+    total = own.ru_utime + own.ru_stime + reaped.ru_utime + reaped.ru_stime
+    me = str(os.getpid())
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit() or int(entry) in exclude_pids:
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                parent = f.read().rsplit(")", 1)[1].split()[1]
+        except OSError:
+            continue
+        if parent == me:
+            total += _proc_cpu(int(entry))
+    return total
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+# === 측정 ===
+
+def wait_for_pool(ansible_pool):
+    """실행 풀 워커가 준비될 때까지 대기 (ansible 미설치면 바로 반환)"""
+    deadline = time.monotonic() + POOL_WARMUP_TIMEOUT
+    while time.monotonic() < deadline and ansible_pool.pool.enabled:
+        stats = ansible_pool.pool.stats()
+        if stats["idle"] and not stats["starting"]:
+            return
+        time.sleep(0.2)
+
+def bench_executor(check_runner, check_bitset, name: str, target: Dict, script: str, sections: int,
+                   runs: int, concurrency: int, exclude_pids) -> Dict:
+    def run_once():
+        started = time.perf_counter()
+        result = check_runner.run_custom_script(target["ip"], target["user"], target["password"], script,
+                                                timeout=RUN_TIMEOUT, executor=name)
+        elapsed = time.perf_counter() - started
+        ok = result["returncode"] == 0 and len(check_bitset.parse_check_outcomes(result["stdout"])) == sections
+        return elapsed, ok, result
+
+    cpu_before = controller_cpu(exclude_pids)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(lambda _: run_once(), range(runs)))
+    wall = time.perf_counter() - started
+    cpu = controller_cpu(exclude_pids) - cpu_before
+
+    durations = sorted(sample[0] for sample in samples)
+    failures = [sample[2] for sample in samples if not sample[1]]
+    return {
+        "executor": name,
+        "concurrency": concurrency,
+        "runs": runs,
+        "p50_ms": round(percentile(durations, 50) * 1000, 1),
+        "p95_ms": round(percentile(durations, 95) * 1000, 1),
+        "runs_per_second": round(runs / wall, 2),
+        "cpu_per_run_ms": round(cpu / runs * 1000, 1),
+        "ok_ratio": round(1 - len(failures) / runs, 3),
+        "sample_error": (failures[0]["stderr"] or failures[0]["stdout"])[:300] if failures else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="OneClickSecure 스크립트 실행 백엔드 벤치마크")
+    parser.add_argument("--executors", default="ansible-cli,ansible-runner,ssh", help="쉼표로 구분")
+    parser.add_argument("--runs", type=int, default=30, help="백엔드/동시 실행 수 조합마다 실행 횟수")
+    parser.add_argument("--concurrency", default="1,8", help="동시 실행 수 목록 (쉼표로 구분)")
+    parser.add_argument("--sections", type=int, default=72, help="합성 점검 스크립트 항목 수")
+    parser.add_argument("--target", default=None, help="host:port (지정하지 않으면 로컬 sshd 대역 실행)")
+    parser.add_argument("--user", default=getpass.getuser())
+    parser.add_argument("--password", default="bench")
+    parser.add_argument("--no-pool", action="store_true", help="ansible 실행 풀을 끄고 측정 (매번 새 프로세스)")
+    parser.add_argument("--json", dest="json_path", default=None, help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+    if args.json_path:
+        args.json_path = os.path.abspath(args.json_path)
+
+    standin_pid = None
+    if args.target:
+        host, port = args.target.rsplit(":", 1)
+    else:
+        standin, port = start_standin(args.password)
+        host, standin_pid = "127.0.0.1", standin.pid
+        print(f"🔌 sshd 대역: 127.0.0.1:{port}")
+
+    # app import 전에 환경 구성 (결과 디렉토리 등은 임시 작업 디렉토리, 포트는 대상에 맞춤)
+    workdir = tempfile.mkdtemp(prefix="executor_bench_")
+    atexit.register(shutil.rmtree, workdir, ignore_errors=True)
+    os.environ.update({
+        "CHECK_PLAYBOOK_DIR": workdir,
+        "CHECK_SSH_PORT": str(port),
+        "ANSIBLE_REMOTE_PORT": str(port),
+        "ANSIBLE_HOST_KEY_CHECKING": "False",
+        "TRACE_EXPORTERS": "none",
+    })
+    if args.no_pool:
+        os.environ["EXECUTOR_POOL_SIZE"] = "0"
+    os.chdir(workdir)
+    sys.path.insert(0, BACKEND_DIR)
+    from app import ansible_pool, check_bitset, check_runner
+
+    target = {"ip": host, "user": args.user, "password": args.password}
+    script = check_script(args.sections)
+    exclude_pids = {standin_pid} if standin_pid else set()
+    check_runner.prewarm_executor_pool()
+
+    results = []
+    print(f"{'executor':<16} {'conc':>4} {'first':>9} {'p50':>9} {'p95':>9} {'runs/s':>8} {'cpu/run':>9} {'ok':>6}")
+    for name in [name.strip() for name in args.executors.split(",") if name.strip()]:
+        executor = check_runner.get_script_executor(name)
+        reason = executor.unavailable_reason()
+        if reason:
+            print(f"{name:<16} 건너뜀: {reason}")
+            continue
+        if name == "ansible-cli":
+            wait_for_pool(ansible_pool)
+        started = time.perf_counter()
+        first = check_runner.run_custom_script(host, args.user, args.password, script,
+                                               timeout=RUN_TIMEOUT, executor=name)
+        first_ms = (time.perf_counter() - started) * 1000
+        if first["returncode"] != 0:
+            print(f"{name:<16} 건너뜀: 첫 실행 실패 ({first['returncode']}) {(first['stderr'] or '')[:200]}")
+            continue
+        for concurrency in [int(value) for value in args.concurrency.split(",")]:
+            result = bench_executor(check_runner, check_bitset, name, target, script, args.sections,
+                                    args.runs, concurrency, exclude_pids)
+            result["first_ms"] = round(first_ms, 1)
+            results.append(result)
+            print(f"{name:<16} {concurrency:>4} {first_ms:>7.0f}ms {result['p50_ms']:>7.0f}ms "
+                  f"{result['p95_ms']:>7.0f}ms {result['runs_per_second']:>8} {result['cpu_per_run_ms']:>7.0f}ms "
+                  f"{result['ok_ratio']:>6.0%}")
+            if result["sample_error"]:
+                print(f"   ⚠️ {result['sample_error']}")
+    check_runner.close_script_executors()
+    ansible_pool.pool.shutdown()
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"target": f"{host}:{port}", "sections": args.sections, "results": results},
+                      f, ensure_ascii=False, indent=2)
+    return 0 if results else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
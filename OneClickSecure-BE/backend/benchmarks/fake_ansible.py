@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""벤치마크용 ansible / ansible-playbook 대체 실행 파일
+
+fleet_bench.py가 임시 bin 디렉토리에 ansible, ansible-playbook 이름으로 링크해서 사용.
+네트워크 없이 호스트별 지연/실패를 흉내 냅니다 (같은 시드면 같은 호스트가 같은 결과).
+
+환경 변수
+  FAKE_ANSIBLE_LATENCY_MS       호스트당 평균 실행 시간 (기본 200)
+  FAKE_ANSIBLE_JITTER_MS        ± 편차 (기본 50)
+  FAKE_ANSIBLE_FAIL_RATE        스크립트 실패 비율 (기본 0)
+  FAKE_ANSIBLE_UNREACHABLE_RATE 연결 실패 비율 (기본 0)
+  FAKE_ANSIBLE_CPU_MS           호스트당 컨트롤러 CPU 사용 (결과 처리 흉내, 기본 0)
+  FAKE_ANSIBLE_SEED             결과 시드 (기본 0)
+"""
+
+import json
+import os
+import random
+import re
+import sys
+import time
+
+LATENCY_MS = float(os.environ.get("FAKE_ANSIBLE_LATENCY_MS", 200))
+JITTER_MS = float(os.environ.get("FAKE_ANSIBLE_JITTER_MS", 50))
+FAIL_RATE = float(os.environ.get("FAKE_ANSIBLE_FAIL_RATE", 0))
+UNREACHABLE_RATE = float(os.environ.get("FAKE_ANSIBLE_UNREACHABLE_RATE", 0))
+CPU_MS = float(os.environ.get("FAKE_ANSIBLE_CPU_MS", 0))
+SEED = os.environ.get("FAKE_ANSIBLE_SEED", "0")
+DEFAULT_FORKS = 5
+
+def option(args, name, default=None):
+    return args[args.index(name) + 1] if name in args else default
+
+def inventory_hosts(path):
+    """인벤토리의 호스트 (그룹 vars 섹션 제외)"""
+    hosts, in_vars = [], False
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("["):
+                in_vars = line.endswith(":vars]")
+                continue
+            if not in_vars:
+                hosts.append(line.split()[0])
+    return hosts
+
+def outcome(ip, kind):
+    """호스트별 (지연 초, 결과: ok/failed/unreachable)"""
+    rng = random.Random(f"{SEED}:{kind}:{ip}")
+    latency = max(0.0, LATENCY_MS + rng.uniform(-JITTER_MS, JITTER_MS)) / 1000
+    roll = rng.random()
+    if roll < UNREACHABLE_RATE:
+        return latency, "unreachable"
+    if roll < UNREACHABLE_RATE + FAIL_RATE:
+        return latency, "failed"
+    return latency, "ok"
+
+def simulate(hosts, kind, forks):
+    """forks 단위 웨이브로 실행한 것처럼 대기 + 호스트당 CPU 사용"""
+    results = {ip: outcome(ip, kind) for ip in hosts}
+    latencies = [latency for latency, _ in results.values()]
+    wall = sum(max(latencies[i:i + forks]) for i in range(0, len(latencies), forks))
+    deadline = time.monotonic() + wall
+    for _ in hosts:
+        end = time.process_time() + CPU_MS / 1000
+        while time.process_time() < end:
+            pass
+    time.sleep(max(0.0, deadline - time.monotonic()))
+    return {ip: state for ip, (_, state) in results.items()}
+
+def check_output(script_text, ip):
+    """스크립트에 정의된 u_NN 항목별 결과 (일부 취약)"""
+    codes = [int(num) for num in re.findall(r"^\s*u_(\d+)\s*\(\)", script_text, re.MULTILINE | re.IGNORECASE)]
+    rng = random.Random(f"{SEED}:check:{ip}")
+    return "\n".join(f"U-{code:02d},{'취약' if rng.random() < 0.2 else '양호'}" for code in codes or [1])
+
+def run_setup(args, hosts):
+    tree = option(args, "--tree")
+    states = simulate(hosts, "setup", int(option(args, "-f", DEFAULT_FORKS)))
+    os.makedirs(tree, exist_ok=True)
+    rc = 0
+    for ip, state in states.items():
+        if state == "unreachable":
+            data = {"unreachable": True, "msg": "Failed to connect to the host via ssh"}
+            rc = 4
+        else:
+            data = {"ansible_facts": {"ansible_distribution": "Ubuntu", "ansible_distribution_version": "22.04"}}
+        with open(os.path.join(tree, ip), "w") as f:
+            json.dump(data, f)
+        print(f"{ip} | {'UNREACHABLE!' if state == 'unreachable' else 'SUCCESS'} => {json.dumps(data)[:80]}")
+    return rc
+
+def run_script(args, hosts):
+    with open(option(args, "-a"), encoding="utf-8") as f:
+        script_text = f.read()
+    states = simulate(hosts, "script", int(option(args, "-f", DEFAULT_FORKS)))
+    rc = 0
+    for ip, state in states.items():
+        if state == "unreachable":
+            print(f'{ip} | UNREACHABLE! => {{"changed": false, "msg": "Failed to connect to the host via ssh", "unreachable": true}}')
+            rc = max(rc, 4)
+            continue
+        body = {"changed": True, "rc": 0 if state == "ok" else 1, "stderr": "",
+                "stdout": check_output(script_text, ip) if state == "ok" else "script error"}
+        print(f"{ip} | {'CHANGED' if state == 'ok' else 'FAILED!'} => {json.dumps(body, ensure_ascii=False)}")
+        if state == "failed":
+            rc = max(rc, 2)
+    return rc
+
+def run_playbook(args, hosts):
+    forks = int(option(args, "-f", DEFAULT_FORKS))
+    states = simulate(hosts, "playbook", forks)
+    task_hosts, stats = {}, {}
+    for ip, state in states.items():
+        if state == "unreachable":
+            task_hosts[ip] = {"unreachable": True, "msg": "Failed to connect to the host via ssh"}
+        elif state == "failed":
+            task_hosts[ip] = {"failed": True, "rc": 1, "msg": "non-zero return code", "stdout": ""}
+        else:
+            task_hosts[ip] = {"rc": 0, "stdout": check_output("u_01() {\n}\nu_02() {\n}\nu_03() {\n}\n", ip)}
+        stats[ip] = {"ok": int(state == "ok"), "failures": int(state == "failed"),
+                     "unreachable": int(state == "unreachable")}
+
+    if os.environ.get("ANSIBLE_STDOUT_CALLBACK") == "json":
+        print(json.dumps({"plays": [{"tasks": [{"task": {"name": "run check"}, "hosts": task_hosts}]}],
+                          "stats": stats}, ensure_ascii=False))
+    else:
+        for ip, result in task_hosts.items():
+            print(f'ok: [{ip}] => {{"check_result.stdout": {json.dumps(result.get("stdout", ""), ensure_ascii=False)}}}')
+    if any(state == "unreachable" for state in states.values()):
+        return 4
+    return 2 if any(state == "failed" for state in states.values()) else 0
+
+def main():
+    args = sys.argv[1:]
+    hosts = inventory_hosts(option(args, "-i"))
+    if os.path.basename(sys.argv[0]) == "ansible-playbook":
+        return run_playbook(args, hosts)
+    module = option(args, "-m")
+    if module == "setup":
+        return run_setup(args, hosts)
+    if module == "script":
+        return run_script(args, hosts)
+    # fetch/file 등 나머지 모듈은 지연만 흉내
+    simulate(hosts, module or "other", DEFAULT_FORKS)
+    for ip in hosts:
+        print(f'{ip} | SUCCESS => {{"changed": false}}')
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
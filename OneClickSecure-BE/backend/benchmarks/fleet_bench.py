@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""대규모 호스트 점검 벤치마크
+
+가짜 ansible(fake_ansible.py)과 SSH 배너 서버로 N개 호스트를 흉내 내고, 실제 API 서버(uvicorn)의
+/inventory/check/fleet, /api/playbooks/{id}/execute 경로를 그대로 실행해서 측정합니다.
+네트워크나 실제 대상 서버 없이 실행되고, 매 규모마다 임시 작업 디렉토리에 새 DB를 만듭니다.
+
+    python benchmarks/fleet_bench.py --hosts 10,100,1000 --latency-ms 300 --fail-rate 0.02
+
+측정 항목
+  hosts/min      시나리오 전체 소요 시간 기준 처리량
+  p50/p95        호스트별 실행 시간 (check_executions.started_at ~ completed_at)
+  cpu            API 서버 프로세스 CPU 시간 (server) / 종료된 자식 프로세스(ansible) CPU 시간 (children)
+  rss            시나리오 중 API 서버 최대 RSS
+  poll p95       실행 중 상태 조회 API 응답 시간 (execute 시나리오)
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import socketserver
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKE_ANSIBLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_ansible.py")
+PLAYBOOK_ID = 1
+PASSWORD = "bench"
+REGISTER_BATCH = 500
+STATUS_POLL_INTERVAL = 0.5
+SERVER_START_TIMEOUT = 30
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+# === 가짜 대상 ===
+
+class _BannerHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        self.request.sendall(b"SSH-2.0-OpenSSH_8.9 fleet-bench\r\n")
+
+class BannerServer(socketserver.ThreadingTCPServer):
+    """preflight 검사용 SSH 배너 서버 (127.0.0.0/8 전체가 loopback이라 모든 가짜 IP가 여기로 연결됨)"""
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+    def __init__(self):
+        super().__init__(("0.0.0.0", 0), _BannerHandler)
+        self.port = self.server_address[1]
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+def fake_ip(index: int) -> str:
+    """127.1.0.1부터 순서대로 (네트워크/브로드캐스트 주소 제외)"""
+    return f"127.{1 + index // (250 * 256)}.{(index // 250) % 256}.{index % 250 + 1}"
+
+def write_check_script(path: str, sections: int):
+    lines = ["#!/bin/bash"]
+    for code in range(1, sections + 1):
+        lines += [f"u_{code:02d}() {{", f'\techo "U-{code:02d},양호"', "}", ""]
+    lines += [f"u_{code:02d}" for code in range(1, sections + 1)]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+def prepare_workdir(workdir: str, sections: int) -> Dict[str, str]:
+    """작업 디렉토리 구성: 가짜 ansible bin, 플레이북 디렉토리, 점검 스크립트 디렉토리"""
+    bin_dir = os.path.join(workdir, "bin")
+    os.makedirs(bin_dir)
+    for name in ("ansible", "ansible-playbook"):
+        os.symlink(FAKE_ANSIBLE, os.path.join(bin_dir, name))
+    os.chmod(FAKE_ANSIBLE, 0o755)
+
+    playbooks_dir = os.path.join(workdir, "playbooks")
+    os.makedirs(playbooks_dir)
+    write_check_script(os.path.join(playbooks_dir, "fleet_bench.sh"), sections)
+    with open(os.path.join(playbooks_dir, "metadata.json"), "w", encoding="utf-8") as f:
+        json.dump([{
+            "id": PLAYBOOK_ID,
+            "name": "fleet_bench",
+            "description": "벤치마크 스크립트",
+            "lastRun": "실행 안됨",
+            "status": "대기중",
+            "tasks": sections,
+            "filename": "fleet_bench.sh",
+            "sections": None,
+            "type": "shell"
+        }], f, ensure_ascii=False)
+
+    check_dir = os.path.join(workdir, "check_playbooks")
+    os.makedirs(check_dir)
+    return {"bin": bin_dir, "check": check_dir}
+
+# === API 서버 ===
+
+class ApiServer:
+    """작업 디렉토리를 cwd로 하는 uvicorn 프로세스"""
+
+    def __init__(self, workdir: str, env: Dict[str, str], workers: int = 1):
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.log = open(os.path.join(workdir, "api.log"), "w")
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+             "--port", str(self.port), "--workers", str(workers), "--log-level", "warning"],
+            cwd=workdir, env=env, stdout=self.log, stderr=subprocess.STDOUT
+        )
+        deadline = time.monotonic() + SERVER_START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"API 서버 시작 실패 (로그: {self.log.name})")
+            try:
+                request("GET", f"{self.url}/")
+                return
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError("API 서버 시작 시간 초과")
+
+    def cpu_seconds(self) -> Dict[str, float]:
+        """utime+stime, 종료된 자식 cutime+cstime (초)"""
+        with open(f"/proc/{self.process.pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        utime, stime, cutime, cstime = (int(value) / CLOCK_TICKS for value in fields[11:15])
+        return {"server": utime + stime, "children": cutime + cstime}
+
+    def rss_mb(self) -> float:
+        with open(f"/proc/{self.process.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+        return 0.0
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.log.close()
+
+class RssSampler:
+    """시나리오 동안 API 서버 RSS 최대값"""
+
+    def __init__(self, server: ApiServer, interval: float = 0.2):
+        self.server = server
+        self.interval = interval
+        self.peak = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while True:
+            try:
+                self.peak = max(self.peak, self.server.rss_mb())
+            except OSError:
+                return
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def request(method: str, url: str, body: Optional[Dict] = None, timeout: float = 3600):
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method,
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return json.loads(response.read().decode("utf-8"))
+
+# === 시나리오 ===
+
+def register_hosts(server: ApiServer, count: int, workdir: str) -> List[int]:
+    for start in range(0, count, REGISTER_BATCH):
+        hosts = [{"name": f"bench-{i:05d}", "username": "bench", "ip": fake_ip(i), "password": PASSWORD}
+                 for i in range(start, min(start + REGISTER_BATCH, count))]
+        request("POST", f"{server.url}/inventory/register/bulk", {"hosts": hosts})
+    with sqlite3.connect(os.path.join(workdir, "hosts.db")) as conn:
+        return [row[0] for row in conn.execute("SELECT id FROM hosts WHERE name LIKE 'bench-%' ORDER BY id")]
+
+def host_durations(workdir: str, run_id: str) -> Dict[str, object]:
+    """run_id의 호스트별 실행 시간(초)과 결과별 개수"""
+    with sqlite3.connect(os.path.join(workdir, "hosts.db")) as conn:
+        rows = conn.execute(
+            "SELECT (julianday(completed_at) - julianday(started_at)) * 86400, status "
+            "FROM check_executions WHERE run_id = ?", (run_id,)
+        ).fetchall()
+    statuses: Dict[str, int] = {}
+    for _, status in rows:
+        statuses[status] = statuses.get(status, 0) + 1
+    return {"durations": sorted(max(row[0] or 0.0, 0.0) for row in rows), "statuses": statuses}
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+def poll_until_done(url: str) -> Dict:
+    """end_time이 설정될 때까지 상태 조회 (마지막 상태, 조회 지연 목록)"""
+    poll_ms = []
+    while True:
+        started = time.perf_counter()
+        status = request("GET", url)
+        poll_ms.append((time.perf_counter() - started) * 1000)
+        if status.get("end_time"):
+            return {"status": status, "poll_ms": sorted(poll_ms)}
+        time.sleep(STATUS_POLL_INTERVAL)
+
+def run_fleet(server: ApiServer, host_ids: List[int]) -> Dict:
+    response = request("POST", f"{server.url}/inventory/check/fleet",
+                       {"host_ids": host_ids, "password": PASSWORD})
+    run_id = response["run_id"]
+    done = poll_until_done(f"{server.url}/inventory/check/fleet/{run_id}")
+    return {"run_id": run_id, "status": done["status"]["status"],
+            "ansible_runs": done["status"]["ansible_runs"], "poll_ms": done["poll_ms"]}
+
+def run_execute(server: ApiServer, host_ids: List[int]) -> Dict:
+    response = request("POST", f"{server.url}/api/playbooks/{PLAYBOOK_ID}/execute",
+                       {"host_ids": host_ids, "password": PASSWORD})
+    execution_id = response["execution_id"]
+    done = poll_until_done(f"{server.url}/api/playbooks/execution/{execution_id}")
+    return {"run_id": execution_id, "status": done["status"]["status"], "poll_ms": done["poll_ms"]}
+
+SCENARIOS = {"fleet": run_fleet, "execute": run_execute}
+
+def bench_size(count: int, scenarios: List[str], args) -> List[Dict]:
+    workdir = tempfile.mkdtemp(prefix=f"fleet_bench_{count}_")
+    banner = BannerServer()
+    dirs = prepare_workdir(workdir, args.sections)
+    env = {
+        **os.environ,
+        "PATH": f"{dirs['bin']}{os.pathsep}{os.environ.get('PATH', '')}",
+        "PYTHONPATH": BACKEND_DIR,
+        "ONECLICKSECURE_BASE_DIR": workdir,
+        "CHECK_PLAYBOOK_DIR": dirs["check"],
+        "PREFLIGHT_PORT": str(banner.port),
+        "TRACE_EXPORTERS": "none",
+        "FAKE_ANSIBLE_LATENCY_MS": str(args.latency_ms),
+        "FAKE_ANSIBLE_JITTER_MS": str(args.jitter_ms),
+        "FAKE_ANSIBLE_FAIL_RATE": str(args.fail_rate),
+        "FAKE_ANSIBLE_UNREACHABLE_RATE": str(args.unreachable_rate),
+        "FAKE_ANSIBLE_CPU_MS": str(args.cpu_ms),
+        "FAKE_ANSIBLE_SEED": str(args.seed),
+    }
+    server = ApiServer(workdir, env, args.workers)
+    reports = []
+    try:
+        print(f"📋 호스트 {count}개 등록 중... ({workdir})", file=sys.stderr)
+        host_ids = register_hosts(server, count, workdir)
+        for name in scenarios:
+            print(f"🚀 {name} 시나리오 실행: 호스트 {len(host_ids)}개", file=sys.stderr)
+            cpu_before = server.cpu_seconds()
+            started = time.perf_counter()
+            with RssSampler(server) as sampler:
+                outcome = SCENARIOS[name](server, host_ids)
+            wall = time.perf_counter() - started
+            cpu_after = server.cpu_seconds()
+            hosts = host_durations(workdir, outcome["run_id"])
+            reports.append({
+                "scenario": name,
+                "hosts": len(host_ids),
+                "wall_seconds": round(wall, 2),
+                "hosts_per_min": round(len(host_ids) / wall * 60, 1) if wall else 0.0,
+                "host_p50_seconds": round(percentile(hosts["durations"], 50), 3),
+                "host_p95_seconds": round(percentile(hosts["durations"], 95), 3),
+                "statuses": hosts["statuses"],
+                "server_cpu_seconds": round(cpu_after["server"] - cpu_before["server"], 2),
+                "children_cpu_seconds": round(cpu_after["children"] - cpu_before["children"], 2),
+                "peak_rss_mb": round(sampler.peak, 1),
+                "poll_p95_ms": round(percentile(outcome["poll_ms"], 95), 1),
+            })
+    finally:
+        server.stop()
+        banner.shutdown()
+        banner.server_close()
+        if args.keep:
+            print(f"📁 작업 디렉토리 유지: {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return reports
+
+def print_table(reports: List[Dict]):
+    columns = [("scenario", "scenario", "{}"), ("hosts", "hosts", "{}"), ("wall_seconds", "wall s", "{:.2f}"),
+               ("hosts_per_min", "hosts/min", "{:.1f}"), ("host_p50_seconds", "p50 s", "{:.3f}"),
+               ("host_p95_seconds", "p95 s", "{:.3f}"), ("server_cpu_seconds", "cpu s", "{:.2f}"),
+               ("children_cpu_seconds", "child cpu s", "{:.2f}"), ("peak_rss_mb", "rss MB", "{:.1f}"),
+               ("poll_p95_ms", "poll p95 ms", "{:.1f}")]
+    rows = [[fmt.format(report[key]) for key, _, fmt in columns] for report in reports]
+    widths = [max(len(title), *(len(row[i]) for row in rows)) for i, (_, title, _) in enumerate(columns)]
+    print("  ".join(title.rjust(width) for (_, title, _), width in zip(columns, widths)))
+    for row, report in zip(rows, reports):
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths)), report["statuses"])
+
+def main():
+    parser = argparse.ArgumentParser(description="OneClickSecure 대규모 호스트 점검 벤치마크")
+    parser.add_argument("--hosts", default="10,100,1000", help="호스트 수 목록 (쉼표 구분, 10~5000)")
+    parser.add_argument("--scenario", default="fleet,execute", help=f"실행할 시나리오 ({', '.join(SCENARIOS)})")
+    parser.add_argument("--latency-ms", type=float, default=200, help="가짜 ansible 호스트당 평균 실행 시간")
+    parser.add_argument("--jitter-ms", type=float, default=50, help="실행 시간 편차")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="스크립트 실패 비율")
+    parser.add_argument("--unreachable-rate", type=float, default=0.0, help="연결 실패 비율")
+    parser.add_argument("--cpu-ms", type=float, default=0.0, help="가짜 ansible 호스트당 CPU 사용 시간")
+    parser.add_argument("--sections", type=int, default=20, help="점검 스크립트 항목 수")
+    parser.add_argument("--seed", type=int, default=0, help="호스트별 결과 시드")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 워커 수")
+    parser.add_argument("--json", dest="json_path", default=None, help="결과를 JSON 파일로 저장")
+    parser.add_argument("--keep", action="store_true", help="작업 디렉토리(DB, api.log) 유지")
+    args = parser.parse_args()
+
+    sizes = [int(value) for value in args.hosts.split(",") if value.strip()]
+    scenarios = [name.strip() for name in args.scenario.split(",") if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"알 수 없는 시나리오: {unknown}")
+    if any(size < 1 or size > 5000 for size in sizes):
+        parser.error("호스트 수는 1~5000 범위여야 합니다")
+
+    reports = []
+    for size in sizes:
+        reports.extend(bench_size(size, scenarios, args))
+    print_table(reports)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "results": reports}, f, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
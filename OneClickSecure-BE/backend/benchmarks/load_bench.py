@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""조회 API 부하 테스트 (인벤토리 규모 데이터, 프로세스 내 ASGI 클라이언트)
+
+임시 작업 디렉토리에 호스트 10k, 플레이북 1k, 호스트 실행 기록 100k(실행 10k건)를 만든 뒤
+httpx ASGITransport로 앱을 직접 호출해서 동시 클라이언트 수별 처리량과 지연 시간을 측정합니다.
+네트워크를 쓰지 않으므로 uvicorn/소켓 비용은 빠지고 앱 + DB 비용만 측정됩니다.
+
+    python benchmarks/load_bench.py --concurrency 1,8,32 --duration 10
+    python benchmarks/load_bench.py --compare load_bench_1a2b3c4.json   # 이전 커밋 결과와 비교
+
+결과는 커밋 해시 이름의 JSON(load_bench_<commit>.json)으로 저장됩니다.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(BACKEND_DIR)), "스크립트")
+SEED_SCRIPT = os.path.join(SCRIPTS_DIR, "우분투 점검 스크립트 (24 버전).txt")
+INSERT_CHUNK = 5000
+SCRIPT_FILES = 10           # 플레이북 항목이 돌려 쓰는 스크립트 파일 수
+RESULT_FILE_HOSTS = 500     # 결과 CSV가 있는 호스트 수 (/api/download)
+RESULT_FILES_PER_HOST = 3
+
+# === 데이터 생성 ===
+
+def host_ip(index: int) -> str:
+    return f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}"
+
+def seed_playbooks(base_dir: str, playbook_count: int) -> List[Dict]:
+    """metadata.json + 스크립트 파일 (섹션은 실제 KISA 스크립트에서 파싱)"""
+    from app.routers import playbooks
+
+    playbooks_dir = os.path.join(base_dir, "playbooks")
+    os.makedirs(playbooks_dir, exist_ok=True)
+    for i in range(SCRIPT_FILES):
+        shutil.copyfile(SEED_SCRIPT, os.path.join(playbooks_dir, f"kisa_{i:02d}.sh"))
+    sections = [section.model_dump() for section in playbooks.parse_shell_script(SEED_SCRIPT)]
+    catalog = [{
+        "id": i + 1,
+        "name": f"kisa_check_{i:04d}",
+        "description": "SH 스크립트",
+        "lastRun": "실행 안됨",
+        "status": "대기중",
+        "tasks": len(sections),
+        "filename": f"kisa_{i % SCRIPT_FILES:02d}.sh",
+        "sections": sections if i < SCRIPT_FILES else None,
+        "type": "shell"
+    } for i in range(playbook_count)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        playbooks.save_metadata(catalog)
+    return catalog
+
+def seed_database(host_count: int, execution_count: int, hosts_per_run: int, rng: random.Random) -> List[str]:
+    """hosts, execution_runs, check_executions 일괄 삽입 → 실행 ID 목록"""
+    from app import models, crud
+    from app.database import engine
+
+    now = datetime.now()
+    statuses = ["completed", "failed"]
+    with engine.begin() as conn:
+        rows = []
+        for i in range(host_count):
+            ip = host_ip(i + 1)
+            rows.append({
+                "name": f"srv-{i:05d}", "username": "ubuntu", "password": "seed", "ip": ip,
+                "ip_num": crud.ip_to_int(ip), "os": rng.choice(["Ubuntu 22.04", "Ubuntu 24.04", "CentOS 7.9"]),
+                "is_active": True, "created_at": now - timedelta(days=rng.randrange(365)),
+                "last_check_at": now - timedelta(minutes=rng.randrange(100000)),
+                "last_status": rng.choice(statuses), "last_score": round(rng.uniform(40, 100), 1),
+                "last_failed_checks": rng.randrange(30)
+            })
+            if len(rows) == INSERT_CHUNK:
+                conn.execute(models.Host.__table__.insert(), rows)
+                rows = []
+        if rows:
+            conn.execute(models.Host.__table__.insert(), rows)
+
+        run_ids, runs, executions = [], [], []
+        for run_index in range(execution_count // hosts_per_run):
+            run_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+            run_ids.append(run_id)
+            started = now - timedelta(minutes=rng.randrange(500000))
+            first = rng.randrange(host_count - hosts_per_run) + 1
+            host_ids = list(range(first, first + hosts_per_run))
+            runs.append({
+                "id": run_id, "playbook_id": run_index % 1000 + 1, "playbook_name": f"kisa_check_{run_index % 1000:04d}",
+                "playbook_filename": f"kisa_{run_index % SCRIPT_FILES:02d}.sh", "host_ids": host_ids,
+                "section_ids": None, "status": "completed", "retries_used": 0,
+                "started_at": started, "completed_at": started + timedelta(minutes=5)
+            })
+            for host_id in host_ids:
+                output = "\n".join(f"U-{code:02d},{'양호' if rng.random() < 0.8 else '취약'}" for code in range(1, 21))
+                executions.append({
+                    "host_id": host_id, "status": rng.choice(statuses), "run_id": run_id,
+                    "playbook_id": run_index % 1000 + 1, "started_at": started,
+                    "completed_at": started + timedelta(seconds=rng.randrange(20, 300)),
+                    "duration_seconds": rng.randrange(20, 300), "exit_code": 0, "output_content": output,
+                    "error_content": "", "total_checks": 20, "passed_checks": output.count("양호"),
+                    "failed_checks": output.count("취약"), "attempt": 1
+                })
+            if len(executions) >= INSERT_CHUNK:
+                conn.execute(models.ExecutionRun.__table__.insert(), runs)
+                conn.execute(models.CheckExecution.__table__.insert(), executions)
+                runs, executions = [], []
+        if executions:
+            conn.execute(models.ExecutionRun.__table__.insert(), runs)
+            conn.execute(models.CheckExecution.__table__.insert(), executions)
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return run_ids
+
+def seed_result_files(result_dir: str, host_count: int, rng: random.Random) -> List[int]:
+    """/api/download 대상 결과 CSV (호스트당 여러 개, 최신 파일 선택 경로 포함)"""
+    os.makedirs(result_dir, exist_ok=True)
+    host_ids = rng.sample(range(1, host_count + 1), min(RESULT_FILE_HOSTS, host_count))
+    rows = "\n".join(f"U-{code:02d},항목 {code},{'양호' if code % 4 else '취약'}" for code in range(1, 74))
+    for host_id in host_ids:
+        for n in range(RESULT_FILES_PER_HOST):
+            path = os.path.join(result_dir, f"Results_{host_id}_ubuntu_2026-01-0{n + 1}_00:00:00.csv")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("code,item,result\n" + rows + "\n")
+    return host_ids
+
+# === 부하 ===
+
+def endpoint_scenarios(seed: Dict) -> Dict[str, Callable]:
+    """시나리오 이름 → 요청 URL 생성 함수(rng)"""
+    run_ids, result_hosts, section_ids = seed["run_ids"], seed["result_hosts"], seed["section_ids"]
+    return {
+        "inventory_list": lambda rng: "/inventory/list?limit=100",
+        "inventory_list_sorted": lambda rng: "/inventory/list?limit=100&sort_by=last_score&order=desc",
+        "inventory_list_cidr": lambda rng: f"/inventory/list?limit=100&ip=10.0.{rng.randrange(39)}.0/24",
+        "playbooks": lambda rng: "/api/playbooks",
+        "playbook_script": lambda rng: f"/api/playbooks/{rng.randrange(seed['playbooks']) + 1}/script",
+        "playbook_script_sections": lambda rng: (
+            f"/api/playbooks/{rng.randrange(SCRIPT_FILES) + 1}/script?"
+            + "&".join(f"section_ids={section_id}" for section_id in rng.sample(section_ids, 10))
+        ),
+        "execution_status": lambda rng: f"/api/playbooks/execution/{rng.choice(run_ids)}",
+        "download": lambda rng: f"/api/download/{rng.choice(result_hosts)}/ubuntu",
+        "download_json": lambda rng: f"/api/download/{rng.choice(result_hosts)}/ubuntu/json",
+    }
+
+async def run_load(app, make_url: Callable, concurrency: int, duration: float, seed: int) -> Dict:
+    """concurrency개 클라이언트가 duration초 동안 연속 요청"""
+    import httpx
+
+    latencies: List[float] = []
+    errors: Dict[int, int] = {}
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(client, rng):
+        while time.perf_counter() < deadline:
+            url = make_url(rng)
+            started = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors[response.status_code] = errors.get(response.status_code, 0) + 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, random.Random(seed * 1000 + i)) for i in range(concurrency)))
+        wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / wall, 1),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "errors": errors
+    }
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+# === 보고서 ===
+
+def git_revision() -> Dict[str, object]:
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True).stdout.strip()
+    return {"commit": git("rev-parse", "--short", "HEAD") or "unknown",
+            "subject": git("log", "-1", "--format=%s"),
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+def print_report(report: Dict, baseline: Optional[Dict]):
+    base_rows = {(row["scenario"], row["concurrency"]): row for row in (baseline or {}).get("results", [])}
+    header = f"{'scenario':<26} {'conc':>4} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+    if baseline:
+        header += f"  {'rps Δ':>7} {'p95 Δ':>7}  (vs {baseline['revision']['commit']})"
+    print(header)
+    for row in report["results"]:
+        line = (f"{row['scenario']:<26} {row['concurrency']:>4} {row['rps']:>8.1f} {row['p50_ms']:>8.2f} "
+                f"{row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} {sum(row['errors'].values()):>7}")
+        base = base_rows.get((row["scenario"], row["concurrency"]))
+        if base and base["rps"] and base["p95_ms"]:
+            line += f"  {(row['rps'] / base['rps'] - 1) * 100:>+6.1f}% {(row['p95_ms'] / base['p95_ms'] - 1) * 100:>+6.1f}%"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="OneClickSecure 조회 API 부하 테스트")
+    parser.add_argument("--hosts", type=int, default=10000, help="호스트 수")
+    parser.add_argument("--playbooks", type=int, default=1000, help="플레이북(메타데이터 항목) 수")
+    parser.add_argument("--executions", type=int, default=100000, help="호스트 실행 기록 수")
+    parser.add_argument("--hosts-per-run", type=int, default=10, help="실행 1건당 호스트 수")
+    parser.add_argument("--concurrency", default="1,8,32", help="동시 클라이언트 수 목록 (쉼표 구분)")
+    parser.add_argument("--duration", type=float, default=10, help="시나리오별 측정 시간 (초)")
+    parser.add_argument("--scenario", default=None, help="실행할 시나리오 (쉼표 구분, 기본 전체)")
+    parser.add_argument("--seed", type=int, default=45, help="데이터/요청 시드")
+    parser.add_argument("--workdir", default=None, help="작업 디렉토리 (이미 데이터가 있으면 재사용하고 삭제하지 않음)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본 load_bench_<commit>.json)")
+    parser.add_argument("--compare", default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    revision = git_revision()
+    output = os.path.abspath(args.output or f"load_bench_{revision['commit']}{'-dirty' if revision['dirty'] else ''}.json")
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix="load_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    reuse = os.path.exists(os.path.join(workdir, "seed.json"))
+    # 앱 import 전에 경로 설정 (DB는 작업 디렉토리 기준 ./hosts.db)
+    os.environ["ONECLICKSECURE_BASE_DIR"] = workdir
+    os.environ["CHECK_PLAYBOOK_DIR"] = os.path.join(workdir, "check_playbooks")
+    os.environ.setdefault("TRACE_EXPORTERS", "none")
+    os.chdir(workdir)
+    sys.path.insert(0, BACKEND_DIR)
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            from app.main import app
+        rng = random.Random(args.seed)
+        if reuse:
+            with open("seed.json", encoding="utf-8") as f:
+                seed = json.load(f)
+            print(f"♻️ 기존 데이터 재사용: {workdir}", file=sys.stderr)
+        else:
+            print(f"🌱 데이터 생성 중: 호스트 {args.hosts}, 플레이북 {args.playbooks}, 실행 기록 {args.executions} ({workdir})",
+                  file=sys.stderr)
+            started = time.perf_counter()
+            catalog = seed_playbooks(workdir, args.playbooks)
+            run_ids = seed_database(args.hosts, args.executions, args.hosts_per_run, rng)
+            result_hosts = seed_result_files(os.path.join(os.environ["CHECK_PLAYBOOK_DIR"], "collected_results"),
+                                             args.hosts, rng)
+            seed = {"run_ids": run_ids, "result_hosts": result_hosts, "playbooks": len(catalog),
+                    "section_ids": [section["id"] for section in catalog[0]["sections"]]}
+            with open("seed.json", "w", encoding="utf-8") as f:
+                json.dump(seed, f)
+            print(f"✅ 데이터 생성 완료 ({time.perf_counter() - started:.1f}초)", file=sys.stderr)
+
+        scenarios = endpoint_scenarios(seed)
+        selected = [name.strip() for name in args.scenario.split(",")] if args.scenario else list(scenarios)
+        unknown = [name for name in selected if name not in scenarios]
+        if unknown:
+            parser.error(f"알 수 없는 시나리오: {unknown} (가능: {', '.join(scenarios)})")
+
+        results = []
+        for name in selected:
+            for concurrency in (int(value) for value in args.concurrency.split(",")):
+                print(f"🚀 {name} x{concurrency}", file=sys.stderr)
+                # 엔드포인트 내부 print 로그는 측정 출력과 섞이지 않도록 버림
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = asyncio.run(run_load(app, scenarios[name], concurrency, args.duration, args.seed))
+                results.append({"scenario": name, "concurrency": concurrency, **result})
+    finally:
+        os.chdir(BACKEND_DIR)
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "revision": revision,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {key: getattr(args, key) for key in
+                   ("hosts", "playbooks", "executions", "hosts_per_run", "concurrency", "duration", "seed")},
+        "python": sys.version.split()[0],
+        "results": results
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print_report(report, baseline)
+    print(f"📄 결과 저장: {output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""순수 Python 핫패스 마이크로 벤치마크 (기준값 비교)
+
+    python benchmarks/micro_bench.py              # 기준값과 비교, 임계값 초과 시 종료 코드 1
+    python benchmarks/micro_bench.py --save       # 현재 측정값을 기준값으로 저장
+    python benchmarks/micro_bench.py -k extract   # 이름에 'extract'가 들어간 케이스만
+
+기준값(micro_baselines.json)은 케이스별로 고정 Python 루프(calibration) 대비 비율의 중앙값을 저장합니다.
+calibration은 라운드마다 케이스와 번갈아 측정하므로 부하/CPU 클럭 변화가 비율에 덜 섞이고, 기준값을 만든 머신과
+CPU 속도가 달라도 어느 정도 유지됩니다. 임계값을 넘은 케이스는 CONFIRM_RUNS회 다시 측정해서 모두 넘을 때만
+회귀로 판단합니다 (한 번의 잡음으로 실패하지 않도록).
+입력은 모두 저장소의 실제 스크립트이거나 고정 시드로 생성하므로 매번 같습니다.
+"""
+
+import argparse
+import atexit
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(BACKEND_DIR)), "스크립트")
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "micro_baselines.json")
+DEFAULT_THRESHOLD = 1.50     # 기준 대비 50% 이상 느려지면 회귀 (파일 I/O 케이스는 기준값 파일에서 더 넓게)
+TARGET_ROUND_SECONDS = 0.2   # 라운드당 최소 측정 시간
+DEFAULT_ROUNDS = 15
+CALIBRATION_ROUND_SECONDS = 0.05
+CONFIRM_RUNS = 2             # 임계값 초과 시 재측정 횟수
+
+# 결과 저장 경로 등이 작업 디렉토리 기준이므로 임시 디렉토리에서 import
+_WORKDIR = tempfile.mkdtemp(prefix="micro_bench_")
+os.environ["ONECLICKSECURE_BASE_DIR"] = _WORKDIR
+os.chdir(_WORKDIR)
+atexit.register(shutil.rmtree, _WORKDIR, ignore_errors=True)
+sys.path.insert(0, BACKEND_DIR)
+
+from app.routers import playbooks  # noqa: E402
+from app.check_runner import extract_check_result  # noqa: E402
+from app.yaml_validator import yaml_validator  # noqa: E402
+
+# === 입력 데이터 ===
+
+def _script_path(name: str) -> str:
+    return os.path.join(SCRIPTS_DIR, name)
+
+UBUNTU_24 = _script_path("우분투 점검 스크립트 (24 버전).txt")   # u_NN 섹션 73개
+UBUNTU_18 = _script_path("우분투 점검 스크립트 (18 버전).txt")   # 섹션 없음 (전체 스크립트 처리 경로)
+
+def ansible_stdout(size_mb: float) -> str:
+    """스크립트 결과가 끝에 있는 ansible -o 출력 (앞부분은 다른 태스크 로그)"""
+    rng = random.Random(44)
+    lines, size = [], 0
+    while size < size_mb * 1024 * 1024:
+        line = (f'127.0.0.1 | CHANGED => {{"changed": true, "rc": 0, "msg": "task {rng.randrange(10**6)}", '
+                f'"stdout": "{"x" * rng.randrange(50, 400)}"}}')
+        lines.append(line)
+        size += len(line) + 1
+    result = "\\n".join(f"U-{code:02d},{'양호' if code % 3 else '취약'}" for code in range(1, 74))
+    lines.append(f'ok: [127.0.0.1] => {{"check_result.stdout": "{result}"}}')
+    return "\n".join(lines)
+
+def large_playbook(tasks: int) -> str:
+    rng = random.Random(44)
+    lines = ["- name: bench playbook", "  hosts: all", "  become: true", "  vars:"]
+    lines += [f"    var_{i}: value_{rng.randrange(10**6)}" for i in range(50)]
+    lines.append("  tasks:")
+    for i in range(tasks):
+        module = rng.choice(["lineinfile", "file", "service", "command", "template"])
+        lines += [f"    - name: task {i}", f"      {module}:"]
+        lines += [f"        path: /etc/bench/{i}.conf", f"        line: \"setting_{i}={rng.randrange(100)}\"",
+                  "        mode: '0644'"]
+        lines += ["      when: ansible_os_family == 'Debian'", "      tags: [kisa, bench]"]
+    return "\n".join(lines) + "\n"
+
+def catalog_entries(count: int) -> List[Dict]:
+    """metadata.json 항목 (섹션 내용은 실제 스크립트에서 가져옴)"""
+    sections = [section.model_dump() for section in playbooks.parse_shell_script(UBUNTU_24)[:5]]
+    return [{
+        "id": i + 1,
+        "name": f"script_{i:04d}",
+        "description": "SH 스크립트",
+        "lastRun": "실행 안됨",
+        "status": "대기중",
+        "tasks": len(sections),
+        "filename": f"script_{i:04d}.sh",
+        "sections": sections if i % 4 == 0 else None,
+        "type": "shell"
+    } for i in range(count)]
+
+# === 케이스 ===
+
+def _quiet(func: Callable) -> Callable:
+    """함수 내부 print 출력 숨김 (출력 비용은 측정에 포함)"""
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return run
+
+def build_cases() -> List[Tuple[str, Callable]]:
+    with open(UBUNTU_24, encoding="utf-8") as f:
+        ubuntu_24_text = f.read()
+    all_sections = [section.id for section in playbooks.parse_shell_script(UBUNTU_24)]
+    stdout_4mb = ansible_stdout(4)
+    playbook_2000 = large_playbook(2000)
+    catalog = catalog_entries(1000)
+    with contextlib.redirect_stdout(io.StringIO()):
+        playbooks.save_metadata(catalog)
+
+    return [
+        ("parse_shell_script[ubuntu24]", lambda: playbooks.parse_shell_script(UBUNTU_24)),
+        ("parse_shell_script[ubuntu18]", lambda: playbooks.parse_shell_script(UBUNTU_18)),
+        ("build_selected_sections_script[1]",
+         lambda: playbooks.build_selected_sections_script(ubuntu_24_text, all_sections[-1:])),
+        ("build_selected_sections_script[10]",
+         lambda: playbooks.build_selected_sections_script(ubuntu_24_text, all_sections[-10:])),
+        ("build_selected_sections_script[all]",
+         lambda: playbooks.build_selected_sections_script(ubuntu_24_text, all_sections)),
+        ("extract_check_result[4mb]", lambda: extract_check_result(stdout_4mb)),
+        ("validate_complete[2000_tasks]", lambda: yaml_validator.validate_complete(playbook_2000)),
+        ("load_metadata[1000]", _quiet(playbooks.load_metadata)),
+        ("save_metadata[1000]", _quiet(lambda: playbooks.save_metadata(catalog))),
+    ]
+
+# === 측정 ===
+
+def calibration():
+    """기준 머신 속도 측정용 고정 Python 루프"""
+    total = 0
+    for i in range(200000):
+        total += i * i % 7
+    return total
+
+def _loops(func: Callable, round_seconds: float) -> int:
+    """round_seconds를 채우는 반복 횟수 (워밍업 포함)"""
+    func()  # 워밍업 (파일 캐시, 정규식 컴파일)
+    started = time.perf_counter()
+    func()
+    return max(1, int(round_seconds / max(time.perf_counter() - started, 1e-7)))
+
+def _timed(func: Callable, loops: int) -> float:
+    started = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return (time.perf_counter() - started) / loops
+
+def measure(func: Callable, rounds: int) -> Dict[str, float]:
+    """라운드마다 calibration과 케이스를 번갈아 측정 (호출당 시간의 중앙값/최소값 + 라운드별 비율의 중앙값)
+
+    같은 라운드의 두 측정은 같은 부하/CPU 클럭을 겪으므로 비율에는 잡음이 덜 남습니다.
+    """
+    loops = _loops(func, TARGET_ROUND_SECONDS)
+    calibration_loops = _loops(calibration, CALIBRATION_ROUND_SECONDS)
+    samples, calibrations = [], []
+    for _ in range(rounds):
+        calibrations.append(_timed(calibration, calibration_loops))
+        samples.append(_timed(func, loops))
+    median = statistics.median(samples)
+    return {"median": median, "min": min(samples), "loops": loops,
+            "stdev_pct": round(statistics.pstdev(samples) / median * 100, 1),
+            "calibration": statistics.median(calibrations),
+            "relative": statistics.median(sample / calib for sample, calib in zip(samples, calibrations))}
+
+def machine_info() -> Dict[str, str]:
+    return {"python": platform.python_version(), "implementation": platform.python_implementation(),
+            "machine": platform.machine(), "processor": platform.processor() or platform.machine()}
+
+def load_baselines() -> Dict:
+    if not os.path.exists(BASELINE_FILE):
+        return {}
+    with open(BASELINE_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_baselines(results: Dict[str, Dict], calibration_seconds: float, previous: Dict):
+    cases = dict(previous.get("cases", {}))
+    for name, result in results.items():
+        cases[name] = {
+            "median_seconds": result["median"],
+            "relative": result["relative"],
+            "threshold": previous.get("cases", {}).get(name, {}).get("threshold", DEFAULT_THRESHOLD)
+        }
+    with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+        json.dump({"machine": machine_info(), "calibration_seconds": calibration_seconds,
+                   "cases": dict(sorted(cases.items()))}, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+def main():
+    parser = argparse.ArgumentParser(description="OneClickSecure 마이크로 벤치마크")
+    parser.add_argument("-k", dest="pattern", default=None, help="이름에 이 문자열이 포함된 케이스만 실행")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="측정 라운드 수")
+    parser.add_argument("--save", action="store_true", help="측정값을 기준값으로 저장")
+    parser.add_argument("--threshold", type=float, default=None, help="모든 케이스의 회귀 임계값 (배수)")
+    parser.add_argument("--json", dest="json_path", default=None, help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    cases = [(name, func) for name, func in build_cases() if not args.pattern or args.pattern in name]
+    baselines = load_baselines()
+    if baselines and baselines.get("machine") != machine_info():
+        print(f"⚠️ 기준값 측정 환경이 다릅니다: {baselines.get('machine')} (calibration 비율로 비교)")
+
+    results, regressions, report = {}, [], []
+    print(f"{'case':<38} {'median':>10} {'min':>10} {'±%':>6} {'vs base':>8}")
+    for name, func in cases:
+        result = measure(func, args.rounds)
+        base = baselines.get("cases", {}).get(name)
+        ratio = None
+        if base:
+            ratio = result["relative"] / base["relative"]
+            threshold = args.threshold or base.get("threshold", DEFAULT_THRESHOLD)
+            for _ in range(CONFIRM_RUNS if ratio > threshold and not args.save else 0):
+                retry = measure(func, args.rounds)
+                if retry["relative"] < result["relative"]:
+                    result, ratio = retry, retry["relative"] / base["relative"]
+                if ratio <= threshold:
+                    break
+            if ratio > threshold:
+                regressions.append((name, ratio, threshold))
+        results[name] = result
+        report.append({"case": name, **result, "ratio": ratio})
+        print(f"{name:<38} {_format_time(result['median']):>10} {_format_time(result['min']):>10} "
+              f"{result['stdev_pct']:>6} {f'{ratio:.2f}x' if ratio else '-':>8}")
+    calibration_seconds = statistics.median(result["calibration"] for result in results.values()) if results else 0
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine_info(), "calibration_seconds": calibration_seconds,
+                       "results": report}, f, ensure_ascii=False, indent=2)
+    if args.save:
+        save_baselines(results, calibration_seconds, baselines)
+        print(f"✅ 기준값 저장: {BASELINE_FILE}")
+        return 0
+    for name, ratio, threshold in regressions:
+        print(f"❌ 성능 회귀: {name} {ratio:.2f}x (임계값 {threshold:.2f}x)")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""로컬 sshd 대역 (asyncssh 서버, 실행 백엔드 벤치마크용)
+
+모든 계정을 --password 하나로 인증하고, 받은 명령을 로컬 /bin/sh로 실행합니다.
+앞에 붙은 sudo와 옵션(-S -n -H -k -p -u)은 제거하고 현재 사용자로 실행하므로 sudo 설정이 필요 없고,
+`sudo -n true`는 성공(비밀번호 불필요)으로 응답합니다. ansible이 파일 전송에 쓰는 SFTP도 지원합니다.
+
+    python benchmarks/ssh_standin.py --port 2222 --password bench
+
+실행 결과는 실제 원격 서버가 아니라 이 머신에서 실행되므로 점검 스크립트는 부작용 없는 것만 사용하세요.
+"""
+
+import argparse
+import asyncio
+import shlex
+import sys
+
+import asyncssh
+
+SUDO_FLAGS = {"-S", "-n", "-H", "-k", "-E"}
+SUDO_OPTIONS_WITH_VALUE = {"-p", "-u", "-g"}
+READ_CHUNK = 65536
+
+def strip_sudo(command: str) -> str:
+    """'sudo -S -p "" -u root cmd ...' → 'cmd ...' (sudo가 없으면 그대로)"""
+    try:
+        words = shlex.split(command)
+    except ValueError:
+        return command
+    if not words or words[0] != "sudo":
+        return command
+    index = 1
+    while index < len(words) and words[index].startswith("-"):
+        index += 2 if words[index] in SUDO_OPTIONS_WITH_VALUE else 1
+    return shlex.join(words[index:]) or "true"
+
+class _Server(asyncssh.SSHServer):
+    def __init__(self, password: str):
+        self.password = password
+
+    def begin_auth(self, username: str) -> bool:
+        return True
+
+    def password_auth_supported(self) -> bool:
+        return True
+
+    def validate_password(self, username: str, password: str) -> bool:
+        return password == self.password
+
+async def _pump_input(process, local):
+    try:
+        while True:
+            data = await process.stdin.read(READ_CHUNK)
+            if not data:
+                break
+            local.stdin.write(data)
+            await local.stdin.drain()
+    except (BrokenPipeError, ConnectionResetError, asyncssh.BreakReceived, asyncssh.TerminalSizeChanged):
+        pass
+    finally:
+        local.stdin.close()
+
+async def _pump_output(source, target):
+    while True:
+        data = await source.read(READ_CHUNK)
+        if not data:
+            return
+        target.write(data)
+
+async def handle_process(process: asyncssh.SSHServerProcess):
+    command = strip_sudo(process.command or "/bin/sh")
+    local = await asyncio.create_subprocess_exec(
+        "/bin/sh", "-c", command,
+        stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        await asyncio.gather(_pump_input(process, local), _pump_output(local.stdout, process.stdout),
+                             _pump_output(local.stderr, process.stderr))
+        process.exit(await local.wait())
+    except (asyncio.CancelledError, asyncssh.Error):
+        if local.returncode is None:
+            local.kill()
+        raise
+
+async def serve(host: str, port: int, password: str):
+    key = asyncssh.generate_private_key("ssh-ed25519")
+    server = await asyncssh.create_server(
+        lambda: _Server(password), host, port,
+        server_host_keys=[key], process_factory=handle_process, encoding=None, sftp_factory=True
+    )
+    port = server.get_port()
+    print(f"ssh-standin listening {host}:{port}", flush=True)
+    await asyncio.Event().wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 sshd 대역 (벤치마크용)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2222, help="0이면 빈 포트 자동 선택")
+    parser.add_argument("--password", default="bench")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.password))
+    except KeyboardInterrupt:
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
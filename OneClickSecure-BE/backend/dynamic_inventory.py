@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""hosts 테이블 기반 Ansible 동적 인벤토리 스크립트
+
+사용 예: ansible-playbook -i backend/dynamic_inventory.py playbook.yml
+"""
+import json
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BACKEND_DIR)
+# DATABASE_URL이 상대 경로(./hosts.db)이므로 backend 디렉토리 기준으로 실행
+os.chdir(BACKEND_DIR)
+
+from app.database import SessionLocal
+from app.inventory_provider import inventory
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--host":
+        # _meta.hostvars를 제공하므로 호스트별 조회는 빈 값
+        print(json.dumps({}))
+        return
+
+    db = SessionLocal()
+    try:
+        print(json.dumps(inventory.sync(db).to_dict(), ensure_ascii=False))
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.environ.setdefault("TRACE_EXPORTERS", "none")
+
+from app import models  # noqa: E402
+from app.database import _set_sqlite_pragmas, ensure_schema  # noqa: E402
+
+@pytest.fixture
+def db_engine(tmp_path):
+    """테스트마다 새 SQLite 파일 DB (운영과 같은 WAL 설정, 스레드 간 공유 가능)"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'hosts.db'}",
+                           connect_args={"check_same_thread": False, "timeout": 15})
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    ensure_schema(bind=engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def session_factory(db_engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+@pytest.fixture
+def host(db):
+    db_host = models.Host(name="web-01", username="ubuntu", ip="10.0.0.11")
+    db.add(db_host)
+    db.commit()
+    return db_host
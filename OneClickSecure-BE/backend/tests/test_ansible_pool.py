@@ -0,0 +1,118 @@
+import os
+import stat
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from app import ansible_pool
+
+FAKE_ANSIBLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "benchmarks", "fake_ansible.py")
+FAKE_CLI = (
+    "import runpy\n"
+    "def main(args):\n"
+    f"    raise SystemExit(runpy.run_path({FAKE_ANSIBLE!r}, run_name='fake_ansible')['main']())\n"
+)
+
+@pytest.fixture
+def fake_env(tmp_path):
+    """fake_ansible.py를 ansible 패키지(워커)와 PATH의 ansible-playbook(새 프로세스)으로 제공"""
+    package = tmp_path / "site" / "ansible"
+    (package / "cli").mkdir(parents=True)
+    (package / "__init__.py").write_text("__version__ = '0.0-fake'\n")
+    (package / "cli" / "__init__.py").write_text("")
+    for name in ("adhoc", "playbook"):
+        (package / "cli" / f"{name}.py").write_text(FAKE_CLI)
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "ansible-playbook"
+    script.write_text(f"#!{sys.executable}\n{FAKE_CLI}main(None)\n")
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    inventory = tmp_path / "hosts.ini"
+    inventory.write_text("10.0.0.11\n")
+    return {
+        "env": {**os.environ, "PATH": f"{bin_dir}{os.pathsep}{os.environ['PATH']}",
+                "PYTHONPATH": str(tmp_path / "site"), "ANSIBLE_STDOUT_CALLBACK": "json",
+                "FAKE_ANSIBLE_LATENCY_MS": "0", "FAKE_ANSIBLE_JITTER_MS": "0"},
+        "args": ["ansible-playbook", "-i", str(inventory), "check.yml"],
+    }
+
+@pytest.fixture
+def pool():
+    pool = ansible_pool.AnsiblePool(size=1, max_jobs=100, health_interval=3600)
+    yield pool
+    pool.shutdown()
+
+def _wait_idle(pool, idle=1):
+    deadline = time.monotonic() + 20
+    while pool.stats()["idle"] < idle:
+        assert pool.enabled, pool.unavailable
+        assert time.monotonic() < deadline, pool.stats()
+        time.sleep(0.02)
+
+def _idle_worker(pool):
+    workers, = pool._idle.values()
+    return workers[0]
+
+def test_cold_falls_back_then_warm_worker(pool, fake_env, monkeypatch):
+    monkeypatch.setattr(ansible_pool, "pool", pool)
+    # 처음 보는 프로필: 새 프로세스로 실행하고 워커는 백그라운드 준비
+    result = ansible_pool.run(fake_env["args"], "script", timeout=30, env=fake_env["env"])
+    assert result.returncode == 0 and '"10.0.0.11"' in result.stdout
+
+    _wait_idle(pool)
+    pid = _idle_worker(pool).process.pid
+    for _ in range(2):
+        result = pool.run(fake_env["args"], "script", 30, fake_env["env"])
+        assert result is not None and result.returncode == 0
+        assert '"10.0.0.11"' in result.stdout and result.usage
+    assert _idle_worker(pool).process.pid == pid  # 같은 워커 재사용
+
+def test_warm_timeout_raises_and_keeps_worker(pool, fake_env):
+    pool.prewarm(fake_env["env"])
+    _wait_idle(pool)
+    worker = _idle_worker(pool)
+    env = {**fake_env["env"], "FAKE_ANSIBLE_LATENCY_MS": "5000"}
+    with pytest.raises(subprocess.TimeoutExpired) as error:
+        pool.run(fake_env["args"], "script", 0.3, env)
+    assert error.value.usage
+    # 자식만 종료되고 워커는 다음 요청에 사용
+    assert _idle_worker(pool) is worker and worker.alive()
+
+def test_dead_idle_worker_is_replaced(pool, fake_env):
+    pool.prewarm(fake_env["env"])
+    _wait_idle(pool)
+    dead = _idle_worker(pool)
+    dead.process.kill()
+    dead.process.wait()
+
+    assert pool.run(fake_env["args"], "script", 30, fake_env["env"]) is None  # 새 프로세스로 실행
+    _wait_idle(pool)
+    assert _idle_worker(pool) is not dead
+    assert pool.run(fake_env["args"], "script", 30, fake_env["env"]).returncode == 0
+
+def test_worker_death_mid_run_fails_without_rerun(pool, fake_env):
+    pool.prewarm(fake_env["env"])
+    _wait_idle(pool)
+    worker = _idle_worker(pool)
+    env = {**fake_env["env"], "FAKE_ANSIBLE_LATENCY_MS": "3000"}
+    results = []
+    runner = threading.Thread(target=lambda: results.append(pool.run(fake_env["args"], "script", 30, env)))
+    runner.start()
+    # 요청이 전달되어 워커가 실행 자식을 fork한 뒤에 종료
+    children = f"/proc/{worker.process.pid}/task/{worker.process.pid}/children"
+    deadline = time.monotonic() + 10
+    while not open(children).read().strip():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    worker.process.kill()
+    runner.join(10)
+
+    result, = results
+    assert result.returncode == 1 and "ansible 실행 풀 오류" in result.stderr
+    # 교체 워커 준비
+    _wait_idle(pool)
+    assert _idle_worker(pool) is not worker
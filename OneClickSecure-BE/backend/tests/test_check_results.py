@@ -0,0 +1,58 @@
+import shutil
+import subprocess
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from app import check_bitset, crud
+from app.check_runner import _REMOTE_TRACE_RE, build_check_script, take_remote_span
+from app.routers.playbooks import build_selected_sections_script
+
+PLAYBOOKS_DIR = Path(__file__).resolve().parent.parent / "playbooks"
+
+def test_encode_decode_roundtrip():
+    outcomes = {"U-01": "pass", "U-02": "fail", "U-03": "na", "U-72": "pass"}
+    blob = check_bitset.encode_outcomes(outcomes)
+    assert len(blob) == check_bitset.BITSET_BYTES
+    assert check_bitset.decode_outcomes(blob) == outcomes
+    assert check_bitset.count_outcomes(blob) == {"total": 4, "passed": 2, "failed": 1, "na": 1}
+
+def test_merge_replaces_only_rechecked_codes():
+    previous = check_bitset.encode_outcomes({"U-01": "fail", "U-02": "fail", "U-03": "pass"})
+    current = check_bitset.encode_outcomes({"U-02": "pass"})
+    merged = check_bitset.merge_bitsets(previous, current)
+    assert check_bitset.decode_outcomes(merged) == {"U-01": "fail", "U-02": "pass", "U-03": "pass"}
+    assert check_bitset.diff_bitsets(previous, merged)["newly_passed"] == ["U-02"]
+
+def test_parse_result_line_formats():
+    output = "U-01 최종 결과: 양호\n※ U-04 결과 : 취약(Vulnerable)\nU-05,N/A\nU_06: 제목만 있는 줄\n"
+    assert check_bitset.parse_check_outcomes(output) == {"U-01": "pass", "U-04": "fail", "U-05": "na"}
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="bash 필요")
+def test_real_script_results_reach_outcome_bits(db, host):
+    """실제 점검 스크립트는 결과를 >> $resultfile로만 기록 → 래퍼가 stdout으로 출력해야 비트셋이 채워짐"""
+    script = build_selected_sections_script((PLAYBOOKS_DIR / "2_test.sh").read_text(encoding="utf-8"),
+                                            ["section_1", "section_4", "section_5"])
+    completed = subprocess.run(["bash", "-s"], input=build_check_script(script), capture_output=True,
+                               text=True, timeout=120)
+
+    started_at = datetime.now()
+    execution = crud.record_host_execution(
+        db, run_id="run-1", playbook_id=2, host_id=host.id,
+        result={"stdout": completed.stdout, "stderr": completed.stderr, "returncode": completed.returncode},
+        started_at=started_at, completed_at=started_at + timedelta(seconds=3)
+    )
+    assert execution is not None
+    assert set(check_bitset.decode_outcomes(execution.outcome_bits)) == {"U-01", "U-04", "U-05"}
+    assert execution.total_checks == 3
+    assert execution.passed_checks + execution.failed_checks == 3
+
+def test_remote_trace_end_survives_script_trap():
+    script = "trap 'echo overridden >&2' EXIT\necho 'U-01,양호' >> \"$resultfile\"\nexit 3\n"
+    completed = subprocess.run(["bash", "-s"], input=build_check_script(script), capture_output=True, text=True)
+    assert completed.returncode == 3
+    assert "U-01,양호" in completed.stdout
+    marks = dict(_REMOTE_TRACE_RE.findall(completed.stderr))
+    assert int(marks["end"]) >= int(marks["start"])
+    assert "overridden" in take_remote_span(completed.stderr)
@@ -0,0 +1,52 @@
+import threading
+from datetime import datetime, timedelta
+
+from app import crud, models
+
+def _result(failed_codes):
+    lines = [f"U-{n:02d} 최종 결과: {'취약' if n in failed_codes else '양호'}" for n in range(1, 11)]
+    return {"stdout": "\n".join(lines), "stderr": "", "returncode": 0}
+
+def test_daily_rollup_accumulates(db, host):
+    started_at = datetime(2026, 10, 1, 9, 0)
+    for failed in ({1, 2}, {1}, set()):
+        crud.record_host_execution(db, run_id=None, playbook_id=None, host_id=host.id, result=_result(failed),
+                                   started_at=started_at, completed_at=started_at + timedelta(seconds=5))
+    daily = db.query(models.ComplianceDaily).one()
+    assert daily.executions == 3
+    assert daily.score_min == 80.0
+    assert daily.score_max == 100.0
+    assert daily.last_score == 100.0
+    assert daily.flips == 2
+
+def test_concurrent_ingest_same_host_and_day(session_factory, host):
+    """동시 수집해도 실행 기록이 빠지거나 일별 집계가 덮어써지지 않아야 함"""
+    count = 8
+    barrier = threading.Barrier(count)
+    started_at = datetime(2026, 10, 2, 9, 0)
+
+    def ingest(index):
+        session = session_factory()
+        try:
+            barrier.wait()
+            return crud.record_host_execution(
+                session, run_id=f"run-{index}", playbook_id=None, host_id=host.id, result=_result({index % 3}),
+                started_at=started_at, completed_at=started_at + timedelta(seconds=5)
+            )
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=ingest, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    session = session_factory()
+    try:
+        assert session.query(models.CheckExecution).count() == count
+        daily = session.query(models.ComplianceDaily).one()
+        assert daily.executions == count
+        assert daily.score_sum == sum(100.0 if index % 3 == 0 else 90.0 for index in range(count))
+    finally:
+        session.close()
@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta
+
+from app import crud, models
+
+def _record(db, host, seconds=10):
+    started_at = datetime(2026, 10, 1, 12, 0, 0)
+    result = {"stdout": "", "stderr": "", "returncode": 0}
+    return crud.record_host_execution(db, run_id="run", playbook_id=None, host_id=host.id, result=result,
+                                      started_at=started_at, completed_at=started_at + timedelta(seconds=seconds))
+
+def _snapshot(db):
+    counters = db.get(models.DashboardCounters, 1)
+    daily = db.query(models.ExecutionDailyStats).one()
+    return ((counters.total_executions, counters.completed_executions, counters.checked_hosts),
+            (daily.total_executions, daily.completed_executions, daily.completed_duration_count,
+             daily.completed_duration_sum))
+
+def test_missing_counters_row_rebuilt_without_double_count(db, host):
+    db.query(models.DashboardCounters).delete()
+    db.commit()
+
+    _record(db, host)
+    assert _snapshot(db) == ((1, 1, 1), (1, 1, 1, 10.0))
+
+    _record(db, host, seconds=20)  # 행이 있으면 증분 갱신
+    assert _snapshot(db) == ((2, 2, 1), (2, 2, 2, 30.0))
+    crud.rebuild_dashboard_counters(db)
+    assert _snapshot(db) == ((2, 2, 1), (2, 2, 2, 30.0))
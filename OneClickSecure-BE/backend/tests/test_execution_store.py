@@ -0,0 +1,36 @@
+import sqlite3
+import stat
+
+import pytest
+
+from app import execution_store, job_secrets
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.delenv("JOB_SECRET_KEY", raising=False)
+    monkeypatch.setattr(job_secrets, "JOB_SECRET_KEY_PATH", str(tmp_path / "job_secret.key"))
+    monkeypatch.setattr(job_secrets, "_fernet", None)
+    return execution_store.SQLiteExecutionStore(str(tmp_path / "execution_state.db"))
+
+def test_job_secret_encrypted_at_rest(store, tmp_path):
+    store.enqueue_jobs("exec-1", [{"host_id": 1, "payload": {"ip": "10.0.0.11"}, "secret": "s3cret"}])
+
+    stored = sqlite3.connect(store.path).execute("SELECT secret FROM execution_jobs").fetchone()[0]
+    assert stored and "s3cret" not in stored
+    key_mode = stat.S_IMODE((tmp_path / "job_secret.key").stat().st_mode)
+    assert key_mode == 0o600
+
+    job, = store.claim_jobs("worker-a", 10, 60)
+    assert job["secret"] == "s3cret"
+    store.complete_job(job["job_id"], "worker-a")
+    assert sqlite3.connect(store.path).execute("SELECT secret FROM execution_jobs").fetchone()[0] is None
+
+def test_exhausted_jobs_fail_and_drop_secret(store, monkeypatch):
+    store.enqueue_jobs("exec-1", [{"host_id": 1, "payload": {}, "secret": "s3cret"}])
+    for attempt in range(execution_store.JOB_MAX_LEASES):
+        assert store.claim_jobs(f"worker-{attempt}", 1, -1)  # 즉시 만료되는 lease
+    assert store.claim_jobs("worker-late", 1, 60) == []
+
+    job, = store.fail_exhausted_jobs()
+    assert job["host_id"] == 1 and job["secret"] is None
+    assert store.pending_jobs("exec-1") == 0
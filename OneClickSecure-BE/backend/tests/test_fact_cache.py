@@ -0,0 +1,31 @@
+import json
+import os
+import subprocess
+
+from app import ansible_utils
+
+def test_bulk_detect_fills_ansible_fact_cache(monkeypatch):
+    calls = []
+
+    def fake_run(args, phase, timeout=None, env=None):
+        calls.append(env)
+        tree_dir = args[args.index("--tree") + 1]
+        facts = {"ansible_distribution": "Ubuntu", "ansible_distribution_version": "22.04",
+                 "ansible_memtotal_mb": 2048}
+        with open(os.path.join(tree_dir, "10.0.0.11"), "w") as f:
+            json.dump({"ansible_facts": facts}, f)
+        return subprocess.CompletedProcess(args, 0, "", "")
+
+    monkeypatch.setattr(ansible_utils.process_usage, "run", fake_run)
+    results = ansible_utils.get_os_info_bulk([{"ip": "10.0.0.11", "username": "ubuntu", "password": "pw"}])
+
+    assert results["10.0.0.11"]["os"] == "Ubuntu 22.04"
+    # DB에는 배포판 facts만, 전체 facts는 Ansible 팩트 캐시에 저장
+    assert results["10.0.0.11"]["facts"] == {"ansible_distribution": "Ubuntu",
+                                             "ansible_distribution_version": "22.04"}
+    assert calls[0]["ANSIBLE_CACHE_PLUGIN"] == "jsonfile"
+    assert calls[0]["ANSIBLE_CACHE_PLUGIN_CONNECTION"] == ansible_utils.ANSIBLE_FACT_CACHE_DIR
+
+def test_fact_cache_dir_follows_playbook_dir():
+    assert ansible_utils.ANSIBLE_FACT_CACHE_DIR == os.environ.get(
+        "ANSIBLE_FACT_CACHE_DIR", os.path.join(ansible_utils.CHECK_PLAYBOOK_DIR, "fact_cache"))
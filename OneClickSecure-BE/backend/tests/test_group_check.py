@@ -0,0 +1,131 @@
+import json
+import os
+import stat
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+from app import check_runner, crud, metrics, timeouts
+from app.timeouts import TIMEOUT_EXIT_CODE
+
+def _iso(moment):
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+def _local(moment):
+    return moment.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+def _report(now):
+    """호스트별 실행 시간이 다른 json 콜백 결과 (10.0.0.11: 1초, 10.0.0.12: 3초)"""
+    task_start = now - timedelta(seconds=1)
+    return {
+        "plays": [{"tasks": [{
+            "task": {"name": "점검 Python 스크립트 실행",
+                     "duration": {"start": _iso(task_start), "end": _iso(now + timedelta(seconds=4))}},
+            "hosts": {
+                "10.0.0.11": {"action": "command", "stdout": "U-01 결과 : 양호", "start": _local(task_start),
+                              "end": _local(task_start + timedelta(seconds=1))},
+                "10.0.0.12": {"action": "ansible.builtin.command", "stdout": "U-01 결과 : 취약", "start": _local(task_start),
+                              "end": _local(task_start + timedelta(seconds=3))},
+            }
+        }]}],
+        "stats": {"10.0.0.11": {"ok": 1}, "10.0.0.12": {"ok": 1}}
+    }
+
+def _fake_playbook(tmp_path, monkeypatch):
+    """인벤토리/환경 변수를 기록하고 json 콜백 결과를 출력하는 ansible-playbook"""
+    report = _report(datetime.now().astimezone())
+    record = tmp_path / "record.json"
+    script = tmp_path / "ansible-playbook"
+    script.write_text(
+        f"#!{sys.executable}\n"
+        "import json, os, sys\n"
+        "inventory = open(sys.argv[sys.argv.index('-i') + 1]).read()\n"
+        f"json.dump({{'inventory': inventory, 'password': os.environ.get('{check_runner.GROUP_PASSWORD_ENV}')}},"
+        f" open({str(record)!r}, 'w'))\n"
+        f"print(json.dumps({report!r}))\n"
+    )
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+    return record
+
+def test_host_timings_from_callback_duration():
+    now = datetime.now().astimezone()
+    timings = check_runner._host_timings(_report(now))
+    task_start = (now - timedelta(seconds=1)).replace(tzinfo=None)
+    assert timings["10.0.0.11"] == (task_start, task_start + timedelta(seconds=1))
+    assert timings["10.0.0.12"] == (task_start, task_start + timedelta(seconds=3))
+
+def test_group_check_per_host_timing_and_no_password_on_disk(tmp_path, monkeypatch):
+    record = _fake_playbook(tmp_path, monkeypatch)
+    script_phase = metrics.PHASE_DURATION.labels("script")
+    observed = script_phase.count
+    hosts = [{"ip": "10.0.0.11", "username": "ubuntu", "host_id": 1, "timeout": 60},
+             {"ip": "10.0.0.12", "username": "ubuntu", "host_id": 2, "timeout": 60}]
+
+    results = check_runner.run_os_check_group("os_ubuntu_22_04", "/tmp/ubuntu_check.py", hosts, "s3cret")
+
+    recorded = json.loads(record.read_text())
+    assert "s3cret" not in recorded["inventory"]
+    assert recorded["password"] == "s3cret"
+
+    fast, slow = results["10.0.0.11"], results["10.0.0.12"]
+    assert fast["returncode"] == slow["returncode"] == 0
+    assert fast["started_at"] == slow["started_at"]
+    assert fast["completed_at"] < slow["completed_at"]
+    # 콜백 시각은 그룹 실행 구간 안으로 보정
+    assert slow["completed_at"] <= datetime.now()
+    # 플레이북 실행 태스크(command)는 script 단계로 기록
+    assert script_phase.count == observed + 1
+
+def test_each_shard_is_one_ansible_run(monkeypatch):
+    runs = []
+    monkeypatch.setattr(check_runner, "CHECK_SHARD_COUNT", 4)
+    monkeypatch.setattr(check_runner, "CHECK_SHARD_MIN_HOSTS", 2)
+    monkeypatch.setattr(check_runner, "run_os_check_group",
+                        lambda group, script_path, hosts, password, profile=None:
+                        runs.append(group) or {host["ip"]: {"returncode": 0} for host in hosts})
+    hosts = [{"ip": f"10.0.0.{index}", "username": "ubuntu", "os_info": "Ubuntu 22.04"} for index in range(6)]
+    hosts.append({"ip": "10.0.1.1", "username": "root", "os_info": "CentOS 7"})
+
+    partitions = check_runner.run_os_check_groups(hosts, "pw")
+
+    assert {group: partition["shards"] for group, partition in partitions.items()} == {"os_ubuntu_22_04": 3,
+                                                                                       "os_centos_7": 1}
+    assert len(runs) == sum(partition["shards"] for partition in partitions.values())
+    assert len(partitions["os_ubuntu_22_04"]["results"]) == 6
+
+def test_task_timeout_maps_to_timeout_exit_code():
+    hosts = [{"ip": f"10.0.0.{index}"} for index in (11, 12, 13)]
+    message = "The command action failed to execute in the expected time frame (60) and was terminated"
+    report = {
+        "plays": [{"tasks": [{"task": {"name": "점검 Python 스크립트 실행"}, "hosts": {
+            "10.0.0.11": {"action": "command", "stdout": "U-01 결과 : 양호"},
+            "10.0.0.12": {"action": "command", "failed": True, "timedout": {"frame": "", "period": 60},
+                          "msg": message},
+            "10.0.0.13": {"action": "command", "failed": True, "msg": message},  # timedout 키가 없는 버전
+        }}]}],
+        "stats": {"10.0.0.11": {"ok": 1}, "10.0.0.12": {"failures": 1}, "10.0.0.13": {"failures": 1}}
+    }
+
+    results = check_runner._split_playbook_results(json.dumps(report), hosts, 2)
+
+    assert results["10.0.0.11"]["returncode"] == 0
+    assert results["10.0.0.12"]["returncode"] == results["10.0.0.13"]["returncode"] == TIMEOUT_EXIT_CODE
+    assert "timed_out" not in results["10.0.0.12"]
+
+def test_group_process_timeout_left_out_of_history(db, host, monkeypatch):
+    def timed_out(args, phase, timeout=None, env=None):
+        raise subprocess.TimeoutExpired(args, timeout)
+
+    monkeypatch.setattr(check_runner.process_usage, "run", timed_out)
+    hosts = [{"ip": host.ip, "username": "ubuntu", "host_id": host.id, "timeout": 60}]
+
+    result = check_runner.run_os_check_group("os_ubuntu_22_04", "/tmp/ubuntu_check.py", hosts, "pw")[host.ip]
+    execution = crud.record_host_execution(db, run_id="run", playbook_id=None, host_id=host.id, result=result,
+                                           started_at=result["started_at"], completed_at=result["completed_at"])
+
+    assert execution.exit_code == TIMEOUT_EXIT_CODE
+    # 그룹 전체 시간은 호스트 실행 시간이 아니므로 이력에 쓰지 않음
+    assert execution.duration_seconds is None
+    timeouts.clear_cache()
+    assert timeouts._duration_history(db, [host.id], None, 20, 1.5) == {host.id: []}
@@ -0,0 +1,23 @@
+from app import crud, models
+from app.inventory_provider import DynamicInventory, os_group_names
+
+def test_os_group_names():
+    assert os_group_names("Ubuntu 22.04") == ["os_ubuntu", "os_ubuntu_22", "os_ubuntu_22_04"]
+    assert os_group_names(None) == ["os_unknown"]
+
+def test_incremental_changes_follow_generation(db):
+    inventory = DynamicInventory().sync(db)
+    db_host = models.Host(name="web-01", username="ubuntu", ip="10.0.0.11", os="Ubuntu 22.04")
+    db.add(db_host)
+    generation = crud.bump_inventory_generation(db)
+    db.commit()
+    inventory.host_changed(db_host, generation)
+
+    rendered = inventory.to_dict()
+    assert rendered["os_ubuntu_22"] == {"hosts": ["10.0.0.11"]}
+    assert "ansible_password" not in rendered["_meta"]["hostvars"]["10.0.0.11"]
+
+    # 중간 세대를 놓치면 다음 sync에서 전체 로드
+    inventory.host_removed(db_host.id, generation + 2)
+    assert inventory.generation is None
+    assert inventory.sync(db).to_dict()["os_ubuntu"] == {"hosts": ["10.0.0.11"]}
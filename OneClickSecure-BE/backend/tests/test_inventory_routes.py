@@ -0,0 +1,99 @@
+import asyncio
+import io
+import threading
+from datetime import datetime
+
+from fastapi import FastAPI, UploadFile
+from fastapi.testclient import TestClient
+
+from app import crud, execution_store, fact_cache, preflight
+from app.routers import inventory
+
+def _client(session_factory):
+    app = FastAPI()
+    app.include_router(inventory.router)
+
+    def get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[inventory.get_db] = get_db
+    return TestClient(app)
+
+def test_bulk_csv_opens_session_in_worker_thread(session_factory, monkeypatch):
+    opened, closed = [], []
+
+    def session_local():
+        session = session_factory()
+        opened.append(threading.get_ident())
+        close = session.close
+        session.close = lambda: (closed.append(threading.get_ident()), close())
+        return session
+
+    monkeypatch.setattr(inventory, "SessionLocal", session_local)
+    monkeypatch.setattr(fact_cache, "get_os_info_many",
+                        lambda db, hosts: {host["ip"]: {"os": "Ubuntu 22.04"} for host in hosts})
+    upload = UploadFile(io.BytesIO("name,username,ip,password\nweb-01,ubuntu,10.0.0.11,pw\n".encode()),
+                        filename="hosts.csv")
+
+    result = asyncio.run(inventory.register_hosts_bulk_csv(upload))
+
+    assert [host.ip for host in result.registered] == ["10.0.0.11"]
+    # 요청 스레드가 아닌 워커 스레드에서 열고 닫음
+    assert opened == closed and opened[0] != threading.get_ident()
+
+def test_list_etag_checked_before_page_query(session_factory, host, monkeypatch):
+    client = _client(session_factory)
+
+    response = client.get("/inventory/list")
+    etag = response.headers["etag"]
+    assert response.status_code == 200 and etag.startswith('W/"')
+
+    get_hosts_page = crud.get_hosts_page
+    monkeypatch.setattr(crud, "get_hosts_page", lambda *args, **kwargs: 1 / 0)  # 304면 조회하지 않음
+    for if_none_match in (etag, etag.removeprefix("W/"), f'"other", {etag}', "*"):
+        assert client.get("/inventory/list", headers={"If-None-Match": if_none_match}).status_code == 304
+    monkeypatch.setattr(crud, "get_hosts_page", get_hosts_page)
+    assert client.get("/inventory/list", headers={"If-None-Match": '"other"'}).status_code == 200
+
+    # 점검 결과가 기록되면 새 ETag
+    db = session_factory()
+    started_at = datetime(2026, 10, 1, 12, 0, 0)
+    crud.record_host_execution(db, run_id="run", playbook_id=None, host_id=host.id,
+                               result={"stdout": "", "stderr": "", "returncode": 0},
+                               started_at=started_at, completed_at=started_at)
+    db.close()
+    response = client.get("/inventory/list", headers={"If-None-Match": etag})
+    assert response.status_code == 200 and response.json()[0]["last_check_at"]
+
+def test_fleet_check_runs_in_background_and_polls(session_factory, host, monkeypatch):
+    now = datetime.now()
+
+    def run_groups(targets, password, profile):
+        return {"os_ubuntu_22_04": {
+            "script_path": "/tmp/ubuntu_check.py", "hosts": targets, "shards": 1, "duration_seconds": 1.0,
+            "results": {target["ip"]: {"stdout": "U-01 결과 : 양호", "stderr": "", "returncode": 0,
+                                       "started_at": now, "completed_at": now} for target in targets}
+        }}
+
+    monkeypatch.setattr(inventory, "SessionLocal", session_factory)
+    monkeypatch.setattr(inventory, "execution_store", execution_store.MemoryExecutionStore())
+    monkeypatch.setattr(inventory, "run_os_check_groups", run_groups)
+    monkeypatch.setattr(preflight, "probe_hosts_sync",
+                        lambda ips: {ip: {"reachable": True} for ip in ips})
+    monkeypatch.setattr(fact_cache, "get_os_info_many",
+                        lambda db, hosts, force_refresh=False: {h["ip"]: {"os": "Ubuntu 22.04"} for h in hosts})
+    client = _client(session_factory)
+
+    assert client.post("/inventory/check/fleet", json={"host_ids": [999], "password": "pw"}).status_code == 404
+    response = client.post("/inventory/check/fleet", json={"host_ids": [host.id], "password": "pw"})
+    assert response.status_code == 200 and "results" not in response.json()
+
+    state = client.get(f"/inventory/check/fleet/{response.json()['run_id']}").json()
+    assert state["status"] == "완료" and state["end_time"]
+    assert state["ansible_runs"] == 1 and state["completed_hosts"] == 1
+    assert state["results"][str(host.id)]["group"] == "os_ubuntu_22_04"
+    assert client.get("/inventory/check/fleet/unknown").status_code == 404
@@ -0,0 +1,44 @@
+import asyncio
+import threading
+import time
+
+from app import preflight
+from app.routers import playbooks
+
+class _Store:
+    def update(self, execution_id, **fields):
+        pass
+
+def test_local_hosts_run_off_event_loop(session_factory, host, tmp_path, monkeypatch):
+    (tmp_path / "check.sh").write_text("echo ok\n", encoding="utf-8")
+
+    async def probe_hosts(ips):
+        return {}
+
+    calls = []
+
+    def run_hosts_locally(*args):
+        calls.append(threading.get_ident())
+        time.sleep(0.3)  # 동기 SSH 실행
+
+    monkeypatch.setattr(playbooks, "SessionLocal", session_factory)
+    monkeypatch.setattr(playbooks, "PLAYBOOKS_DIR", tmp_path)
+    monkeypatch.setattr(playbooks, "EXECUTION_MODE", "local")
+    monkeypatch.setattr(playbooks, "execution_store", _Store())
+    monkeypatch.setattr(playbooks, "_run_hosts_locally", run_hosts_locally)
+    monkeypatch.setattr(preflight, "probe_hosts", probe_hosts)
+
+    async def main():
+        ticks = 0
+        task = asyncio.create_task(playbooks.execute_playbook_on_hosts_task(
+            "exec-1", {"id": 1, "filename": "check.sh"}, [host], "pw"))
+        while not task.done():
+            await asyncio.sleep(0.01)
+            ticks += 1
+        await task
+        return ticks
+
+    ticks = asyncio.run(main())
+    # 호스트 실행 중에도 이벤트 루프가 다른 요청을 처리
+    assert calls and calls[0] != threading.get_ident()
+    assert ticks >= 10
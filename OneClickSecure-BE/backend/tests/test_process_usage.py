@@ -0,0 +1,29 @@
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app import process_usage
+
+BURN = "import sys, time\nend = time.process_time() + {seconds}\nwhile time.process_time() < end: pass\n"
+
+def test_run_collects_own_rusage_under_concurrency():
+    burn = [sys.executable, "-c", BURN.format(seconds=0.3) + "print('done\\r\\nok'); sys.exit(3)"]
+    idle = [sys.executable, "-c", "import time; time.sleep(0.3)"]
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        busy, quiet = pool.map(lambda args: process_usage.run(args, phase="script"), [burn, idle])
+
+    assert busy.returncode == 3 and busy.stdout == "done\nok\n"
+    assert busy.usage["exit_status"] == 3 and busy.usage["max_rss_kb"] > 0
+    assert busy.usage["cpu_user_seconds"] + busy.usage["cpu_system_seconds"] >= 0.25
+    # 동시에 실행된 다른 프로세스 사용량이 섞이지 않음
+    assert quiet.usage["cpu_user_seconds"] < 0.2
+
+def test_timeout_kills_and_keeps_usage():
+    args = [sys.executable, "-c", "import sys, time\nprint('partial', flush=True)\ntime.sleep(30)"]
+    with pytest.raises(subprocess.TimeoutExpired) as error:
+        process_usage.run(args, phase="script", timeout=0.5)
+    assert error.value.stdout == "partial\n"
+    usage = process_usage.timeout_usage(error.value)
+    assert usage["wall_seconds"] < 5 and usage["cpu_user_seconds"] is not None
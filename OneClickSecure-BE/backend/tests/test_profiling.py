@@ -0,0 +1,29 @@
+import threading
+
+from app import profiling
+
+def _work():
+    return sum(index * index for index in range(1000))
+
+def _profile_in_thread(profile):
+    """미들웨어(이벤트 루프 스레드) 프로파일 중에 스레드풀에서 동기 엔드포인트 실행"""
+    profiler = profile.start()
+    try:
+        worker = threading.Thread(target=profile.run, args=(lambda: _work(), {}))
+        worker.start()
+        worker.join()
+    finally:
+        profile.stop(profiler)
+    return profile
+
+def test_nested_profile_per_thread():
+    profile = _profile_in_thread(profiling.RequestProfile("cprofile"))
+    assert "_work" in profile.report()
+
+def test_process_wide_cprofile_does_not_nest(monkeypatch):
+    monkeypatch.setattr(profiling, "CPROFILE_PROCESS_WIDE", True)
+    profile = profiling.RequestProfile("cprofile")
+    assert not profile.per_thread
+    _profile_in_thread(profile)
+    # 요청 프로파일러 하나만 생성 (3.12+에서 두 번째 cProfile은 ValueError)
+    assert len(profile._parts) == 1
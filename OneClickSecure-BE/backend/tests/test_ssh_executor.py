@@ -0,0 +1,67 @@
+import asyncio
+import types
+
+import pytest
+
+from app import ssh_executor
+from app.timeouts import TIMEOUT_EXIT_CODE
+
+class _Result:
+    def __init__(self, exit_status):
+        self.exit_status = exit_status
+
+class _FakeConnection:
+    """sudo에 비밀번호가 필요하고 스크립트가 끝나지 않는 호스트"""
+
+    def __init__(self):
+        self.commands = []
+
+    def is_closed(self):
+        return False
+
+    def close(self):
+        pass
+
+    async def run(self, command, check=False):
+        self.commands.append(command)
+        return _Result(1)
+
+    async def create_process(self, command, **kwargs):
+        self.commands.append(command)
+        stream = types.SimpleNamespace(read=lambda size: asyncio.sleep(3600))
+        stdin = types.SimpleNamespace(write=lambda data: None, write_eof=lambda: None)
+        return types.SimpleNamespace(stdin=stdin, stdout=stream, stderr=stream, close=lambda: None)
+
+@pytest.fixture
+def fake_asyncssh(monkeypatch):
+    state = {"connection": _FakeConnection(), "connect_delay": 0}
+
+    async def connect(*args, **kwargs):
+        await asyncio.sleep(state["connect_delay"])
+        return state["connection"]
+
+    class Error(Exception):
+        pass
+
+    monkeypatch.setattr(ssh_executor, "asyncssh", types.SimpleNamespace(
+        connect=connect, Error=Error, ChannelOpenError=Error, ConnectionLost=Error))
+    return state
+
+def _run(executor, timeout, connect_timeout):
+    profile = types.SimpleNamespace(connect_timeout=connect_timeout)
+    try:
+        return executor.run_script("10.0.0.11", "ubuntu", "pw", "echo hi", timeout=timeout, profile=profile)
+    finally:
+        executor.close()
+
+def test_connect_timeout_is_unreachable(fake_asyncssh):
+    fake_asyncssh["connect_delay"] = 5
+    result = _run(ssh_executor.AsyncSshExecutor(), timeout=30, connect_timeout=0.1)
+    assert result["returncode"] == 4
+    assert "연결 시간 초과" in result["stderr"]
+
+def test_script_timeout_uses_shared_exit_code_and_fresh_sudo(fake_asyncssh):
+    result = _run(ssh_executor.AsyncSshExecutor(), timeout=0.3, connect_timeout=5)
+    assert result["returncode"] == TIMEOUT_EXIT_CODE
+    # 캐시된 sudo 인증이 있어도 비밀번호 줄을 sudo가 읽도록 -k
+    assert fake_asyncssh["connection"].commands[-1] == "sudo -k -S -p '' bash -s"
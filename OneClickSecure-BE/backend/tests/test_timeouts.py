@@ -0,0 +1,25 @@
+from datetime import datetime, timedelta
+
+from app import crud, timeouts
+
+def _record(db, host, seconds, returncode=0):
+    started_at = datetime(2026, 10, 1, 12, 0, 0)
+    result = {"stdout": "", "stderr": "", "returncode": returncode}
+    return crud.record_host_execution(db, run_id="run", playbook_id=None, host_id=host.id, result=result,
+                                      started_at=started_at, completed_at=started_at + timedelta(seconds=seconds))
+
+def test_duration_keeps_fractional_seconds(db, host):
+    execution = _record(db, host, 12.75)
+    assert execution.duration_seconds == 12.75
+
+def test_timed_out_runs_raise_timeout(db, host):
+    timeouts.clear_cache()
+    for _ in range(5):
+        _record(db, host, 100)
+    assert timeouts.get_timeout(db, host.id) == 200  # p99(100) x 2.0
+
+    timeouts.clear_cache()
+    _record(db, host, 200, returncode=timeouts.TIMEOUT_EXIT_CODE)
+    _record(db, host, 200, returncode=1)  # 일반 실패는 표본에서 제외
+    assert timeouts.get_timeout(db, host.id) == 600  # 하한 표본 200 x 1.5 = 300, x 2.0
+    timeouts.clear_cache()